@@ -0,0 +1,69 @@
+# bench_industry.py
+"""行业分类基准：比较逐行 apply(categorize_industry) 与去重后批量分类 classify_industries 的速度（两者使用同一份规则文件）"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from industry import TEXT_COLUMNS, IndustryClassifier, categorize_industry, classify_industries
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataCollection')
+DEFAULT_SIZES = [10_000, 100_000]
+# 逐行 apply 超过该行数时不再计时
+ROW_WISE_LIMIT = 200_000
+
+
+def load_real_rows():
+    """读取 dataCollection 下所有 CSV 的职位、技能要求、工作标签三列"""
+    frames = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, '*.csv'))):
+        try:
+            df = pd.read_csv(path, usecols=TEXT_COLUMNS)
+        except (ValueError, pd.errors.EmptyDataError):
+            continue
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=TEXT_COLUMNS)
+
+
+def timed(func, *args):
+    """返回 (结果, 耗时秒)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="行业分类基准")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="测试规模（行数）")
+    args = parser.parse_args()
+
+    real = load_real_rows()
+    classifier, load_time = timed(IndustryClassifier.from_file)
+    print(f"真实岗位 {len(real)} 行；读取规则 {load_time * 1000:.1f} 毫秒")
+
+    # 单段文本的关键词扫描（不含 pandas 的 apply 开销）：批量分类的提速来自对相同文本去重，而不是扫描本身
+    texts = real.astype(object).map(str).apply(lambda row: ''.join(row).lower(), axis=1).tolist()
+    _, scan_time = timed(lambda: [classifier.classify_text(text) for text in texts])
+    _, distinct_time = timed(lambda: [classifier.classify_text(text) for text in set(texts)])
+    print(f"逐段扫描 {len(texts)} 段：{scan_time:.3f} 秒；只扫描不同的 {len(set(texts))} 段：{distinct_time:.3f} 秒")
+
+    failed = 0
+    for size in args.sizes:
+        df = real.iloc[np.resize(np.arange(len(real)), size)].reset_index(drop=True)
+        batch, batch_time = timed(classify_industries, df, classifier)
+        line = f"{size:>10} 行  classify_industries：{batch_time:.3f} 秒（{size / batch_time:,.0f} 行/秒）"
+        if size <= ROW_WISE_LIMIT:
+            row_wise, row_wise_time = timed(lambda d: d.apply(categorize_industry, axis=1, classifier=classifier), df)
+            identical = bool((row_wise == batch).all())
+            failed += not identical
+            line += f"  apply(categorize_industry)：{row_wise_time:.3f} 秒  结果一致：{identical}"
+        print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+# bench_salary.py
+"""薪资解析基准：在真实数据和合成数据上按多个规模计时并记录历史吞吐量（解析结果的一致性由 tests/test_salary_parser.py 检查）"""
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_paths import data_path
+from salary_parser import SALARY_CACHE, parse_salary_series, parse_salary_structured, process_salary
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, '..', 'dataCollection')
+# 吞吐量历史记录（运行时数据目录下），每次运行追加
+HISTORY_PATH = data_path('bench_history.csv')
+DEFAULT_SIZES = [1_000, 100_000, 10_000_000]
+# 逐行 apply(process_salary) 超过该行数时不再计时（1000 万行要跑好几分钟）
+ROW_WISE_LIMIT = 1_000_000
+# 合成数据中不同薪资字符串的个数上限（真实数据的基数只有几百）
+SYNTHETIC_POOL_SIZE = 200_000
+DEFAULT_SEED = 0
+
+
+def load_real_salaries():
+    """读取 dataCollection 下所有 CSV 的期待薪资列"""
+    frames = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, '*.csv'))):
+        try:
+            df = pd.read_csv(path, usecols=['期待薪资'])
+        except (ValueError, pd.errors.EmptyDataError):
+            continue
+        frames.append(df['期待薪资'])
+    return pd.concat(frames, ignore_index=True) if frames else pd.Series(dtype=object)
+
+
+def synthetic_salaries(n, seed=DEFAULT_SEED):
+    """生成 n 个覆盖各种格式的随机薪资字符串（含少量无法解析的取值和缺失值）"""
+    rng = np.random.default_rng(seed)
+    low = rng.integers(1, 100, size=n)
+    high = low + rng.integers(0, 60, size=n)
+    months = rng.integers(13, 19, size=n)
+    scale = rng.choice([1, 10, 100, 1000], size=n)
+    kinds = rng.integers(0, 14, size=n)
+
+    salaries = []
+    for kind, lo, hi, mo, sc in zip(kinds, low, high, months, scale):
+        if kind == 0:
+            salaries.append(f'{lo}-{hi}K')
+        elif kind == 1:
+            salaries.append(f'{lo}-{hi}K·{mo}薪')
+        elif kind == 2:
+            salaries.append(f'{lo}K')
+        elif kind == 3:
+            salaries.append(f'{lo}.5-{hi + 1}K')
+        elif kind == 4:
+            salaries.append(f'{lo * sc}-{hi * sc}元/天')
+        elif kind == 5:
+            salaries.append(f'{lo * sc}元/天')
+        elif kind == 6:
+            salaries.append(f'{lo}-{hi}元/时')
+        elif kind == 7:
+            salaries.append(f'{lo}元/时')
+        elif kind == 8:
+            salaries.append(f'{lo}-{hi}万/年')
+        elif kind == 9:
+            salaries.append(f'{lo * 100}-{hi * 100}元/月')
+        elif kind == 10:
+            salaries.append(f'{lo * 100}-{hi * 100}元/周')
+        elif kind == 11:
+            salaries.append(f' {lo}-{hi}K ')
+        elif kind == 12:
+            salaries.append(rng.choice(['面议', '', 'K', '薪资面议·13薪']))
+        else:
+            salaries.append(None)
+    return pd.Series(salaries, dtype=object)
+
+
+def expand(values, size, seed=DEFAULT_SEED):
+    """从取值池中有放回地抽样扩充到 size 行"""
+    rng = np.random.default_rng(seed)
+    values = np.asarray(values, dtype=object)
+    return pd.Series(values[rng.integers(0, len(values), size=size)])
+
+
+def timed(func, *args):
+    """返回 (结果, 耗时秒)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def row_wise_parse(salaries):
+    """逐行 apply(process_salary)，作为对照基准"""
+    return pd.to_numeric(salaries.apply(process_salary), errors='coerce')
+
+
+def benchmark(dataset, salaries):
+    """
+    对一份数据计时各解析方式，返回结果记录列表。
+    每种平均薪资解析方式的结果分别与逐行 apply(process_salary) 比较；结构化解析的输出不同，不参与比较（结果一致为空）。
+    超过 ROW_WISE_LIMIT 行时不跑逐行 apply，结果一致也为空。
+    """
+    size = len(salaries)
+    timings = {}
+    outputs = {}
+
+    SALARY_CACHE.clear()
+    outputs['去重解析（冷缓存）'], timings['去重解析（冷缓存）'] = timed(parse_salary_series, salaries)
+    outputs['去重解析（热缓存）'], timings['去重解析（热缓存）'] = timed(parse_salary_series, salaries)
+    outputs['去重解析（无缓存）'], timings['去重解析（无缓存）'] = timed(
+        lambda s: parse_salary_series(s, cache=None), salaries)
+    _, timings['结构化解析'] = timed(parse_salary_structured, salaries)
+
+    identical = {}
+    if size <= ROW_WISE_LIMIT:
+        row_wise, timings['逐行apply'] = timed(row_wise_parse, salaries)
+        baseline = row_wise.to_numpy(dtype=float)
+        identical = {method: np.array_equal(baseline, output.to_numpy(dtype=float), equal_nan=True)
+                     for method, output in outputs.items()}
+
+    return [{'数据集': dataset, '行数': size, '解析方式': method, '耗时秒': seconds,
+             '行每秒': size / seconds if seconds else np.nan, '结果一致': identical.get(method)}
+            for method, seconds in timings.items()]
+
+
+def current_commit():
+    """当前 git 提交的短哈希（不在 git 仓库中时为空）"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def record_history(results, path=HISTORY_PATH):
+    """把本次结果追加到历史记录，并返回与历史最好成绩的对比"""
+    history = pd.read_csv(path, encoding='utf-8-sig') if os.path.exists(path) else pd.DataFrame()
+    results = results.copy()
+    keys = ['数据集', '行数', '解析方式']
+    if not history.empty:
+        best = history.groupby(keys)['行每秒'].max().rename('历史最好')
+        results = results.join(best, on=keys)
+        results['相对历史最好'] = results['行每秒'] / results['历史最好'] - 1
+    else:
+        results['历史最好'] = np.nan
+        results['相对历史最好'] = np.nan
+
+    run = results[keys + ['耗时秒', '行每秒', '结果一致']].copy()
+    run.insert(0, '提交', current_commit())
+    run.insert(0, '时间', pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S'))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    run.to_csv(path, mode='a', header=not os.path.exists(path), index=False, encoding='utf-8-sig')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="薪资解析基准")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="测试规模（行数）")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="随机种子")
+    parser.add_argument('--no-history', action='store_true', help="不写入历史记录")
+    args = parser.parse_args()
+
+    real = load_real_salaries().dropna()
+    pool = synthetic_salaries(SYNTHETIC_POOL_SIZE, args.seed)
+    print(f"真实薪资取值 {real.nunique()} 种，合成薪资取值 {pool.nunique()} 种")
+
+    records = []
+    for size in args.sizes:
+        if not real.empty:
+            records.extend(benchmark('真实数据', expand(real, size, args.seed)))
+        records.extend(benchmark('合成数据', expand(pool, size, args.seed)))
+    results = pd.DataFrame(records)
+    if not args.no_history:
+        results = record_history(results)
+
+    with pd.option_context('display.width', 200, 'display.max_columns', 20, 'display.float_format', '{:,.3f}'.format):
+        print(results.to_string(index=False))
+    print(f"\n缓存统计：{SALARY_CACHE.stats()}")
+
+    return 1 if (results['结果一致'] == False).any() else 0  # noqa: E712
+
+
+if __name__ == "__main__":
+    sys.exit(main())
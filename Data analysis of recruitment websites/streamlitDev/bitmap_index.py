@@ -0,0 +1,88 @@
+# bitmap_index.py
+"""位图索引：为每个维度取值和热门技能预先生成压缩位图（numpy packbits，每行 1 位），筛选组合只需几次按位与/或"""
+import numpy as np
+import pandas as pd
+
+from salary_sketch import SKETCH_DIMENSIONS
+
+# 默认建位图的维度（与看板的筛选条件一致）
+BITMAP_DIMENSIONS = SKETCH_DIMENSIONS
+# 为出现次数最多的前 N 个技能建位图
+TOP_SKILL_BITMAPS = 100
+# 每个字节中 1 的个数，用于统计位图中的行数
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
+class BitmapIndex:
+    """
+    bitmaps[名称][取值] 为一个 packbits 压缩的行位图（第 i 位表示第 i 行）。
+    同一名称内多个取值按位或（多选），不同名称之间按位与。
+    """
+
+    def __init__(self, num_rows):
+        self.num_rows = num_rows
+        self.bitmaps = {}
+        self.all_rows = np.packbits(np.ones(num_rows, dtype=bool))
+        self.no_rows = np.zeros_like(self.all_rows)
+
+    @classmethod
+    def from_frame(cls, df, dimensions=BITMAP_DIMENSIONS, skill_matrix=None, top_skills=TOP_SKILL_BITMAPS):
+        """为 df 的各维度取值建位图；给定 岗位×技能 稀疏矩阵时再为热门技能建位图（名称：技能）"""
+        index = cls(len(df))
+        for dimension in dimensions:
+            index.add_column(dimension, df[dimension])
+        if skill_matrix is not None:
+            for skill in skill_matrix.item_counts().index[:top_skills]:
+                index.add_mask('技能', skill, skill_matrix.rows_with(skill))
+        return index
+
+    def add_column(self, name, values):
+        """为一列的每个取值建位图（缺失值不建）"""
+        codes, uniques = pd.factorize(pd.Series(values))
+        for code, value in enumerate(uniques):
+            self.add_mask(name, value, codes == code)
+
+    def add_mask(self, name, value, mask):
+        """加入一个布尔行掩码"""
+        self.bitmaps.setdefault(name, {})[value] = np.packbits(np.asarray(mask, dtype=bool))
+
+    def values(self, name):
+        """某个名称下建了位图的取值"""
+        return list(self.bitmaps.get(name, {}))
+
+    def union(self, name, values):
+        """多个取值的位图按位或（没有位图的取值视为没有行）"""
+        bitmaps = self.bitmaps.get(name, {})
+        result = self.no_rows.copy()
+        for value in values:
+            bitmap = bitmaps.get(value)
+            if bitmap is not None:
+                result |= bitmap
+        return result
+
+    def select(self, filters=None, all_of=None):
+        """
+        filters 形如 {'城市': ['杭州', '上海'], '学历': '本科'}：同一维度内满足任一取值，维度之间同时满足，
+        取值为 None 或空列表表示不筛选；all_of 形如 {'技能': ['Java', 'MySQL']}：必须同时满足全部取值。
+        返回压缩位图。
+        """
+        result = self.all_rows.copy()
+        for name, value in (filters or {}).items():
+            if value is None:
+                continue
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            if values:
+                result &= self.union(name, values)
+        for name, values in (all_of or {}).items():
+            bitmaps = self.bitmaps.get(name, {})
+            for value in values:
+                result &= bitmaps.get(value, self.no_rows)
+        return result
+
+    def count(self, bitmap):
+        """位图中的行数"""
+        return int(_POPCOUNT[bitmap].sum())
+
+    def positions(self, bitmap):
+        """位图中各行的位置（升序）"""
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.num_rows))
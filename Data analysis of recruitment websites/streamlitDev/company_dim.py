@@ -0,0 +1,115 @@
+# company_dim.py
+"""公司维度表：入库时统一公司名称、分配整数ID，并预计算每家公司的岗位数和薪资统计"""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# 公司规模的固定顺序（BOSS直聘 brandScaleName 的取值）
+COMPANY_SIZE_ORDER = ['0-20人', '20-99人', '100-499人', '500-999人', '1000-9999人', '10000人以上', '未公布']
+# 公司规模粗分档
+SIZE_BUCKETS = {
+    '0-20人': '小型',
+    '20-99人': '小型',
+    '100-499人': '中型',
+    '500-999人': '中型',
+    '1000-9999人': '大型',
+    '10000人以上': '大型',
+}
+UNKNOWN_SIZE = '未公布'
+
+# 统一名称时去掉的常见后缀（按长度从长到短匹配）
+COMPANY_SUFFIXES = sorted([
+    '股份有限公司', '有限责任公司', '集团有限公司', '有限公司', '集团', '公司',
+], key=len, reverse=True)
+_BRACKET_REGEX = re.compile(r'[(（][^)）]*[)）]')
+_SPACE_REGEX = re.compile(r'\s+')
+
+
+def normalize_company_name(name):
+    """统一公司名称：全角转半角、去空白和括号备注、小写、去掉公司后缀"""
+    if not isinstance(name, str):
+        return ''
+    name = unicodedata.normalize('NFKC', name).strip().lower()
+    name = _BRACKET_REGEX.sub('', name)
+    name = _SPACE_REGEX.sub('', name)
+    for suffix in COMPANY_SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            name = name[:-len(suffix)]
+            break
+    return name
+
+
+def size_bucket(size):
+    """把公司规模映射到 小型/中型/大型/未公布"""
+    return SIZE_BUCKETS.get(size, UNKNOWN_SIZE)
+
+
+def _mode_by(ids, values):
+    """
+    每个 ID 出现次数最多的取值（并列时取先出现的），返回以 ID 为索引的 Series。
+    对 (ID, 取值) 计数一次后稳定排序取每个 ID 的第一条，不需要逐组调用 Python 函数。
+    """
+    pairs = pd.DataFrame({'ID': ids, '取值': values})
+    counts = pairs.groupby(['ID', '取值'], sort=False).size().reset_index(name='次数')
+    counts = counts.sort_values('次数', ascending=False, kind='stable').drop_duplicates('ID')
+    return counts.set_index('ID')['取值'].sort_index()
+
+
+def build_company_dimension(df, salary_col='平均薪资'):
+    """
+    构建公司维度表。
+    返回 (company_ids, dimension)：company_ids 是与 df 行对齐的整数公司ID，
+    dimension 以公司ID为索引，包含名称、规模分档、岗位数和薪资统计。
+    """
+    # 公司名称基数远低于行数：只统一不同的原始名称，再按编码映射回每一行
+    raw_codes, raw_names = pd.factorize(df['公司'].astype(object), use_na_sentinel=False)
+    name_ids, standard_names = pd.factorize(pd.Series([normalize_company_name(name) for name in raw_names],
+                                                      dtype=object), sort=False)
+    row_ids = name_ids[raw_codes].astype(np.int32)
+    company_ids = pd.Series(row_ids, index=df.index, name='公司ID')
+
+    sizes = df['公司规模'].fillna(UNKNOWN_SIZE) if '公司规模' in df.columns else pd.Series(UNKNOWN_SIZE, index=df.index)
+    salaries = df[salary_col].to_numpy(dtype=float) if salary_col in df.columns else np.full(len(df), np.nan)
+    grouped = pd.Series(salaries).groupby(row_ids, sort=True)
+    # 展示名称取每家公司出现最多的原始写法（缺失的原始名称不参与）
+    raw_names = pd.Series(np.asarray(raw_names, dtype=object))
+    display_codes = _mode_by(row_ids, np.where(raw_names.notna().to_numpy()[raw_codes], raw_codes, -1))
+    display_codes = display_codes[display_codes >= 0]
+
+    dimension = pd.DataFrame({
+        '标准名称': standard_names,
+        '公司名称': raw_names.reindex(display_codes.to_numpy()).set_axis(display_codes.index),
+        '公司规模': _mode_by(row_ids, sizes.to_numpy()),
+        '岗位数': grouped.size(),
+        '薪资样本数': grouped.count(),
+        '平均薪资': grouped.mean(),
+        '薪资中位数': grouped.median(),
+        '最低薪资': grouped.min(),
+        '最高薪资': grouped.max(),
+    })
+    dimension['公司规模'] = pd.Categorical(dimension['公司规模'], categories=COMPANY_SIZE_ORDER, ordered=True)
+    dimension['规模分档'] = dimension['公司规模'].astype(str).map(size_bucket)
+    dimension.index.name = '公司ID'
+
+    return company_ids, dimension
+
+
+def count_companies(company_ids, n_companies):
+    """统计一组行涉及的公司数（整数ID上的 bincount，代替字符串 nunique）"""
+    company_ids = np.asarray(company_ids)
+    if company_ids.size == 0:
+        return 0
+    return int(np.count_nonzero(np.bincount(company_ids, minlength=n_companies)))
+
+
+def company_posting_counts(company_ids, dimension, top_n=10):
+    """统计一组行中各公司的岗位数，返回带公司名称、规模和公司整体平均薪资的 TOP N 表"""
+    counts = np.bincount(np.asarray(company_ids), minlength=len(dimension))
+    order = np.argsort(-counts, kind='stable')[:top_n]
+    order = order[counts[order] > 0]
+    result = dimension.iloc[order][['公司名称', '公司规模', '规模分档', '平均薪资']].copy()
+    result = result.rename(columns={'平均薪资': '公司平均薪资'})
+    result.insert(1, '岗位数', counts[order])
+    return result
@@ -0,0 +1,76 @@
+# dashboard_state.py
+"""看板派生数据：数据加载后一次性完成薪资解析、行业和职位族、重复簇、公司维度、聚合立方体、稀疏矩阵、位图和检索索引，之后所有重跑和会话只读共享"""
+import threading
+
+import numpy as np
+
+from bitmap_index import BitmapIndex
+from company_dim import build_company_dimension
+from dedup import assign_duplicate_clusters, dedupe_postings
+from filter_cache import dataset_fingerprint
+from industry import classify_industries
+from job_cube import JobCube
+from job_items import build_incidence_matrices, row_mask
+from role_family import ROLE_FAMILY_COLUMN, ROLE_NORMALIZER
+from salary_parser import STRUCTURED_COLUMNS, parse_salary_series, parse_salary_structured
+from search_index import SEARCH_FIELDS, JobSearchIndex
+from similar_jobs import FEATURE_COLUMNS, SimilarJobIndex
+
+# 侧边栏下拉筛选的维度
+FILTER_DIMENSIONS = ['城市', '行业', '学历', '工作经验']
+
+
+class DashboardState:
+    """
+    看板用到的全部派生数据，构建一次后只读：页面重跑时只查询这些结构，不修改 df，
+    因此整个对象可以放进 st.cache_resource，在所有重跑和会话之间共享。
+    """
+
+    def __init__(self, df, quality_report):
+        df = df.copy()
+        df['平均薪资'] = parse_salary_series(df['期待薪资'])
+        # 结构化薪资：单位、上下限、年薪月数、折算月薪和年化总薪酬
+        df[STRUCTURED_COLUMNS] = parse_salary_structured(df['期待薪资'])
+        df['行业'] = classify_industries(df)
+        df[ROLE_FAMILY_COLUMN] = ROLE_NORMALIZER.families(df['职位'])
+        df['重复簇'] = assign_duplicate_clusters(df)
+        df['公司ID'], self.company_dim = build_company_dimension(df)
+        self.df = df
+        self.quality_report = quality_report
+        # 合并近似重复岗位后留下的行（只去重一次，立方体和位图共用）
+        deduped = dedupe_postings(df)
+
+        # 城市×行业×学历×工作经验 聚合立方体（键为是否合并重复岗位）：岗位数、薪资总和及薪资分位数草图
+        self.job_cubes = {False: JobCube.from_frame(df),
+                          True: JobCube.from_frame(deduped)}
+        # 技能、标签、福利列表预先构建成 岗位×条目 稀疏矩阵，筛选后一次矩阵乘向量即可计数
+        # 技能名先经过技能字典统一写法（Java/java、C/C++/C++ 计为同一技能）
+        self.job_matrices = build_incidence_matrices(df)
+        # 各维度取值和热门技能的行位图，筛选组合只需几次按位与/或；保留岗位 为合并重复后留下的行
+        self.bitmap_index = BitmapIndex.from_frame(df, skill_matrix=self.job_matrices['技能'])
+        self.bitmap_index.add_mask('保留岗位', True, row_mask(df.index, deduped.index))
+
+        # 侧边栏的选项和月薪滑块上限（K）
+        self.filter_options = {dimension: sorted(df[dimension].dropna().unique().tolist())
+                               for dimension in FILTER_DIMENSIONS}
+        self.salary_cap = int(np.ceil(df['月薪上限'].max() / 1000)) if df['月薪上限'].notna().any() else 0
+        # 数据指纹：数据不变时，相同的筛选组合直接复用筛选结果缓存
+        self.fingerprint = dataset_fingerprint(df)
+
+        self._search_index = None
+        self._similar_index = None
+        self._lock = threading.Lock()
+
+    def search_index(self):
+        """岗位搜索倒排索引（第一次搜索时构建）"""
+        with self._lock:
+            if self._search_index is None:
+                self._search_index = JobSearchIndex(self.df[list(SEARCH_FIELDS)])
+            return self._search_index
+
+    def similar_index(self):
+        """相似岗位 LSH 索引（第一次查找相似岗位时构建）"""
+        with self._lock:
+            if self._similar_index is None:
+                self._similar_index = SimilarJobIndex(self.df[FEATURE_COLUMNS])
+            return self._similar_index
@@ -0,0 +1,17 @@
+# data_paths.py
+"""运行时数据目录：趋势库、隔离行、词云缓存和基准历史等运行时生成的文件统一写到这里，不写进代码目录"""
+import os
+
+# 通过环境变量指定运行时数据目录（默认为代码目录下的 runtime_data，已加入 .gitignore）
+DATA_DIR_ENV = 'RECRUIT_DATA_DIR'
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'runtime_data')
+
+
+def runtime_data_dir():
+    """运行时数据目录（环境变量优先）"""
+    return os.environ.get(DATA_DIR_ENV) or DEFAULT_DATA_DIR
+
+
+def data_path(*parts):
+    """运行时数据目录下的路径（不创建目录，写入方在写入前自行创建）"""
+    return os.path.join(runtime_data_dir(), *parts)
@@ -0,0 +1,185 @@
+# dedup.py
+"""近似重复岗位检测：基于 MinHash 签名 + LSH 分桶，为同一公司、薪资相容的重复发布分配簇编号"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from salary_parser import parse_salary_structured
+
+# MinHash 置换个数 = 分桶数 × 每桶行数
+NUM_PERM = 128
+LSH_BANDS = 32
+LSH_ROWS = 4
+# 签名一致率（Jaccard 估计值）达到该阈值才视为重复
+SIMILARITY_THRESHOLD = 0.5
+# 分批计算签名时每批的特征数，控制内存占用
+FEATURE_BATCH = 50_000
+
+# 梅森素数，用于通用哈希 (a*x + b) mod p
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_NON_WORD_REGEX = re.compile(r'[\s\W_]+')
+
+
+def normalize_text(text):
+    """统一大小写，去掉空白和标点"""
+    if not isinstance(text, str):
+        return ''
+    return _NON_WORD_REGEX.sub('', text.lower())
+
+
+def _split_list_field(text):
+    """把 "['Java', 'MySQL']" 形式的字符串拆成列表"""
+    if not isinstance(text, str) or text in ('[]', 'nan'):
+        return []
+    items = text.replace('[', '').replace(']', '').replace("'", "").split(', ')
+    return [item.strip() for item in items if item.strip()]
+
+
+def posting_features(title, skills, salary):
+    """一条岗位的特征集合：职位名字符二元组 + 技能 + 薪资"""
+    title = normalize_text(title)
+    features = {'t:' + title[i:i + 2] for i in range(max(len(title) - 1, 1))} if title else set()
+    features.update('s:' + normalize_text(skill) for skill in _split_list_field(skills))
+    if isinstance(salary, str) and salary:
+        features.add('p:' + normalize_text(salary))
+    return features
+
+
+def _permutations(num_perm, seed):
+    """生成 MinHash 使用的通用哈希参数"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(feature_sets, num_perm=NUM_PERM, seed=1):
+    """批量计算 MinHash 签名，返回 (行数, num_perm) 的 uint64 矩阵"""
+    lengths = np.fromiter((len(s) for s in feature_sets), dtype=np.int64, count=len(feature_sets))
+    signatures = np.full((len(feature_sets), num_perm), _MAX_HASH, dtype=np.uint64)
+    if lengths.sum() == 0:
+        return signatures
+
+    all_features = np.array([f for s in feature_sets for f in s], dtype=object)
+    hashed = pd.util.hash_array(all_features) & _MAX_HASH
+    row_ids = np.repeat(np.arange(len(feature_sets)), lengths)
+    a, b = _permutations(num_perm, seed)
+
+    # 分批计算 (a*x + b) mod p，再按行取最小值
+    for start in range(0, len(hashed), FEATURE_BATCH):
+        batch = hashed[start:start + FEATURE_BATCH]
+        batch_rows = row_ids[start:start + FEATURE_BATCH]
+        values = ((batch[:, None] * a[None, :] + b[None, :]) % _MERSENNE_PRIME) & _MAX_HASH
+        # 行号是有序的，每行的特征连续存放，可以用 reduceat 分段取最小
+        starts = np.flatnonzero(np.r_[True, batch_rows[1:] != batch_rows[:-1]])
+        rows_in_batch = batch_rows[starts]
+        signatures[rows_in_batch] = np.minimum(signatures[rows_in_batch],
+                                               np.minimum.reduceat(values, starts, axis=0))
+    return signatures
+
+
+def _connected_components(n, left, right):
+    """并查集的向量化版本：反复取最小标签并做路径压缩"""
+    labels = np.arange(n)
+    if len(left) == 0:
+        return labels
+    while True:
+        low = np.minimum(labels[left], labels[right])
+        previous = labels.copy()
+        np.minimum.at(labels, left, low)
+        np.minimum.at(labels, right, low)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def salary_compatible(salaries, left, right):
+    """
+    候选对的薪资是否相容：薪资单位相同且月薪区间有交集（日薪 700-1000元/天 与月薪 19-20K 不相容）。
+    salaries 为 parse_salary_structured 的结果；无法解析的薪资只与同样无法解析的相容，避免经由它把不相容的岗位连成一簇。
+    """
+    units = salaries['薪资单位'].cat.codes.to_numpy()
+    low = salaries['月薪下限'].to_numpy()
+    high = salaries['月薪上限'].to_numpy()
+    both_unknown = (units[left] < 0) & (units[right] < 0)
+    same_unit = units[left] == units[right]
+    overlap = (low[left] <= high[right]) & (low[right] <= high[left])
+    return both_unknown | (same_unit & overlap)
+
+
+def lsh_clusters(signatures, blocking_keys=None, bands=LSH_BANDS, rows=LSH_ROWS,
+                 threshold=SIMILARITY_THRESHOLD, salaries=None):
+    """LSH 分桶找候选对，签名一致率达到阈值（且给出 salaries 时薪资相容）的候选对合并为同一簇"""
+    n = len(signatures)
+    if bands * rows > signatures.shape[1]:
+        raise ValueError("bands × rows 不能超过签名长度")
+    if blocking_keys is None:
+        blocking_keys = np.zeros(n, dtype=np.uint64)
+
+    left_parts, right_parts = [], []
+    for band in range(bands):
+        band_values = signatures[:, band * rows:(band + 1) * rows]
+        # 桶键 = 分块键（公司）+ 本段签名，保证只在同一公司内部比较
+        band_frame = pd.DataFrame(band_values)
+        band_frame['block'] = blocking_keys
+        keys = pd.util.hash_pandas_object(band_frame, index=False).to_numpy()
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        heads = first[inverse]
+        members = np.flatnonzero(heads != np.arange(n))
+        # 每个桶只和桶首比较，避免热门桶产生平方级候选对
+        left_parts.append(heads[members])
+        right_parts.append(members)
+
+    left = np.concatenate(left_parts)
+    right = np.concatenate(right_parts)
+    if len(left):
+        pairs = np.unique(np.stack([left, right], axis=1), axis=0)
+        left, right = pairs[:, 0], pairs[:, 1]
+        similarity = (signatures[left] == signatures[right]).mean(axis=1)
+        keep = similarity >= threshold
+        if salaries is not None:
+            keep &= salary_compatible(salaries, left, right)
+        left, right = left[keep], right[keep]
+
+    labels = _connected_components(n, left, right)
+    # 重新编号为 0..k-1，按首次出现的顺序
+    _, cluster_ids = np.unique(labels, return_inverse=True)
+    return cluster_ids
+
+
+def assign_duplicate_clusters(df, threshold=SIMILARITY_THRESHOLD, num_perm=NUM_PERM, bands=LSH_BANDS,
+                              rows=LSH_ROWS):
+    """
+    为每条岗位计算近似重复簇编号，返回与 df 索引对齐的 Series（列名：重复簇）。
+    (职位, 技能, 薪资, 公司) 完全相同的行一定在同一簇，LSH 只在这些去重后的组合上做，再按编码映射回每一行；
+    薪资不相容的岗位（单位不同或月薪区间不重叠）即使职位和技能相同也不合并。
+    """
+    if df.empty:
+        return pd.Series(dtype=np.int64, index=df.index, name='重复簇')
+
+    # 公司名只对不同的取值统一一次
+    company_codes, company_names = pd.factorize(df['公司'].astype(object))
+    companies = np.append(np.array([normalize_text(name) for name in company_names], dtype=object), '')
+    fields = df[['职位', '技能要求', '期待薪资']].fillna('').astype(str).assign(公司=companies[company_codes])
+    row_codes, combos = pd.MultiIndex.from_frame(fields).factorize()
+
+    # 相同的 (职位, 技能, 薪资) 组合只计算一次签名
+    combos = pd.DataFrame(list(combos), columns=fields.columns)
+    doc_codes, docs = pd.MultiIndex.from_frame(combos[['职位', '技能要求', '期待薪资']]).factorize()
+    feature_sets = [posting_features(title, skills, salary) for title, skills, salary in docs]
+    signatures = minhash_signatures(feature_sets, num_perm=num_perm)[doc_codes]
+    blocking_keys = pd.util.hash_array(combos['公司'].to_numpy(dtype=object))
+    salaries = parse_salary_structured(combos['期待薪资'].replace('', np.nan))
+    # 组合按首次出现的顺序编号，簇编号的顺序与逐行计算时一致
+    cluster_ids = lsh_clusters(signatures, blocking_keys, bands=bands, rows=rows, threshold=threshold,
+                               salaries=salaries)
+    return pd.Series(cluster_ids[row_codes], index=df.index, name='重复簇')
+
+
+def dedupe_postings(df, cluster_col='重复簇'):
+    """每个重复簇只保留第一条岗位"""
+    if cluster_col not in df.columns:
+        return df
+    return df.drop_duplicates(subset=cluster_col, keep='first')
@@ -0,0 +1,80 @@
+# filter_cache.py
+"""筛选结果缓存：按 (数据指纹, 筛选条件) 缓存命中行的位置数组（只读、所有会话共享），LRU + 过期时间淘汰"""
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# 最多缓存的筛选组合数
+FILTER_CACHE_SIZE = 256
+# 条目的存活时间（秒）
+FILTER_CACHE_TTL = 3600
+# 影响筛选结果的列（数据指纹只对这些列计算）
+FILTER_COLUMNS = ['城市', '行业', '学历', '工作经验', '月薪下限', '月薪上限', '重复簇', '职位', '公司', '技能要求']
+
+
+def dataset_fingerprint(df, columns=FILTER_COLUMNS):
+    """数据指纹：行数 + 指定列（None 为全部列）的内容哈希，数据变化后旧的缓存条目不会再被命中"""
+    frame = df if columns is None else df[[col for col in columns if col in df.columns]]
+    hashed = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+    return len(df), int(hashed.sum(dtype=np.uint64))
+
+
+class FilterCache:
+    """筛选条件 → 命中行位置的 LRU 缓存，进程内所有重跑和会话共享（线程安全）"""
+
+    def __init__(self, maxsize=FILTER_CACHE_SIZE, ttl=FILTER_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """
+        返回 key 对应的行位置数组；未命中或已过期时调用 compute() 计算并写入。
+        返回的数组是只读的，调用方不能原地修改。
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._values.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # 计算放在锁外，避免一个慢查询阻塞其他会话
+        rows = np.array(compute(), dtype=np.int64)
+        rows.setflags(write=False)
+        with self._lock:
+            self._values[key] = (now, rows)
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+        return rows
+
+    def clear(self):
+        """清空缓存和命中统计"""
+        with self._lock:
+            self._values.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """命中统计"""
+        total = self.hits + self.misses
+        return {
+            '条目数': len(self._values),
+            '容量': self.maxsize,
+            '命中': self.hits,
+            '未命中': self.misses,
+            '命中率': self.hits / total if total else 0.0,
+        }
+
+
+# 进程级共享缓存
+FILTER_CACHE = FilterCache()
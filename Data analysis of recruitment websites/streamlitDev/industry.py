@@ -0,0 +1,80 @@
+# industry.py
+"""行业分类：根据职位名称、技能要求和工作标签中的关键词划分行业"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# 默认规则文件：行业、优先级（数值越小越优先）和关键词
+INDUSTRY_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'industry_rules.json')
+DEFAULT_INDUSTRY = '其他'
+# 参与匹配的列（按此顺序转小写后拼接）
+TEXT_COLUMNS = ['职位', '技能要求', '工作标签']
+
+
+def load_industry_rules(path=INDUSTRY_RULES_PATH):
+    """读取规则文件，返回 (按优先级排序的规则列表, 默认行业)"""
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    rules = sorted(config['规则'], key=lambda rule: rule.get('优先级', 0))
+    return rules, config.get('默认行业', DEFAULT_INDUSTRY)
+
+
+class IndustryClassifier:
+    """按优先级依次检查各行业的关键词，取第一个命中的行业；批量分类时每段不同的文本只检查一次"""
+
+    def __init__(self, rules, default=DEFAULT_INDUSTRY):
+        # 规则已按优先级排序
+        self.rules = [(rule['行业'], [keyword.lower() for keyword in rule['关键词']]) for rule in rules]
+        self.default = default
+
+    @classmethod
+    def from_file(cls, path=INDUSTRY_RULES_PATH):
+        """从规则文件构建分类器"""
+        rules, default = load_industry_rules(path)
+        return cls(rules, default)
+
+    def classify_text(self, text):
+        """对一段（已转小写的）文本分类"""
+        for industry, keywords in self.rules:
+            if any(keyword in text for keyword in keywords):
+                return industry
+        return self.default
+
+    def classify(self, df):
+        """
+        批量分类，返回与 df 索引对齐的 Series（列名：行业）。
+        相同的 (职位, 技能要求, 工作标签) 组合只分类一次。
+        """
+        if df.empty:
+            return pd.Series(dtype=object, index=df.index, name='行业')
+        # 与 categorize_industry 一致：str() 后转小写再拼接（缺失值变成 'nan'）
+        text = df[TEXT_COLUMNS[0]].astype(object).map(str).str.lower()
+        for col in TEXT_COLUMNS[1:]:
+            text = text + df[col].astype(object).map(str).str.lower()
+        codes, uniques = pd.factorize(text)
+        labels = np.array([self.classify_text(value) for value in uniques], dtype=object)
+        return pd.Series(labels[codes], index=df.index, name='行业')
+
+
+_DEFAULT_CLASSIFIER = None
+
+
+def default_classifier():
+    """默认规则文件的分类器（首次调用时读取）"""
+    global _DEFAULT_CLASSIFIER
+    if _DEFAULT_CLASSIFIER is None:
+        _DEFAULT_CLASSIFIER = IndustryClassifier.from_file()
+    return _DEFAULT_CLASSIFIER
+
+
+def categorize_industry(row, classifier=None):
+    """逐行分类（规则同样来自规则文件，供 apply 对照；批量分类请用 classify_industries）"""
+    text = ''.join(str(row[col]).lower() for col in TEXT_COLUMNS)
+    return (classifier or default_classifier()).classify_text(text)
+
+
+def classify_industries(df, classifier=None):
+    """用默认规则文件对 df 批量分类"""
+    return (classifier or default_classifier()).classify(df)
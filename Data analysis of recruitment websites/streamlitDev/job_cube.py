@@ -0,0 +1,88 @@
+# job_cube.py
+"""岗位聚合立方体：入库时按 城市×行业×学历×工作经验 预先汇总岗位数、薪资样本数、薪资总和（含所有上卷组合）和薪资草图，看板指标直接查立方体"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from salary_sketch import SKETCH_DIMENSIONS, SKETCH_QUANTILES, GroupedSalarySketch, filter_mask
+
+# 每个单元格保存的可加度量
+CUBE_MEASURES = ['岗位数', '薪资样本数', '薪资总和']
+# group_stats 的输出列（行扫描版本 frame_group_stats 与之一致）
+GROUP_STATS_COLUMNS = ['岗位数', '薪资样本数', '平均薪资', '薪资中位数']
+# 缺失的维度取值（与薪资草图一致）
+MISSING_VALUE = '未知'
+
+
+def frame_group_stats(df, dimension, salary_col='平均薪资'):
+    """按行扫描计算某个维度的分组统计（搜索、月薪范围等立方体无法表达的筛选使用）"""
+    grouped = df.groupby(dimension)[salary_col]
+    return pd.DataFrame({
+        '岗位数': grouped.size(),
+        '薪资样本数': grouped.count(),
+        '平均薪资': grouped.mean(),
+        '薪资中位数': grouped.median(),
+    }, columns=GROUP_STATS_COLUMNS)
+
+
+class JobCube:
+    """
+    base 为最细粒度的单元格（每个维度组合一行）；rollups 为所有维度子集上卷后的汇总表，
+    查询时选用包含“分组维度 + 筛选维度”的最小汇总表，开销只与单元格数有关，与岗位行数无关。
+    """
+
+    def __init__(self, base, sketch, dimensions=SKETCH_DIMENSIONS):
+        self.dimensions = list(dimensions)
+        self.base = base.reset_index(drop=True)
+        self.sketch = sketch
+        self.rollups = {}
+        for size in range(len(self.dimensions) + 1):
+            for subset in combinations(self.dimensions, size):
+                if size == len(self.dimensions):
+                    self.rollups[frozenset(subset)] = self.base
+                elif size == 0:
+                    self.rollups[frozenset()] = self.base[CUBE_MEASURES].sum().to_frame().T
+                else:
+                    self.rollups[frozenset(subset)] = (self.base.groupby(list(subset), sort=False)[CUBE_MEASURES]
+                                                       .sum().reset_index())
+
+    @classmethod
+    def from_frame(cls, df, salary_col='平均薪资', dimensions=SKETCH_DIMENSIONS):
+        """从预处理后的数据构建立方体"""
+        keys = df[list(dimensions)].astype(object).fillna(MISSING_VALUE)
+        salaries = df[salary_col]
+        frame = keys.assign(岗位数=1, 薪资样本数=salaries.notna().astype(np.int64), 薪资总和=salaries.fillna(0.0))
+        base = frame.groupby(list(dimensions), sort=False)[CUBE_MEASURES].sum().reset_index()
+        return cls(base, GroupedSalarySketch.from_frame(df, salary_col, list(dimensions)), dimensions)
+
+    def _cells(self, filters, extra=()):
+        """满足筛选条件的汇总表行（汇总表只包含筛选维度和 extra 维度）"""
+        filters = {col: value for col, value in (filters or {}).items() if value is not None}
+        table = self.rollups[frozenset(filters) | frozenset(extra)]
+        return table[filter_mask(table, filters)]
+
+    def totals(self, filters=None):
+        """筛选条件下的岗位数、薪资样本数和平均薪资"""
+        cells = self._cells(filters)
+        jobs, samples, total = (cells[col].sum() for col in CUBE_MEASURES)
+        return {'岗位数': int(jobs), '薪资样本数': int(samples), '平均薪资': total / samples if samples else np.nan}
+
+    def quantiles(self, filters=None, quantiles=SKETCH_QUANTILES):
+        """筛选条件下的薪资分位数（由草图合并得到）"""
+        return self.sketch.quantiles(filters, quantiles)
+
+    def group_stats(self, dimension, filters=None):
+        """
+        按 dimension 分组的岗位数、薪资样本数、平均薪资和薪资中位数（其余维度按 filters 筛选），
+        列与 frame_group_stats 一致；缺失取值不作为分组（与 pandas groupby 一致）。
+        """
+        grouped = self._cells(filters, [dimension]).groupby(dimension)[CUBE_MEASURES].sum()
+        grouped = grouped[(grouped['岗位数'] > 0) & (grouped.index != MISSING_VALUE)]
+        medians = self.sketch.group_quantiles(dimension, filters, {'薪资中位数': 0.5})['薪资中位数']
+        return pd.DataFrame({
+            '岗位数': grouped['岗位数'].astype(np.int64),
+            '薪资样本数': grouped['薪资样本数'].astype(np.int64),
+            '平均薪资': grouped['薪资总和'] / grouped['薪资样本数'].where(grouped['薪资样本数'] > 0),
+            '薪资中位数': medians.reindex(grouped.index),
+        }, columns=GROUP_STATS_COLUMNS)
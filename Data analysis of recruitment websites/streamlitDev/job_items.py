@@ -0,0 +1,200 @@
+# job_items.py
+"""岗位列表列（技能要求、工作标签、福利列表）的向量化展开：一次生成 (行号, 条目) 长表，筛选后直接按行号计数"""
+import numpy as np
+import pandas as pd
+
+from skill_dict import SKILL_DICTIONARY
+
+# 列表列 → 长表中的条目列名
+ITEM_COLUMNS = {
+    '技能要求': '技能',
+    '工作标签': '标签',
+    '福利列表': '福利',
+}
+# 职位名称中识别出的技能（长表的条目列名）
+TITLE_SKILL_NAME = '职位技能'
+# 视为空列表的取值
+EMPTY_LISTS = ['[]', 'nan']
+
+
+def split_list_strings(texts):
+    """
+    把 "['Java', 'MySQL']" 形式的字符串整列拆开（与原 extract_skills_and_tags 的规则一致），
+    返回按原索引重复的条目 Series，空列表不产生条目。
+    """
+    text = texts.astype(object)
+    text = text[text.notna() & ~text.isin(EMPTY_LISTS)].astype(str)
+    items = (text.str.replace('[', '', regex=False)
+             .str.replace(']', '', regex=False)
+             .str.replace("'", '', regex=False)
+             .str.split(', ')
+             .explode()
+             .str.strip())
+    return items[items.notna() & (items != '')]
+
+
+def _drop_repeated_items(items):
+    """去掉同一取值内重复的条目（标准化后 C/C++ 和 C++ 会变成同一个技能）"""
+    repeated = pd.MultiIndex.from_arrays([items.index, items.to_numpy(dtype=object)]).duplicated()
+    return items[~repeated]
+
+
+def _explode_distinct(values, item_name, split):
+    """
+    把一列取值展开成长表，列为 行号（在输入中的位置）和 item_name（分类类型）。
+    相同的取值只用 split 拆分一次（split 返回按去重位置索引的条目 Series），再按编码复制到每一行。
+    """
+    values = pd.Series(values)
+    codes, uniques = pd.factorize(values.astype(object))
+    items = split(pd.Series(np.asarray(uniques, dtype=object)))
+
+    # 每个去重取值拆出的条目数和起始位置（条目按取值编号连续存放）
+    item_codes, item_names = pd.factorize(items, sort=False)
+    lengths = np.bincount(items.index.to_numpy(dtype=np.int64), minlength=len(uniques))
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if len(lengths) else lengths
+
+    row_lengths = np.append(lengths, 0)[codes]
+    row_starts = np.append(starts, 0)[codes]
+    total = int(row_lengths.sum())
+    row_ids = np.repeat(np.arange(len(values), dtype=np.int64), row_lengths)
+    # 第 r 行的第 j 个条目在 items 中的位置 = row_starts[r] + j
+    offsets = np.arange(total) - np.repeat(np.cumsum(row_lengths) - row_lengths, row_lengths)
+    positions = np.repeat(row_starts, row_lengths) + offsets
+
+    return pd.DataFrame({
+        '行号': row_ids,
+        item_name: pd.Categorical.from_codes(item_codes[positions], categories=pd.Index(item_names, dtype=object)),
+    })
+
+
+def explode_list_column(values, item_name, skill_dictionary=None):
+    """把一列列表字符串展开成长表；给定 skill_dictionary 时条目先统一成技能标准名"""
+    if skill_dictionary is None:
+        return _explode_distinct(values, item_name, split_list_strings)
+    return _explode_distinct(values, item_name,
+                             lambda texts: _drop_repeated_items(skill_dictionary.normalize(split_list_strings(texts))))
+
+
+def explode_title_skills(titles, skill_dictionary=SKILL_DICTIONARY):
+    """把职位名称中出现的已收录技能展开成长表（条目列名：职位技能）"""
+    return _explode_distinct(titles, TITLE_SKILL_NAME,
+                             lambda texts: _drop_repeated_items(skill_dictionary.title_skills(texts)))
+
+
+def explode_job_items(df, skill_dictionary=SKILL_DICTIONARY):
+    """
+    展开 df 中所有的列表列，返回 {条目列名: 长表}。
+    技能要求按技能字典标准化，并额外识别职位名称中的技能；skill_dictionary=None 时保留原始写法。
+    """
+    tables = {}
+    for col, item_name in ITEM_COLUMNS.items():
+        if col in df.columns:
+            dictionary = skill_dictionary if item_name == '技能' else None
+            tables[item_name] = explode_list_column(df[col], item_name, dictionary)
+    if skill_dictionary is not None and '职位' in df.columns:
+        tables[TITLE_SKILL_NAME] = explode_title_skills(df['职位'], skill_dictionary)
+    return tables
+
+
+def row_mask(full_index, subset_index):
+    """筛选结果在完整数据中的行位置掩码（长表的行号就是这些位置）"""
+    mask = np.zeros(len(full_index), dtype=bool)
+    mask[full_index.get_indexer(subset_index)] = True
+    return mask
+
+
+def count_items(long_table, mask=None):
+    """统计被选中行的条目频次，按频次从高到低排序（频次相同时按首次出现的顺序）"""
+    item_name = long_table.columns[1]
+    categories = long_table[item_name].cat.categories
+    codes = long_table[item_name].cat.codes.to_numpy()
+    if mask is not None:
+        codes = codes[mask[long_table['行号'].to_numpy()]]
+    counts = np.bincount(codes, minlength=len(categories))
+    order = np.argsort(-counts, kind='stable')
+    order = order[counts[order] > 0]
+    return pd.Series(counts[order], index=categories[order], name='需求频次').rename_axis(item_name)
+
+
+class IncidenceMatrix:
+    """
+    岗位 × 条目 的 0/1 稀疏矩阵（CSR：indptr 为每行的起止位置，indices 为条目编号）。
+    任意筛选掩码下的条目频次、按薪资加权的统计都只需一次稀疏矩阵转置乘向量。
+    """
+
+    def __init__(self, index, indptr, indices, items, item_name):
+        self.index = index
+        self.indptr = indptr
+        self.indices = indices
+        self.items = items
+        self.item_name = item_name
+        # 每个非零元所在的行，做转置乘法时用来取向量的对应分量
+        self.entry_rows = np.repeat(np.arange(len(index), dtype=np.int64), np.diff(indptr))
+
+    @classmethod
+    def from_long_table(cls, long_table, index):
+        """由 explode_list_column 的长表构建（长表已按行号排序）"""
+        item_name = long_table.columns[1]
+        row_ids = long_table['行号'].to_numpy()
+        indptr = np.zeros(len(index) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_ids, minlength=len(index)), out=indptr[1:])
+        indices = long_table[item_name].cat.codes.to_numpy().astype(np.int32)
+        return cls(index, indptr, indices, long_table[item_name].cat.categories, item_name)
+
+    @property
+    def shape(self):
+        return len(self.index), len(self.items)
+
+    def mask_for(self, subset_index):
+        """筛选结果（df 的子集）对应的行掩码"""
+        return row_mask(self.index, subset_index)
+
+    def rows_with(self, item):
+        """包含某个条目的行掩码（条目不存在时全为 False）"""
+        mask = np.zeros(len(self.index), dtype=bool)
+        positions = np.flatnonzero(self.items == item)
+        if len(positions):
+            mask[self.entry_rows[self.indices == positions[0]]] = True
+        return mask
+
+    def transpose_dot(self, vector):
+        """计算 Aᵀ·vector：每个条目上对应行的分量之和"""
+        vector = np.asarray(vector, dtype=float)
+        return np.bincount(self.indices, weights=vector[self.entry_rows], minlength=len(self.items))
+
+    def item_counts(self, mask=None):
+        """被选中行的条目频次，按频次从高到低排序（与 count_items 的结果一致）"""
+        if mask is None:
+            counts = np.bincount(self.indices, minlength=len(self.items))
+        else:
+            counts = self.transpose_dot(mask).astype(np.int64)
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0]
+        return pd.Series(counts[order], index=self.items[order], name='需求频次').rename_axis(self.item_name)
+
+    def item_salary_stats(self, salaries, mask=None):
+        """
+        每个条目的需求量和平均薪资（只统计有薪资的行），按需求量从高到低排序。
+        salaries 与矩阵的行对齐；mask 为空时统计全部行。
+        """
+        salaries = np.asarray(salaries, dtype=float)
+        selected = np.ones(len(salaries), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        has_salary = selected & ~np.isnan(salaries)
+        demand = self.transpose_dot(selected)
+        salary_count = self.transpose_dot(has_salary)
+        salary_sum = self.transpose_dot(np.where(has_salary, salaries, 0.0))
+
+        stats = pd.DataFrame({
+            '需求量': demand.astype(np.int64),
+            '薪资样本数': salary_count.astype(np.int64),
+            '平均薪资': salary_sum / np.where(salary_count > 0, salary_count, np.nan),
+        }, index=pd.Index(self.items, name=self.item_name))
+        stats = stats[stats['需求量'] > 0]
+        order = np.argsort(-stats['需求量'].to_numpy(), kind='stable')
+        return stats.iloc[order]
+
+
+def build_incidence_matrices(df, skill_dictionary=SKILL_DICTIONARY):
+    """为 df 的每个列表列（以及职位名称中的技能）构建岗位 × 条目稀疏矩阵，返回 {条目列名: IncidenceMatrix}"""
+    return {item_name: IncidenceMatrix.from_long_table(long_table, df.index)
+            for item_name, long_table in explode_job_items(df, skill_dictionary).items()}
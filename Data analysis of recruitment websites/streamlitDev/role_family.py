@@ -0,0 +1,143 @@
+# role_family.py
+"""职位族：按规则文件把各种写法的职位名称（Java开发工程师、java工程师、Java 工程师）归一成同一个职位族，每个不同的职位名只计算一次"""
+import json
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from skill_dict import SKILL_ALIAS_TABLE, skill_key
+
+# 默认规则文件
+ROLE_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'role_rules.json')
+ROLE_FAMILY_COLUMN = '职位族'
+# 最多缓存的不同职位名数
+ROLE_CACHE_SIZE = 50000
+
+# 括号及其内容（包括没有闭合的括号到结尾）
+_BRACKET_REGEX = re.compile(r'[(\[【][^)\]】]*(?:[)\]】]|$)')
+# 分隔符之后的部分通常是地点、方向或福利说明
+_SEPARATOR_REGEX = re.compile(r'\s+-\s*|[-—|,;]')
+# 开头的技术词，例如 java、c/c++、.net、c#
+_LEADING_TECH_REGEX = re.compile(r'^([a-z.][a-z0-9+#./]*)', re.IGNORECASE)
+_WHITESPACE_REGEX = re.compile(r'\s+')
+# 相邻两段在此处都是字母数字时拼接要保留空格（C++ QT软件工程师）
+_LATIN_END_REGEX = re.compile(r'[a-z0-9+#.]$', re.IGNORECASE)
+_LATIN_START_REGEX = re.compile(r'^[a-z0-9.]', re.IGNORECASE)
+
+
+def _case_insensitive(pattern):
+    """忽略大小写匹配字面文本的正则"""
+    return re.compile(re.escape(pattern), re.IGNORECASE)
+
+
+def _join_tokens(tokens):
+    """拼接词段：中文与字母之间直接拼接，两侧都是字母数字时用空格隔开"""
+    joined = ''
+    for token in tokens:
+        if joined and token and _LATIN_END_REGEX.search(joined) and _LATIN_START_REGEX.match(token):
+            joined += ' '
+        joined += token
+    return joined
+
+
+class RoleNormalizer:
+    """
+    职位名称 → 职位族。规则依次为：去掉括号内容和分隔符之后的部分、删除修饰词、替换同义词、
+    开头的技术词按只读的技能别名表统一写法、统一结尾的岗位后缀；只有技术词的职位名补上默认后缀。
+    匹配规则时忽略大小写，结果保留原职位名的大小写（已收录的技术词用别名表中的标准写法）。
+    结果只取决于职位名和规则文件，按原始职位名放进有上限的 LRU 缓存，新数据只需处理此前没见过的职位名。
+    """
+
+    def __init__(self, modifiers=(), synonyms=None, suffixes=None, default_suffix='工程师',
+                 alias_table=SKILL_ALIAS_TABLE, cache_size=ROLE_CACHE_SIZE):
+        # 较长的修饰词、同义词、后缀先匹配（开发工程师 优先于 开发）
+        self.modifiers = [_case_insensitive(modifier) for modifier in sorted(modifiers, key=len, reverse=True)]
+        self.synonyms = [(_case_insensitive(key), value) for key, value in
+                         sorted((synonyms or {}).items(), key=lambda pair: len(pair[0]), reverse=True)]
+        self.suffixes = [(key.casefold(), value) for key, value in
+                         sorted((suffixes or {}).items(), key=lambda pair: len(pair[0]), reverse=True)]
+        self.default_suffix = default_suffix
+        self.alias_table = alias_table
+        self.cached_canonicalize = lru_cache(maxsize=cache_size)(self.canonicalize)
+
+    @classmethod
+    def from_file(cls, path=ROLE_RULES_PATH, alias_table=SKILL_ALIAS_TABLE):
+        """从规则文件构建"""
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config.get('修饰词', []), config.get('同义词', {}), config.get('后缀归一', {}),
+                   config.get('默认后缀', '工程师'), alias_table)
+
+    def _tech_name(self, token):
+        """技术词的标准写法；整体不认识时取 / 拆开后第一个认识的（c++/qt → C++），都不认识时返回 None"""
+        for candidate in [token] + token.split('/'):
+            name = self.alias_table.get(skill_key(candidate))
+            if name is not None:
+                return name
+        return None
+
+    def canonicalize(self, title):
+        """单个职位名称的职位族"""
+        if not isinstance(title, str):
+            return None
+        original = _WHITESPACE_REGEX.sub(' ', unicodedata.normalize('NFKC', title)).strip()
+        text = ''
+        # 取分隔符前第一段删除修饰词后不为空的部分（兼职-全栈开发 → 全栈开发）
+        for part in _SEPARATOR_REGEX.split(_BRACKET_REGEX.sub(' ', original)):
+            for modifier in self.modifiers:
+                part = modifier.sub(' ', part)
+            part = part.strip(' /')
+            if part:
+                text = part
+                break
+        for key, value in self.synonyms:
+            text = key.sub(lambda _: value, text)
+
+        # 先按空白切词再去掉空白：开头的技术词统一写法，紧跟其后的已收录技术词也各自统一写法，
+        # 技术词之间用空格隔开（AI java开发 → AI Java开发）；其余部分直接拼接（java 开发 工程师 → Java开发工程师）
+        techs, rest = [], []
+        for token in text.split():
+            match = None if rest else _LEADING_TECH_REGEX.match(token)
+            name = self._tech_name(match.group(1)) if match else None
+            if match and (name is not None or not techs):
+                techs.append(name or match.group(1))
+                token = token[match.end():]
+            if token:
+                rest.append(token)
+        tech = ' '.join(techs)
+        text = _join_tokens(rest).strip('/')
+
+        for suffix, replacement in self.suffixes:
+            if text.casefold().endswith(suffix):
+                text = text[:-len(suffix)] + replacement
+                break
+        if tech and not text:
+            text = self.default_suffix
+        family = _join_tokens([tech, text])
+        return family or original or None
+
+    def families(self, titles):
+        """
+        批量归一，返回与输入索引对齐的职位族 Series；每个不同的职位名只查一次缓存。
+        只有大小写不同的职位族（嘉兴银行JAVA、嘉兴银行java）合并，统一用其中岗位数最多的写法。
+        """
+        titles = pd.Series(titles)
+        codes, uniques = pd.factorize(titles.astype(object))
+        labels = pd.Series([self.cached_canonicalize(title) for title in uniques], dtype=object)
+        if len(labels):
+            counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(labels)), index=labels.index)
+            ranked = pd.DataFrame({'label': labels, 'key': labels.str.casefold(), 'count': counts}).dropna()
+            ranked = ranked.groupby(['key', 'label'], sort=False)['count'].sum().reset_index()
+            ranked = ranked.sort_values(['count', 'label'], ascending=[False, True], kind='stable')
+            display = ranked.drop_duplicates('key').set_index('key')['label']
+            labels = [display[label.casefold()] if isinstance(label, str) else None for label in labels]
+        labels = np.array(list(labels) + [None], dtype=object)
+        return pd.Series(labels[codes], index=titles.index, name=ROLE_FAMILY_COLUMN)
+
+
+# 进程级共享归一器（缓存跨会话复用）
+ROLE_NORMALIZER = RoleNormalizer.from_file()
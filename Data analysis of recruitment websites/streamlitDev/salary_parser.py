@@ -0,0 +1,232 @@
+# salary_parser.py
+"""薪资解析：把「期待薪资」字符串转换为月薪数值（单位：元/月）"""
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# 预编译正则表达式
+SALARY_REGEX_K = re.compile(r'(\d+\.?\d*)-?(\d+\.?\d*)K')
+SALARY_REGEX_DAY = re.compile(r'(\d+)-(\d+)元/天')
+SALARY_REGEX_HOUR = re.compile(r'(\d+)-(\d+)元/时')
+SALARY_REGEX_SINGLE_DAY = re.compile(r'(\d+)元/天')
+SALARY_REGEX_SINGLE_HOUR = re.compile(r'(\d+)元/时')
+SALARY_REGEX_PLAIN = re.compile(r'(\d+\.?\d*)-?(\d+\.?\d*)')
+
+# 进程级解析缓存最多保存的不同薪资字符串个数
+SALARY_CACHE_SIZE = 100_000
+
+
+def process_salary(salary):
+    """处理薪资数据"""
+    if not isinstance(salary, str):
+        return None
+
+    salary = salary.strip()
+
+    if '元/天' in salary:
+        match = SALARY_REGEX_DAY.search(salary)
+        if match:
+            low, high = int(match.group(1)), int(match.group(2))
+            return (low + high) / 2 * 30
+        else:
+            match = SALARY_REGEX_SINGLE_DAY.search(salary)
+            if match:
+                return int(match.group(1)) * 30
+
+    elif '元/时' in salary:
+        match = SALARY_REGEX_HOUR.search(salary)
+        if match:
+            low, high = int(match.group(1)), int(match.group(2))
+            return (low + high) / 2 * 8 * 22
+        else:
+            match = SALARY_REGEX_SINGLE_HOUR.search(salary)
+            if match:
+                return int(match.group(1)) * 8 * 22
+
+    elif '万/年' in salary:
+        match = SALARY_REGEX_HOUR.search(salary)
+        if match:
+            low, high = int(match.group(1)), int(match.group(2))
+            return (low + high) / 2 * 8 * 22 * 12
+        else:
+            match = SALARY_REGEX_SINGLE_HOUR.search(salary)
+            if match:
+                return int(match.group(1)) * 8 * 22 * 12
+
+    else:
+        base_salary = salary.split('·')[0]
+        match = SALARY_REGEX_K.search(base_salary)
+        if match:
+            low = float(match.group(1))
+            high = float(match.group(2)) if match.group(2) else low
+            return (low + high) / 2 * 1000
+
+        match = SALARY_REGEX_PLAIN.search(base_salary)
+        if match:
+            low = float(match.group(1))
+            high = float(match.group(2)) if match.group(2) else low
+            return (low + high) / 2
+
+    return None
+
+
+def _parse_distinct(salaries):
+    """对（已去重的）薪资字符串逐个调用 process_salary，无法解析的为 NaN"""
+    values = [process_salary(salary) for salary in salaries]
+    return pd.Series([np.nan if value is None else value for value in values], index=salaries.index, dtype=float)
+
+
+class SalaryParseCache:
+    """按薪资字符串缓存解析结果的 LRU 缓存，进程内所有重跑和会话共享（线程安全）"""
+
+    def __init__(self, maxsize=SALARY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, keys):
+        """查询一组不同的薪资字符串，返回 (结果数组, 未命中掩码)"""
+        values = np.full(len(keys), np.nan)
+        missing = np.ones(len(keys), dtype=bool)
+        with self._lock:
+            for i, key in enumerate(keys):
+                value = self._values.get(key, self)
+                if value is not self:
+                    self._values.move_to_end(key)
+                    values[i] = value
+                    missing[i] = False
+            hits = int((~missing).sum())
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return values, missing
+
+    def store(self, keys, values):
+        """写入新解析的结果，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._values[key] = float(value)
+                self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def clear(self):
+        """清空缓存和命中统计"""
+        with self._lock:
+            self._values.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """命中统计"""
+        total = self.hits + self.misses
+        return {
+            '条目数': len(self._values),
+            '容量': self.maxsize,
+            '命中': self.hits,
+            '未命中': self.misses,
+            '命中率': self.hits / total if total else 0.0,
+        }
+
+
+# 进程级共享缓存
+SALARY_CACHE = SalaryParseCache()
+
+
+def parse_salary_series(salaries, cache=SALARY_CACHE):
+    """
+    整列版 process_salary：结果与逐行调用 process_salary 完全一致。
+    薪资字符串基数很低，先按类别编码去重，只对缓存中没有的取值调用 process_salary，再按编码映射回每一行；
+    提速全部来自去重和缓存（每个不同取值只解析一次），单个取值的解析仍是 process_salary。
+    返回与输入索引对齐的 float64 Series，无法解析的值为 NaN。cache=None 时不使用缓存。
+    """
+    salaries = pd.Series(salaries)
+    if isinstance(salaries.dtype, pd.CategoricalDtype):
+        codes, uniques = salaries.cat.codes.to_numpy(), salaries.cat.categories
+    else:
+        codes, uniques = pd.factorize(salaries)
+    uniques = np.asarray(uniques, dtype=object)
+
+    if cache is None:
+        parsed = _parse_distinct(pd.Series(uniques)).to_numpy(dtype=float)
+    else:
+        parsed, missing = cache.lookup(uniques)
+        if missing.any():
+            new_values = _parse_distinct(pd.Series(uniques[missing])).to_numpy(dtype=float)
+            parsed[missing] = new_values
+            cache.store(uniques[missing], new_values)
+
+    values = np.append(parsed, np.nan)[codes]
+    return pd.Series(values, index=salaries.index, name=salaries.name)
+
+
+# 结构化薪资：整串匹配「下限-上限 单位 ·N薪」
+SALARY_REGEX_STRUCTURED = re.compile(
+    r'(?P<low>\d+(?:\.\d+)?)(?:-(?P<high>\d+(?:\.\d+)?))?(?P<unit>K|元/天|元/时|元/周|元/月|万/年)(?:·(?P<months>\d+)薪)?'
+)
+# 各单位的 (薪资单位, 换算成元的倍数)
+SALARY_UNITS = {
+    'K': ('月', 1000),
+    '元/月': ('月', 1),
+    '元/天': ('天', 1),
+    '元/时': ('时', 1),
+    '元/周': ('周', 1),
+    '万/年': ('年', 10000),
+}
+# 换算成月薪的倍数（天、时沿用 process_salary 的 30 天、8 小时 × 22 天）
+MONTHLY_FACTORS = {'月': 1, '天': 30, '时': 8 * 22, '周': 52 / 12, '年': 1 / 12}
+# 默认每年发薪月数
+DEFAULT_PAY_MONTHS = 12
+STRUCTURED_COLUMNS = ['薪资单位', '薪资下限', '薪资上限', '年薪月数', '月薪下限', '月薪上限', '年化总薪酬']
+
+
+def _parse_structured_distinct(salaries):
+    """对（已去重的）薪资字符串做结构化解析"""
+    text = salaries.astype(object).str.strip()
+    parts = text.str.extract(SALARY_REGEX_STRUCTURED.pattern + '$')
+    unit_info = parts['unit'].map(SALARY_UNITS)
+    multiplier = unit_info.str[1].astype(float)
+    unit = unit_info.str[0]
+
+    low = parts['low'].astype(float) * multiplier
+    high = parts['high'].astype(float).fillna(parts['low'].astype(float)) * multiplier
+    months = parts['months'].astype(float)
+    months = months.where(unit == '月').fillna(DEFAULT_PAY_MONTHS).where(unit.notna())
+
+    monthly_factor = unit.map(MONTHLY_FACTORS).astype(float)
+    monthly_low = low * monthly_factor
+    monthly_high = high * monthly_factor
+    # 月薪按 N 薪折算全年；其余单位按 12 个月折算
+    annual = (monthly_low + monthly_high) / 2 * months
+
+    return pd.DataFrame({
+        '薪资单位': unit,
+        '薪资下限': low,
+        '薪资上限': high,
+        '年薪月数': months,
+        '月薪下限': monthly_low,
+        '月薪上限': monthly_high,
+        '年化总薪酬': annual,
+    })
+
+
+def parse_salary_structured(salaries):
+    """
+    把期待薪资解析成带类型的数值列：薪资单位（月/天/时/周/年）、薪资下限/上限（元/单位）、
+    年薪月数（·13薪 → 13）、月薪下限/上限（元/月）和年化总薪酬（元/年）。
+    与 parse_salary_series 一样先去重再映射回每一行，无法解析的行各列为空。
+    """
+    salaries = pd.Series(salaries)
+    codes, uniques = pd.factorize(salaries)
+    parsed = _parse_structured_distinct(pd.Series(np.asarray(uniques, dtype=object)))
+
+    # 每列末尾补一个空值，供缺失值（编码 -1）取用
+    unit_codes = pd.Categorical(parsed['薪资单位'], categories=list(MONTHLY_FACTORS)).codes
+    result = {'薪资单位': pd.Categorical.from_codes(np.append(unit_codes, -1)[codes], categories=list(MONTHLY_FACTORS))}
+    for col in STRUCTURED_COLUMNS[1:]:
+        result[col] = np.append(parsed[col].to_numpy(dtype=float), np.nan)[codes]
+    return pd.DataFrame(result, index=salaries.index)
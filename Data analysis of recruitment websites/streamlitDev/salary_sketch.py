@@ -0,0 +1,154 @@
+# salary_sketch.py
+"""可合并的薪资分位数草图：按 城市×行业×学历×工作经验 保存对数分桶计数，任意筛选组合合并后即可求分位数"""
+import numpy as np
+import pandas as pd
+
+# 草图的分组维度（与看板的筛选条件一致）
+SKETCH_DIMENSIONS = ['城市', '行业', '学历', '工作经验']
+# 看板展示的分位数
+SKETCH_QUANTILES = {'P25': 0.25, '中位数': 0.5, 'P75': 0.75, 'P90': 0.9}
+# 相对误差上限：分桶代表值与真实分位数相差不超过 1%
+RELATIVE_ACCURACY = 0.01
+# 分桶覆盖的薪资范围（元），超出范围的值落在首尾两个桶
+MIN_SALARY = 100.0
+MAX_SALARY = 10_000_000.0
+
+# 所有草图共用同一套分桶，合并时计数直接相加
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = np.log(_GAMMA)
+NUM_BUCKETS = int(np.ceil(np.log(MAX_SALARY / MIN_SALARY) / _LOG_GAMMA)) + 1
+# 第 i 个桶覆盖 (MIN·γ^(i-1), MIN·γ^i]，代表值取 2·MIN·γ^i / (γ+1)
+BUCKET_VALUES = 2 * MIN_SALARY * _GAMMA ** np.arange(NUM_BUCKETS) / (_GAMMA + 1)
+
+
+def bucket_index(values):
+    """把薪资映射到分桶编号，缺失值返回 -1"""
+    values = np.asarray(values, dtype=float)
+    buckets = np.full(values.shape, -1, dtype=np.int64)
+    valid = ~np.isnan(values)
+    clipped = np.clip(values[valid], MIN_SALARY, MAX_SALARY)
+    buckets[valid] = np.ceil(np.log(clipped / MIN_SALARY) / _LOG_GAMMA - 1e-9)
+    return np.clip(buckets, -1, NUM_BUCKETS - 1)
+
+
+def quantiles_from_counts(counts, quantiles=SKETCH_QUANTILES):
+    """
+    由分桶计数求分位数，返回以分位数名称为索引的 Series。
+    与 pandas 的 quantile 一样在相邻两个秩之间线性插值（样本很少时差别明显，例如两个样本的中位数）。
+    """
+    total = counts.sum()
+    if total == 0:
+        return pd.Series(np.nan, index=list(quantiles), dtype=float)
+    cumulative = np.cumsum(counts)
+    ranks = np.asarray(list(quantiles.values())) * (total - 1)
+    lower = BUCKET_VALUES[np.searchsorted(cumulative, np.floor(ranks), side='right')]
+    upper = BUCKET_VALUES[np.searchsorted(cumulative, np.ceil(ranks), side='right')]
+    return pd.Series(lower + (ranks - np.floor(ranks)) * (upper - lower), index=list(quantiles))
+
+
+def filter_mask(cells, filters=None):
+    """
+    维度表中满足筛选条件的行掩码。
+    filters 形如 {'城市': '杭州', '学历': ['本科', '硕士']}，取值为 None 表示不筛选。
+    """
+    mask = np.ones(len(cells), dtype=bool)
+    for col, value in (filters or {}).items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        mask &= cells[col].isin(values).to_numpy()
+    return mask
+
+
+class GroupedSalarySketch:
+    """
+    各维度组合的薪资分桶计数，以稀疏的 (单元格, 分桶, 计数) 三元组保存。
+    cells 是单元格的维度取值表，行号即单元格编号。
+    """
+
+    def __init__(self, cells, cell_ids, bucket_ids, bucket_counts):
+        self.cells = cells.reset_index(drop=True)
+        self.cell_ids = cell_ids
+        self.bucket_ids = bucket_ids
+        self.bucket_counts = bucket_counts
+
+    @classmethod
+    def _from_entries(cls, cells, cell_ids, bucket_ids, weights):
+        """合并相同 (单元格, 分桶) 的计数"""
+        keys = cell_ids.astype(np.int64) * NUM_BUCKETS + bucket_ids
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, weights=weights, minlength=len(unique_keys)).astype(np.int64)
+        return cls(cells, (unique_keys // NUM_BUCKETS).astype(np.int32),
+                   (unique_keys % NUM_BUCKETS).astype(np.int16), counts)
+
+    @classmethod
+    def from_frame(cls, df, salary_col='平均薪资', dimensions=SKETCH_DIMENSIONS):
+        """从预处理后的数据构建草图（只统计有薪资的行）"""
+        buckets = bucket_index(df[salary_col])
+        valid = buckets >= 0
+        keys = df.loc[valid, dimensions].astype(object).fillna('未知')
+        cell_ids, cells = pd.MultiIndex.from_frame(keys).factorize()
+        cells = pd.DataFrame(list(cells), columns=dimensions)
+        return cls._from_entries(cells, cell_ids, buckets[valid], None)
+
+    @classmethod
+    def from_counts(cls, frame, dimensions):
+        """由 to_frame 的长表恢复草图"""
+        if frame.empty:
+            return cls(pd.DataFrame(columns=dimensions), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int16),
+                       np.empty(0, dtype=np.int64))
+        cell_ids, cells = pd.MultiIndex.from_frame(frame[dimensions].astype(object)).factorize()
+        cells = pd.DataFrame(list(cells), columns=dimensions)
+        return cls._from_entries(cells, cell_ids, frame['分桶'].to_numpy(dtype=np.int64),
+                                 frame['计数'].to_numpy(dtype=float))
+
+    def to_frame(self):
+        """转换成可存盘的长表：每个非空的 (单元格, 分桶) 一行"""
+        frame = self.cells.iloc[self.cell_ids].reset_index(drop=True)
+        frame['分桶'] = self.bucket_ids
+        frame['计数'] = self.bucket_counts
+        return frame
+
+    def merge(self, other):
+        """合并另一个草图（例如另一个数据分块或另一天的快照），返回新草图"""
+        cells = pd.concat([self.cells, other.cells], ignore_index=True)
+        codes, unique_cells = pd.MultiIndex.from_frame(cells.astype(object)).factorize()
+        cell_ids = np.concatenate([codes[self.cell_ids], codes[len(self.cells) + other.cell_ids]])
+        bucket_ids = np.concatenate([self.bucket_ids, other.bucket_ids]).astype(np.int64)
+        weights = np.concatenate([self.bucket_counts, other.bucket_counts])
+        return self._from_entries(pd.DataFrame(list(unique_cells), columns=self.cells.columns),
+                                  cell_ids, bucket_ids, weights)
+
+    def cell_mask(self, filters=None):
+        """满足筛选条件的单元格掩码"""
+        return filter_mask(self.cells, filters)
+
+    def select(self, filters=None):
+        """
+        合并满足筛选条件的单元格，返回长度为 NUM_BUCKETS 的分桶计数。
+        filters 形如 {'城市': '杭州', '学历': ['本科', '硕士']}，取值为 None 表示不筛选。
+        """
+        entry_mask = self.cell_mask(filters)[self.cell_ids]
+        return np.bincount(self.bucket_ids[entry_mask], weights=self.bucket_counts[entry_mask],
+                           minlength=NUM_BUCKETS)
+
+    def group_quantiles(self, dimension, filters=None, quantiles=SKETCH_QUANTILES):
+        """按某个维度分组的薪资分位数（其余维度按 filters 筛选），返回以该维度取值为索引的 DataFrame"""
+        entry_mask = self.cell_mask(filters)[self.cell_ids]
+        group_codes, groups = pd.factorize(self.cells[dimension])
+        keys = group_codes[self.cell_ids[entry_mask]].astype(np.int64) * NUM_BUCKETS + self.bucket_ids[entry_mask]
+        counts = np.bincount(keys, weights=self.bucket_counts[entry_mask],
+                             minlength=len(groups) * NUM_BUCKETS).reshape(len(groups), NUM_BUCKETS)
+        present = counts.sum(axis=1) > 0
+        result = pd.DataFrame([quantiles_from_counts(row, quantiles) for row in counts[present]],
+                              index=pd.Index(np.asarray(groups)[present], name=dimension),
+                              columns=list(quantiles))
+        return result.sort_index()
+
+    def quantiles(self, filters=None, quantiles=SKETCH_QUANTILES):
+        """任意筛选组合的薪资分位数（相对误差不超过 RELATIVE_ACCURACY）"""
+        return quantiles_from_counts(self.select(filters), quantiles)
+
+    def sample_count(self, filters=None):
+        """满足筛选条件的薪资样本数"""
+        return int(self.select(filters).sum())
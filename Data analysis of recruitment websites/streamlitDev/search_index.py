@@ -0,0 +1,138 @@
+# search_index.py
+"""岗位搜索倒排索引：对职位（以及公司、技能）建立字符 n-gram 倒排表，子串和多关键词搜索只需合并几条倒排链"""
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# 可搜索的字段及其权重（职位名称命中排在前面）
+SEARCH_FIELDS = {'职位': 3.0, '公司': 1.0, '技能要求': 1.0}
+# 倒排表的 n-gram 长度；更短的关键词用单字倒排表
+NGRAM_SIZE = 2
+
+
+def normalize_search_text(text):
+    """搜索用的文本归一化：全角转半角、大小写折叠"""
+    if not isinstance(text, str):
+        return ''
+    return unicodedata.normalize('NFKC', text).casefold()
+
+
+def _grams(text, n):
+    """文本中所有长度为 n 的子串（去重）"""
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NgramIndex:
+    """
+    单个字段的倒排索引。相同的文本只索引一次：postings 把 n-gram 映射到有序的文本编号数组，
+    再用 CSR（doc_indptr / doc_rows）把文本编号映射回行位置。
+    """
+
+    def __init__(self, values, n=NGRAM_SIZE):
+        values = pd.Series(values)
+        codes, uniques = pd.factorize(values.astype(object))
+        self.n = n
+        self.texts = pd.Series([normalize_search_text(value) for value in uniques], dtype=object)
+        self.lengths = self.texts.str.len().to_numpy()
+
+        postings = {}
+        for doc_id, text in enumerate(self.texts):
+            for size in range(1, n + 1):
+                for gram in _grams(text, size):
+                    postings.setdefault(gram, []).append(doc_id)
+        self.postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+        # 文本编号 → 行位置（按行号排序）
+        valid = codes >= 0
+        order = np.argsort(codes[valid], kind='stable')
+        self.doc_rows = np.flatnonzero(valid)[order]
+        self.doc_indptr = np.zeros(len(self.texts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes[valid], minlength=len(self.texts)), out=self.doc_indptr[1:])
+
+    def match_docs(self, term):
+        """包含 term 的文本编号：先求各 n-gram 倒排链的交集，再逐个确认子串"""
+        size = min(len(term), self.n)
+        grams = sorted(_grams(term, size), key=lambda gram: len(self.postings.get(gram, ())))
+        if not grams:
+            return np.arange(len(self.texts), dtype=np.int32)
+        candidates = self.postings.get(grams[0])
+        if candidates is None:
+            return np.empty(0, dtype=np.int32)
+        for gram in grams[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, self.postings.get(gram, np.empty(0, dtype=np.int32)),
+                                        assume_unique=True)
+        if len(term) <= self.n or len(candidates) == 0:
+            return candidates
+        contains = self.texts.iloc[candidates].str.contains(term, regex=False).to_numpy(dtype=bool)
+        return candidates[contains]
+
+    def match_quality(self, doc_ids, term):
+        """命中质量：完全相同 3 分，前缀 2 分，其余子串 1 分，再加上关键词占文本长度的比例"""
+        lengths = self.lengths[doc_ids]
+        prefix = self.texts.iloc[doc_ids].str.startswith(term).to_numpy(dtype=bool)
+        base = np.where(prefix, np.where(lengths == len(term), 3.0, 2.0), 1.0)
+        return base + len(term) / np.maximum(lengths, 1)
+
+    def expand_rows(self, doc_ids, doc_scores):
+        """把文本编号上的得分展开到对应的每一行，返回 (行位置, 得分)"""
+        starts, ends = self.doc_indptr[doc_ids], self.doc_indptr[doc_ids + 1]
+        lengths = ends - starts
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return self.doc_rows[np.repeat(starts, lengths) + offsets], np.repeat(doc_scores, lengths)
+
+
+class JobSearchIndex:
+    """多字段岗位搜索：每个关键词在任一字段命中即可，多个关键词（空格分隔）必须全部命中"""
+
+    def __init__(self, df, fields=None):
+        fields = SEARCH_FIELDS if fields is None else fields
+        self.index = df.index
+        self.fields = {col: (NgramIndex(df[col]), weight) for col, weight in fields.items() if col in df.columns}
+
+    def search(self, query, fields=None):
+        """
+        返回 (行位置, 得分)，按得分从高到低排序（得分相同时保持原顺序）。
+        fields 可以只用部分字段，例如 ['职位']。
+        """
+        terms = [normalize_search_text(term) for term in query.split()]
+        terms = [term for term in terms if term]
+        if not terms:
+            return np.arange(len(self.index)), np.zeros(len(self.index))
+        selected = [self.fields[col] for col in (fields or self.fields) if col in self.fields]
+
+        rows, scores = None, None
+        for term in terms:
+            term_rows, term_scores = [], []
+            for field_index, weight in selected:
+                doc_ids = field_index.match_docs(term)
+                if len(doc_ids):
+                    field_rows, field_scores = field_index.expand_rows(
+                        doc_ids, weight * field_index.match_quality(doc_ids, term))
+                    term_rows.append(field_rows)
+                    term_scores.append(field_scores)
+            if not term_rows:
+                return np.empty(0, dtype=np.int64), np.empty(0)
+
+            # 同一行在多个字段命中时取最高分
+            term_rows, term_scores = np.concatenate(term_rows), np.concatenate(term_scores)
+            order = np.lexsort((-term_scores, term_rows))
+            term_rows, term_scores = term_rows[order], term_scores[order]
+            first = np.r_[True, term_rows[1:] != term_rows[:-1]]
+            term_rows, term_scores = term_rows[first], term_scores[first]
+
+            if rows is None:
+                rows, scores = term_rows, term_scores
+            else:
+                rows, left, right = np.intersect1d(rows, term_rows, assume_unique=True, return_indices=True)
+                scores = scores[left] + term_scores[right]
+
+        order = np.lexsort((rows, -scores))
+        return rows[order], scores[order]
+
+    def search_index(self, query, fields=None):
+        """搜索结果对应的 df 索引（按相关度排序）"""
+        rows, _ = self.search(query, fields)
+        return self.index[rows]
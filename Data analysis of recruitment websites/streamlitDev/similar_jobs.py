@@ -0,0 +1,152 @@
+# similar_jobs.py
+"""相似岗位推荐：职位名、技能和工作标签的 MinHash 签名（复用 dedup 的实现）建成 LSH 索引，按岗位或技能组合查找最相似的岗位"""
+import numpy as np
+import pandas as pd
+
+from dedup import minhash_signatures, normalize_text
+from job_items import explode_list_column
+from skill_dict import SKILL_DICTIONARY, skill_key
+
+# 签名长度 = 分桶数 × 每桶行数（Jaccard 约 0.3 以上的岗位大概率落入同一个桶）
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = 4
+DEFAULT_TOP_K = 10
+# 去重后的岗位数不超过该值时，LSH 候选不足 top_k 会改为逐个比较签名
+EXACT_SCAN_LIMIT = 200_000
+# 参与相似度计算的列
+FEATURE_COLUMNS = ['职位', '技能要求', '工作标签']
+
+# 把一段签名混合成 64 位桶键的奇数乘子
+_BAND_MULTIPLIERS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93,
+                              0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53, 0x94D049BB133111EB, 0xBF58476D1CE4E5B9],
+                             dtype=np.uint64)
+
+
+def _item_sets(values, item_name, prefix, skill_dictionary=None):
+    """把一列列表字符串转换成每行的特征集合（技能先统一成标准名）"""
+    long_table = explode_list_column(values, item_name, skill_dictionary)
+    sets = [set() for _ in range(len(values))]
+    for row, item in zip(long_table['行号'].to_numpy(), long_table[item_name].astype(object)):
+        sets[row].add(prefix + skill_key(item))
+    return sets
+
+
+def skill_features(skills, skill_dictionary=SKILL_DICTIONARY):
+    """用户输入的技能组合对应的特征集合（与岗位的技能特征使用同一套标准名）；只查字典，不会把没见过的技能加入字典"""
+    features = set()
+    for skill in skills:
+        key = skill_key(skill)
+        if key:
+            skill_id = skill_dictionary.lookup.get(key)
+            features.add('s:' + (skill_key(skill_dictionary.names[skill_id]) if skill_id is not None else key))
+    return features
+
+
+class MinHashLSH:
+    """LSH 分桶索引：每个分段的桶键排序后存放，查询时对每个分段二分查找同桶的文档"""
+
+    def __init__(self, signatures, bands=LSH_BANDS, rows=LSH_ROWS):
+        if bands * rows > signatures.shape[1]:
+            raise ValueError("bands × rows 不能超过签名长度")
+        if rows > len(_BAND_MULTIPLIERS):
+            raise ValueError(f"每桶行数不能超过 {len(_BAND_MULTIPLIERS)}")
+        self.signatures = signatures
+        self.bands = bands
+        self.rows = rows
+        keys = self.band_keys(signatures)
+        self.orders = np.argsort(keys, axis=1, kind='stable')
+        self.sorted_keys = np.take_along_axis(keys, self.orders, axis=1)
+
+    def band_keys(self, signatures):
+        """(分段数, 文档数) 的桶键矩阵"""
+        signatures = np.atleast_2d(signatures).astype(np.uint64)
+        blocks = signatures[:, :self.bands * self.rows].reshape(len(signatures), self.bands, self.rows)
+        return (blocks * _BAND_MULTIPLIERS[:self.rows]).sum(axis=2, dtype=np.uint64).T
+
+    def candidates(self, signature):
+        """与 signature 至少在一个分段同桶的文档编号"""
+        keys = self.band_keys(signature)[:, 0]
+        parts = []
+        for band, key in enumerate(keys):
+            start = np.searchsorted(self.sorted_keys[band], key, side='left')
+            end = np.searchsorted(self.sorted_keys[band], key, side='right')
+            parts.append(self.orders[band, start:end])
+        return np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+
+    def nearest(self, signature, top_k, exclude=None, exact_limit=EXACT_SCAN_LIMIT):
+        """签名一致率（Jaccard 估计值）最高的 top_k 个文档，返回 (文档编号, 相似度)"""
+        candidates = self.candidates(signature)
+        if len(candidates) < top_k + (exclude is not None) and len(self.signatures) <= exact_limit:
+            candidates = np.arange(len(self.signatures))
+        if exclude is not None:
+            candidates = candidates[candidates != exclude]
+        similarity = (self.signatures[candidates] == signature).mean(axis=1)
+        keep = similarity > 0
+        candidates, similarity = candidates[keep], similarity[keep]
+        order = np.lexsort((candidates, -similarity))[:top_k]
+        return candidates[order], similarity[order]
+
+
+class SimilarJobIndex:
+    """
+    相似岗位索引。相同的 (职位, 技能要求, 工作标签) 组合视为同一个文档，只计算一次签名；
+    岗位之间用 职位名二元组 + 技能 + 标签 的签名比较，技能组合查询用只含技能的签名比较。
+    """
+
+    def __init__(self, df, skill_dictionary=SKILL_DICTIONARY, num_perm=NUM_PERM, bands=LSH_BANDS, rows=LSH_ROWS):
+        self.index = df.index
+        self.skill_dictionary = skill_dictionary
+        self.num_perm = num_perm
+        fields = df[FEATURE_COLUMNS].fillna('').astype(str)
+        self.codes, uniques = pd.MultiIndex.from_frame(fields).factorize()
+        uniques = pd.DataFrame(list(uniques), columns=FEATURE_COLUMNS)
+
+        skill_sets = _item_sets(uniques['技能要求'], '技能', 's:', skill_dictionary)
+        tag_sets = _item_sets(uniques['工作标签'], '标签', 'g:')
+        posting_sets = []
+        for title, skills, tags in zip(uniques['职位'], skill_sets, tag_sets):
+            title = normalize_text(title)
+            features = {'t:' + title[i:i + 2] for i in range(max(len(title) - 1, 1))} if title else set()
+            posting_sets.append(features | skills | tags)
+
+        # 签名取值不超过 32 位，用 uint32 存放以减半内存
+        self.posting_lsh = MinHashLSH(minhash_signatures(posting_sets, num_perm).astype(np.uint32), bands, rows)
+        self.skill_lsh = MinHashLSH(minhash_signatures(skill_sets, num_perm).astype(np.uint32), bands, rows)
+
+        # 文档编号 → 行位置（CSR）
+        order = np.argsort(self.codes, kind='stable')
+        self.doc_rows = order
+        self.doc_indptr = np.zeros(len(uniques) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.codes, minlength=len(uniques)), out=self.doc_indptr[1:])
+
+    def _expand(self, doc_ids, similarity, top_k, exclude_row=None):
+        """把文档展开成行（同一文档的多行相似度相同），返回前 top_k 行的 相似度 Series（以 df 索引为索引）"""
+        rows, scores = [], []
+        for doc_id, score in zip(doc_ids, similarity):
+            doc_rows = self.doc_rows[self.doc_indptr[doc_id]:self.doc_indptr[doc_id + 1]]
+            if exclude_row is not None:
+                doc_rows = doc_rows[doc_rows != exclude_row]
+            rows.extend(doc_rows[:top_k - len(rows)])
+            scores.extend([score] * min(len(doc_rows), top_k - len(scores)))
+            if len(rows) >= top_k:
+                break
+        return pd.Series(scores, index=self.index[np.asarray(rows, dtype=np.int64)], name='相似度', dtype=float)
+
+    def similar_to_posting(self, label, top_k=DEFAULT_TOP_K):
+        """与某条岗位（df 的索引值）最相似的 top_k 条其他岗位"""
+        row = self.index.get_loc(label)
+        doc_id = self.codes[row]
+        signature = self.posting_lsh.signatures[doc_id]
+        # 文档本身的其他行（完全相同的职位/技能/标签）排在最前面
+        doc_ids, similarity = self.posting_lsh.nearest(signature, top_k, exclude=doc_id)
+        return self._expand(np.r_[doc_id, doc_ids], np.r_[1.0, similarity], top_k, exclude_row=row)
+
+    def similar_to_skills(self, skills, top_k=DEFAULT_TOP_K):
+        """技能组合与岗位技能要求最相似的 top_k 条岗位（技能名按技能字典统一写法）"""
+        features = skill_features(skills, self.skill_dictionary)
+        if not features:
+            return pd.Series(dtype=float, name='相似度')
+        signature = minhash_signatures([features], self.num_perm)[0].astype(np.uint32)
+        doc_ids, similarity = self.skill_lsh.nearest(signature, top_k)
+        return self._expand(doc_ids, similarity, top_k)
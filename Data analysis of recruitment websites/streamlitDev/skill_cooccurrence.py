@@ -0,0 +1,171 @@
+# skill_cooccurrence.py
+"""技能共现：由 岗位×技能 稀疏矩阵 X 计算 Xᵀ·X（两两技能同时出现的岗位数及其薪资），查询相关技能的提升度和 PMI"""
+import numpy as np
+import pandas as pd
+
+# 相关技能至少要共同出现的岗位数
+MIN_COOCCURRENCE = 2
+# 相关技能结果的列
+RELATED_COLUMNS = ['共现岗位数', '共现占比', '提升度', 'PMI', '薪资样本数', '平均薪资']
+
+
+def score_related(items, target_id, cooccur, item_counts, total, salary_count, salary_sum,
+                  min_count=MIN_COOCCURRENCE):
+    """
+    相关技能打分（各数组按条目编号对齐）：
+    共现占比 = 共现岗位数 / 目标技能岗位数；提升度 = P(a,b) / (P(a)·P(b))；PMI = log2(提升度)；
+    平均薪资为同时要求两个技能的岗位的平均薪资。按提升度从高到低排序。
+    """
+    target_count = item_counts[target_id]
+    keep = cooccur >= min_count
+    keep[target_id] = False
+    if target_count == 0 or not keep.any():
+        return pd.DataFrame(columns=RELATED_COLUMNS, index=pd.Index([], name=items.name))
+
+    ids = np.flatnonzero(keep)
+    lift = cooccur[ids] * total / (target_count * item_counts[ids])
+    result = pd.DataFrame({
+        '共现岗位数': cooccur[ids].astype(np.int64),
+        '共现占比': cooccur[ids] / target_count,
+        '提升度': lift,
+        'PMI': np.log2(lift),
+        '薪资样本数': salary_count[ids].astype(np.int64),
+        '平均薪资': salary_sum[ids] / np.where(salary_count[ids] > 0, salary_count[ids], np.nan),
+    }, index=pd.Index(items[ids], name=items.name))
+    order = np.lexsort((-result['共现岗位数'].to_numpy(), -lift))
+    return result.iloc[order]
+
+
+def related_items(matrix, item, mask=None, salaries=None, min_count=MIN_COOCCURRENCE):
+    """
+    任意筛选下与 item 共同出现的条目：只需要 Xᵀ·X 中 item 对应的一列，
+    即对“被选中且包含 item 的行”做一次转置乘向量，开销与非零元个数成正比。
+    """
+    selected = np.ones(len(matrix.index), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+    target_rows = selected & matrix.rows_with(item)
+    positions = np.flatnonzero(matrix.items == item)
+    if not len(positions) or not target_rows.any():
+        return pd.DataFrame(columns=RELATED_COLUMNS, index=pd.Index([], name=matrix.item_name))
+
+    salaries = np.full(len(matrix.index), np.nan) if salaries is None else np.asarray(salaries, dtype=float)
+    has_salary = target_rows & ~np.isnan(salaries)
+    return score_related(
+        pd.Index(matrix.items, name=matrix.item_name), positions[0],
+        matrix.transpose_dot(target_rows), matrix.transpose_dot(selected), int(selected.sum()),
+        matrix.transpose_dot(has_salary), matrix.transpose_dot(np.where(has_salary, salaries, 0.0)), min_count)
+
+
+def _row_pairs(matrix, mask):
+    """被选中行内所有有序条目对 (行号, a, b)，包括 a == b（对角线即条目频次）"""
+    degrees = np.diff(matrix.indptr)
+    entries = np.flatnonzero(mask[matrix.entry_rows])
+    rows = matrix.entry_rows[entries]
+    repeat = degrees[rows]
+    offsets = np.arange(repeat.sum()) - np.repeat(np.cumsum(repeat) - repeat, repeat)
+    partners = matrix.indptr[np.repeat(rows, repeat)] + offsets
+    return np.repeat(rows, repeat), matrix.indices[np.repeat(entries, repeat)], matrix.indices[partners]
+
+
+class CooccurrenceMatrix:
+    """
+    全量的技能共现矩阵 Xᵀ·X，以稀疏的 (a, b, 共现岗位数, 薪资样本数, 薪资总和) 保存（对称存储，含对角线）。
+    按技能名合并，因此可以逐个快照累加：merge 另一个快照的矩阵即为增量更新。
+    """
+
+    def __init__(self, items, pair_a, pair_b, counts, salary_counts, salary_sums, total_jobs, item_name='技能'):
+        self.items = pd.Index(items, dtype=object, name=item_name)
+        self.pair_a = pair_a
+        self.pair_b = pair_b
+        self.counts = counts
+        self.salary_counts = salary_counts
+        self.salary_sums = salary_sums
+        self.total_jobs = total_jobs
+
+    @classmethod
+    def _from_entries(cls, items, pair_a, pair_b, counts, salary_counts, salary_sums, total_jobs, item_name='技能'):
+        """合并相同 (a, b) 的计数"""
+        keys = pair_a.astype(np.int64) * max(len(items), 1) + pair_b
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+
+        def summed(weights):
+            return np.bincount(inverse, weights=weights, minlength=len(unique_keys))
+
+        return cls(items, (unique_keys // max(len(items), 1)).astype(np.int32),
+                   (unique_keys % max(len(items), 1)).astype(np.int32),
+                   summed(counts).astype(np.int64), summed(salary_counts).astype(np.int64),
+                   summed(salary_sums), total_jobs, item_name)
+
+    @classmethod
+    def from_incidence(cls, matrix, salaries=None, mask=None):
+        """由 IncidenceMatrix 计算（mask 为空时统计全部行，salaries 与矩阵的行对齐）"""
+        selected = np.ones(len(matrix.index), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        rows, pair_a, pair_b = _row_pairs(matrix, selected)
+        salaries = np.full(len(matrix.index), np.nan) if salaries is None else np.asarray(salaries, dtype=float)
+        pair_salaries = salaries[rows]
+        has_salary = ~np.isnan(pair_salaries)
+        return cls._from_entries(matrix.items, pair_a, pair_b, np.ones(len(rows)), has_salary.astype(float),
+                                 np.where(has_salary, pair_salaries, 0.0), int(selected.sum()), matrix.item_name)
+
+    def merge(self, other):
+        """合并另一个矩阵（例如新快照中新增的岗位），返回新矩阵"""
+        items = self.items.append(other.items).unique()
+        own_codes, other_codes = items.get_indexer(self.items), items.get_indexer(other.items)
+        return self._from_entries(
+            items,
+            np.concatenate([own_codes[self.pair_a], other_codes[other.pair_a]]),
+            np.concatenate([own_codes[self.pair_b], other_codes[other.pair_b]]),
+            np.concatenate([self.counts, other.counts]).astype(float),
+            np.concatenate([self.salary_counts, other.salary_counts]).astype(float),
+            np.concatenate([self.salary_sums, other.salary_sums]),
+            self.total_jobs + other.total_jobs, self.items.name)
+
+    def item_counts(self):
+        """每个条目的岗位数（对角线）"""
+        diagonal = self.pair_a == self.pair_b
+        return np.bincount(self.pair_a[diagonal], weights=self.counts[diagonal], minlength=len(self.items))
+
+    def related(self, item, min_count=MIN_COOCCURRENCE):
+        """与 item 共同出现的条目及其提升度、PMI 和平均薪资"""
+        positions = np.flatnonzero(self.items == item)
+        if not len(positions):
+            return pd.DataFrame(columns=RELATED_COLUMNS, index=pd.Index([], name=self.items.name))
+        column = self.pair_a == positions[0]
+
+        def dense(values):
+            return np.bincount(self.pair_b[column], weights=values[column], minlength=len(self.items))
+
+        return score_related(self.items, positions[0], dense(self.counts), self.item_counts(), self.total_jobs,
+                             dense(self.salary_counts), dense(self.salary_sums), min_count)
+
+    def to_frame(self):
+        """转换成可存盘的长表（只保存 a ≤ b 的一半）"""
+        upper = self.pair_a <= self.pair_b
+        return pd.DataFrame({
+            '条目A': self.items[self.pair_a[upper]],
+            '条目B': self.items[self.pair_b[upper]],
+            '共现岗位数': self.counts[upper],
+            '薪资样本数': self.salary_counts[upper],
+            '薪资总和': self.salary_sums[upper],
+        })
+
+    @classmethod
+    def empty(cls, item_name='技能'):
+        """空矩阵"""
+        return cls([], np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64),
+                   np.empty(0, dtype=np.int64), np.empty(0), 0, item_name)
+
+    @classmethod
+    def from_frame(cls, frame, total_jobs, item_name='技能'):
+        """由 to_frame 的长表恢复（total_jobs 为统计过的岗位总数）"""
+        items = pd.Index(pd.unique(pd.concat([frame['条目A'], frame['条目B']]).astype(object)))
+        pair_a, pair_b = items.get_indexer(frame['条目A']), items.get_indexer(frame['条目B'])
+        off_diagonal = pair_a != pair_b
+        # 补回对称的另一半
+        return cls._from_entries(
+            items,
+            np.concatenate([pair_a, pair_b[off_diagonal]]),
+            np.concatenate([pair_b, pair_a[off_diagonal]]),
+            np.concatenate([frame['共现岗位数'], frame['共现岗位数'][off_diagonal]]).astype(float),
+            np.concatenate([frame['薪资样本数'], frame['薪资样本数'][off_diagonal]]).astype(float),
+            np.concatenate([frame['薪资总和'], frame['薪资总和'][off_diagonal]]).astype(float),
+            total_jobs, item_name)
@@ -0,0 +1,119 @@
+# skill_dict.py
+"""技能标准化：标准名 + 别名字典编译成哈希表，入库时把各种写法（Java/java、SpringCloud/Spring Cloud）统一成同一个整数ID"""
+import json
+import os
+import re
+import threading
+import unicodedata
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+# 默认别名文件
+SKILL_ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_aliases.json')
+
+# 比较时忽略的字符（空白、连字符、下划线、点号）
+_IGNORED_CHARS_REGEX = re.compile(r'[\s\-_.·]+')
+# 职位名称中的英文技能词，例如 Java、C/C++、Node.js、C#
+_TITLE_TOKEN_REGEX = re.compile(r'[A-Za-z.][A-Za-z0-9+#.]*(?:/[A-Za-z][A-Za-z0-9+#.]*)*')
+
+
+def skill_key(name):
+    """技能的比较键：全角转半角、大小写折叠、去掉空格和连接符"""
+    if not isinstance(name, str):
+        return ''
+    return _IGNORED_CHARS_REGEX.sub('', unicodedata.normalize('NFKC', name).casefold())
+
+
+def load_alias_table(path=SKILL_ALIASES_PATH):
+    """只读别名表：比较键 → 标准名，只包含别名文件中的技能，不受运行中自动加入字典的技能影响"""
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    table = {}
+    for canonical, variants in config['技能'].items():
+        for name in [canonical] + list(variants):
+            table.setdefault(skill_key(name), canonical)
+    return MappingProxyType(table)
+
+
+class SkillDictionary:
+    """
+    技能字典：names[ID] 为标准名，lookup 把比较键映射到 ID。
+    文件中没有的技能在首次出现时自动加入（取出现最多的写法作为标准名），之后同一技能的各种写法共用一个 ID。
+    """
+
+    def __init__(self, aliases=None):
+        self.names = []
+        self.lookup = {}
+        self._lock = threading.Lock()
+        for canonical, variants in (aliases or {}).items():
+            skill_id = self._add(canonical)
+            for variant in variants:
+                self.lookup.setdefault(skill_key(variant), skill_id)
+
+    @classmethod
+    def from_file(cls, path=SKILL_ALIASES_PATH):
+        """从别名文件构建字典"""
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config['技能'])
+
+    def _add(self, name):
+        """加入一个标准名（比较键已存在时返回已有的 ID）"""
+        key = skill_key(name)
+        if key not in self.lookup:
+            self.lookup[key] = len(self.names)
+            self.names.append(name)
+        return self.lookup[key]
+
+    def __len__(self):
+        return len(self.names)
+
+    def encode(self, values):
+        """把一列技能名转换为整数 ID（缺失值或空字符串为 -1），相同的写法只查一次字典"""
+        values = pd.Series(values)
+        codes, uniques = pd.factorize(values)
+        uniques = np.asarray(uniques, dtype=object)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        keys = [skill_key(value) for value in uniques]
+
+        with self._lock:
+            # 未收录的技能按出现次数从多到少加入，出现最多的写法成为标准名
+            for i in np.argsort(-counts, kind='stable'):
+                if keys[i] and keys[i] not in self.lookup:
+                    self._add(uniques[i])
+            ids = np.array([self.lookup.get(key, -1) for key in keys], dtype=np.int32)
+        return np.append(ids, -1)[codes]
+
+    def normalize(self, values):
+        """把一列技能名转换为标准名，保留原索引"""
+        values = pd.Series(values)
+        ids = self.encode(values)
+        names = np.append(np.asarray(self.names, dtype=object), None)
+        return pd.Series(names[ids], index=values.index, name=values.name)
+
+    def title_skills(self, titles):
+        """
+        找出职位名称中出现的已收录技能（英文技能词，如 Java、C/C++、Python），
+        返回按原索引重复的标准名 Series；不会把未收录的词加入字典。
+        """
+        titles = pd.Series(titles).astype(object)
+        tokens = titles[titles.notna()].astype(str).str.findall(_TITLE_TOKEN_REGEX).explode().dropna()
+        keys = tokens.map(skill_key)
+        ids = keys.map(self.lookup)
+        # 整个词不认识时（如 TensorFlow/Caffe），再按 / 拆开逐个查
+        unknown = ids.isna() & keys.str.contains('/', regex=False)
+        if unknown.any():
+            parts = tokens[unknown].str.split('/').explode()
+            part_ids = parts.map(skill_key).map(self.lookup)
+            ids = pd.concat([ids[~unknown], part_ids]).sort_index(kind='stable')
+        ids = ids.dropna().astype(np.int64)
+        names = np.asarray(self.names, dtype=object)
+        return pd.Series(names[ids.to_numpy()], index=ids.index)
+
+
+# 进程级共享字典
+SKILL_DICTIONARY = SkillDictionary.from_file()
+# 进程级只读别名表
+SKILL_ALIAS_TABLE = load_alias_table()
@@ -0,0 +1,368 @@
+# streaming_agg.py
+"""分块流式聚合：一次扫描分块读取的数据，用可合并的部分聚合计算看板统计量，内存占用与数据量无关"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from company_dim import normalize_company_name
+from role_family import ROLE_FAMILY_COLUMN, ROLE_NORMALIZER
+from salary_parser import parse_salary_series
+from validation import validate_jobs
+
+# 默认分组维度（取值个数有限，与看板的筛选条件和图表维度一致）
+GROUP_COLUMNS = ['城市', '学历', '工作经验', '公司规模']
+# 取值个数不受限制的列只保留近似的高频取值（Misra-Gries），最多跟踪 TOP_CAPACITY 个
+TOP_COLUMNS = [ROLE_FAMILY_COLUMN, '职位']
+TOP_CAPACITY = 1000
+# 交叉统计维度（学历与工作经验交叉分析）
+CROSS_COLUMNS = [('学历', '工作经验')]
+# 薪资直方图使用固定分箱（元/月），各分块的直方图可以直接相加
+SALARY_BINS = np.append(np.arange(0, 100001, 2000, dtype=float), np.inf)
+# 每次读取的行数
+DEFAULT_CHUNKSIZE = 100_000
+# 公司数 HyperLogLog 的精度：2^14 个寄存器（16KB），相对误差约 0.8%
+HLL_PRECISION = 14
+
+# 与 load_data 一致的空值填充
+FILL_VALUES = {
+    '工作经验': '经验不限',
+    '学历': '学历不限',
+    '公司规模': '未公布',
+    '福利列表': '[]',
+}
+
+# 分组统计的列及其合并方式
+STAT_COLUMNS = {
+    '职位数量': 'sum',
+    '薪资样本数': 'sum',
+    '薪资总和': 'sum',
+    '最低薪资': 'min',
+    '最高薪资': 'max',
+}
+
+
+def prepare_chunk(chunk):
+    """对数据块做与 load_data 相同的校验（去掉重复表头等异常行）和空值处理，并计算平均薪资和职位族"""
+    chunk, _, _ = validate_jobs(chunk)
+    chunk = chunk.fillna({col: value for col, value in FILL_VALUES.items() if col in chunk.columns})
+    chunk['平均薪资'] = parse_salary_series(chunk['期待薪资'])
+    if '职位' in chunk.columns:
+        chunk[ROLE_FAMILY_COLUMN] = ROLE_NORMALIZER.families(chunk['职位'])
+    return chunk
+
+
+def _bit_length(values):
+    """uint64 数组每个元素的二进制位数（0 的位数为 0），逐段移位计算，结果精确"""
+    values = np.asarray(values, dtype=np.uint64).copy()
+    length = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = (values >> np.uint64(shift)) > 0
+        length += high * shift
+        values = np.where(high, values >> np.uint64(shift), values)
+    return length + (values > 0)
+
+
+class HyperLogLog:
+    """
+    基数估计：每个取值哈希成 64 位，前 precision 位选寄存器，其余位的前导零个数 + 1 记入寄存器最大值。
+    寄存器按位取最大即可合并，内存固定为 2^precision 字节。
+    """
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+        """加入一组字符串取值（重复取值不影响结果）"""
+        values = np.asarray(pd.unique(np.asarray(values, dtype=object)), dtype=object)
+        if not len(values):
+            return self
+        hashes = pd.util.hash_array(values)
+        remaining_bits = 64 - self.precision
+        buckets = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << remaining_bits) - 1)
+        ranks = (remaining_bits - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+        return self
+
+    def merge(self, other):
+        """合并另一个 HyperLogLog（精度必须一致）"""
+        if self.precision != other.precision:
+            raise ValueError("HyperLogLog 精度不一致，无法合并")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """估计的不同取值个数（取值较少时改用线性计数）"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class HeavyHitters:
+    """
+    Misra-Gries 高频取值：最多保留 capacity 个计数，超出时所有计数减去第 capacity+1 大的计数并删去不为正的。
+    计数是下界，少计的数量不超过累计减去的值（也不超过 总数 / (capacity + 1)）；取值个数不超过 capacity 时结果精确。
+    两份结果相加后同样裁剪即可合并。
+    """
+
+    def __init__(self, capacity=TOP_CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.total = 0
+        self.error = 0
+
+    def _combine(self, counts, total, error=0):
+        combined = pd.concat([self.counts, counts]) if not self.counts.empty else counts
+        combined = combined.groupby(level=0, sort=False).sum().astype(np.int64)
+        self.error += error
+        if len(combined) > self.capacity:
+            threshold = int(np.sort(combined.to_numpy())[::-1][self.capacity])
+            combined = combined - threshold
+            combined = combined[combined > 0]
+            self.error += threshold
+        self.counts = combined
+        self.total += total
+
+    def update(self, values):
+        """累加一组取值（忽略缺失值）"""
+        values = pd.Series(values).dropna()
+        self._combine(values.value_counts(sort=False), len(values))
+        return self
+
+    def merge(self, other):
+        """合并另一份高频取值"""
+        self._combine(other.counts, other.total, other.error)
+        return self
+
+    def max_error(self):
+        """计数可能少计的最大值"""
+        return self.error
+
+    def top(self, top_n=None):
+        """按计数降序的高频取值"""
+        counts = self.counts.sort_values(ascending=False, kind='stable')
+        return counts if top_n is None else counts.head(top_n)
+
+
+def _empty_stats():
+    """空的分组统计表"""
+    return pd.DataFrame({col: pd.Series(dtype=float) for col in STAT_COLUMNS})
+
+
+def _combine_stats(left, right):
+    """合并两张分组统计表"""
+    if left.empty:
+        return right
+    if right.empty:
+        return left
+    combined = pd.concat([left, right])
+    return combined.groupby(level=0).agg(STAT_COLUMNS)
+
+
+def _combine_counts(left, right):
+    """合并两份（可能是多级索引的）计数"""
+    if left.empty:
+        return right.astype(np.int64)
+    if right.empty:
+        return left
+    combined = pd.concat([left, right])
+    return combined.groupby(level=list(range(combined.index.nlevels))).sum().astype(np.int64)
+
+
+class PartialAggregate:
+    """可合并的部分聚合结果，每个分块（或每个快照文件）各算一份，最后合并"""
+
+    def __init__(self, group_columns=GROUP_COLUMNS, cross_columns=CROSS_COLUMNS, salary_bins=SALARY_BINS,
+                 top_columns=TOP_COLUMNS, top_capacity=TOP_CAPACITY):
+        self.group_columns = list(group_columns)
+        self.cross_columns = [tuple(cols) for cols in cross_columns]
+        self.salary_bins = np.asarray(salary_bins, dtype=float)
+
+        self.row_count = 0
+        self.salary_count = 0
+        self.salary_sum = 0.0
+        self.salary_hist = np.zeros(len(self.salary_bins) - 1, dtype=np.int64)
+        self.group_stats = {col: _empty_stats() for col in self.group_columns}
+        self.cross_counts = {cols: pd.Series(dtype=np.int64) for cols in self.cross_columns}
+        self.top_capacity = top_capacity
+        self.top_counts = {col: HeavyHitters(top_capacity) for col in top_columns}
+        # 公司数只需要基数，用 HyperLogLog 代替保存全部公司名
+        self.companies = HyperLogLog()
+
+    def update(self, chunk):
+        """把一个已预处理的数据块累加进当前聚合"""
+        salary = chunk['平均薪资']
+        valid_salary = salary.dropna()
+
+        self.row_count += len(chunk)
+        self.salary_count += len(valid_salary)
+        self.salary_sum += float(valid_salary.sum())
+        self.salary_hist += np.histogram(valid_salary.to_numpy(), bins=self.salary_bins)[0]
+
+        for col in self.group_columns:
+            if col not in chunk.columns:
+                continue
+            stats = chunk.groupby(col)['平均薪资'].agg(['size', 'count', 'sum', 'min', 'max'])
+            stats.columns = list(STAT_COLUMNS)
+            self.group_stats[col] = _combine_stats(self.group_stats[col], stats)
+
+        for cols in self.cross_columns:
+            if not all(col in chunk.columns for col in cols):
+                continue
+            counts = chunk.groupby(list(cols)).size()
+            self.cross_counts[cols] = _combine_counts(self.cross_counts[cols], counts)
+
+        for col, heavy_hitters in self.top_counts.items():
+            if col in chunk.columns:
+                heavy_hitters.update(chunk[col])
+
+        if '公司' in chunk.columns:
+            # 与公司维度一致：按归一后的公司名计数（每个不同的名称只归一一次）
+            names = [normalize_company_name(name) for name in chunk['公司'].dropna().unique()]
+            self.companies.add([name for name in names if name])
+
+        return self
+
+    def merge(self, other):
+        """合并另一份部分聚合结果（分箱与维度必须一致）"""
+        if not np.array_equal(self.salary_bins, other.salary_bins):
+            raise ValueError("薪资分箱不一致，无法合并")
+
+        self.row_count += other.row_count
+        self.salary_count += other.salary_count
+        self.salary_sum += other.salary_sum
+        self.salary_hist += other.salary_hist
+
+        for col, stats in other.group_stats.items():
+            self.group_stats[col] = _combine_stats(self.group_stats.get(col, _empty_stats()), stats)
+
+        for cols, counts in other.cross_counts.items():
+            current = self.cross_counts.get(cols, pd.Series(dtype=np.int64))
+            self.cross_counts[cols] = _combine_counts(current, counts)
+
+        for col, heavy_hitters in other.top_counts.items():
+            self.top_counts.setdefault(col, HeavyHitters(heavy_hitters.capacity)).merge(heavy_hitters)
+
+        self.companies.merge(other.companies)
+        return self
+
+    def overview(self):
+        """数据概览指标（总职位数、有效薪资数据、平均薪资、涉及公司（HyperLogLog 估计值））"""
+        return {
+            '总职位数': self.row_count,
+            '有效薪资数据': self.salary_count,
+            '平均薪资': self.salary_sum / self.salary_count if self.salary_count else np.nan,
+            '涉及公司': self.companies.count(),
+        }
+
+    def group_summary(self, col):
+        """按某一维度的汇总表：职位数量、薪资样本数、平均薪资、最低/最高薪资"""
+        stats = self.group_stats[col]
+        summary = pd.DataFrame({
+            '职位数量': stats['职位数量'].astype(np.int64),
+            '薪资样本数': stats['薪资样本数'].astype(np.int64),
+            '平均薪资': stats['薪资总和'] / stats['薪资样本数'].replace(0, np.nan),
+            '最低薪资': stats['最低薪资'],
+            '最高薪资': stats['最高薪资'],
+        })
+        summary.index.name = col
+        return summary
+
+    def mean_salary_by(self, col):
+        """等价于 df.groupby(col)['平均薪资'].mean().dropna()，按平均薪资降序"""
+        return self.group_summary(col)['平均薪资'].dropna().sort_values(ascending=False)
+
+    def value_counts(self, col, top_n=None):
+        """等价于 df[col].value_counts().head(top_n)；高频取值列的计数为近似值（见 HeavyHitters）"""
+        if col in self.top_counts:
+            counts = self.top_counts[col].top(top_n)
+        else:
+            counts = self.group_summary(col)['职位数量'].sort_values(ascending=False, kind='stable')
+            counts = counts if top_n is None else counts.head(top_n)
+        counts.name = 'count'
+        counts.index.name = col
+        return counts
+
+    def crosstab(self, row_col, col_col):
+        """等价于 pd.crosstab(df[row_col], df[col_col])"""
+        counts = self.cross_counts[(row_col, col_col)]
+        if counts.empty:
+            return pd.DataFrame()
+        return counts.unstack(fill_value=0)
+
+    def salary_histogram(self):
+        """返回固定分箱的薪资直方图（频数, 分箱边界）"""
+        return self.salary_hist.copy(), self.salary_bins.copy()
+
+    def approx_salary_quantile(self, q):
+        """根据固定分箱直方图线性插值估计薪资分位数"""
+        if self.salary_count == 0:
+            return np.nan
+        cumulative = np.cumsum(self.salary_hist)
+        target = q * self.salary_count
+        idx = int(np.searchsorted(cumulative, target, side='left'))
+        idx = min(idx, len(self.salary_hist) - 1)
+        low, high = self.salary_bins[idx], self.salary_bins[idx + 1]
+        if np.isinf(high):
+            return low
+        before = cumulative[idx - 1] if idx > 0 else 0
+        in_bin = self.salary_hist[idx]
+        fraction = (target - before) / in_bin if in_bin else 0.0
+        return low + (high - low) * fraction
+
+
+def iter_csv_chunks(paths, chunksize=DEFAULT_CHUNKSIZE, usecols=None):
+    """依次分块读取一个或多个 CSV 文件（例如每晚的爬取快照）"""
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    for path in paths:
+        for chunk in pd.read_csv(path, chunksize=chunksize, usecols=usecols):
+            yield chunk
+
+
+def aggregate_chunks(chunks, prepare=prepare_chunk, **kwargs):
+    """对分块迭代器做一次扫描聚合，内存占用只与单个分块和分组数有关"""
+    aggregate = PartialAggregate(**kwargs)
+    for chunk in chunks:
+        if prepare is not None:
+            chunk = prepare(chunk)
+        aggregate.update(chunk)
+    return aggregate
+
+
+def aggregate_csv(paths, chunksize=DEFAULT_CHUNKSIZE, prepare=prepare_chunk, **kwargs):
+    """分块读取 CSV 并聚合"""
+    return aggregate_chunks(iter_csv_chunks(paths, chunksize), prepare=prepare, **kwargs)
+
+
+def merge_aggregates(aggregates):
+    """合并多份部分聚合结果（例如按快照文件分别计算后合并），结果是新的聚合，不修改传入的任何一份"""
+    aggregates = list(aggregates)
+    if not aggregates:
+        return PartialAggregate()
+    first = aggregates[0]
+    result = PartialAggregate(first.group_columns, first.cross_columns, first.salary_bins,
+                              list(first.top_counts), first.top_capacity)
+    for other in aggregates:
+        result.merge(other)
+    return result
+
+
+if __name__ == "__main__":
+    # 用法：python streaming_agg.py data3.3.csv data3.4.csv ...
+    if len(sys.argv) < 2:
+        print("用法：python streaming_agg.py <csv文件> [<csv文件> ...]")
+        sys.exit(1)
+
+    result = aggregate_csv(sys.argv[1:])
+    for name, value in result.overview().items():
+        print(f"{name}: {value}")
+    print(f"薪资中位数（估计）: {result.approx_salary_quantile(0.5):.0f}")
+    print(result.group_summary('学历').sort_values('平均薪资', ascending=False).round(0))
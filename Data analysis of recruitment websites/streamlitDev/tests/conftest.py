@@ -0,0 +1,6 @@
+# conftest.py
+"""测试配置：看板脚本都在 streamlitDev 目录下直接导入，把该目录加入 sys.path"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,45 @@
+# test_dedup.py
+"""近似重复检测：同一公司职位技能相同但薪资不相容的岗位不合并"""
+import pandas as pd
+
+from dedup import assign_duplicate_clusters, dedupe_postings
+
+
+def postings(salaries, companies=None):
+    return pd.DataFrame({
+        '职位': ['Python开发工程师'] * len(salaries),
+        '技能要求': ["['Python', 'Django']"] * len(salaries),
+        '期待薪资': salaries,
+        '公司': companies or ['甲公司'] * len(salaries),
+    })
+
+
+def test_daily_and_monthly_salary_not_merged():
+    clusters = assign_duplicate_clusters(postings(['700-1000元/天', '19-20K']))
+    assert clusters.nunique() == 2
+
+
+def test_overlapping_monthly_salary_merged():
+    clusters = assign_duplicate_clusters(postings(['19-20K', '18-22K', '19-20K·13薪']))
+    assert clusters.nunique() == 1
+
+
+def test_disjoint_monthly_salary_not_merged():
+    clusters = assign_duplicate_clusters(postings(['8-10K', '19-20K']))
+    assert clusters.nunique() == 2
+
+
+def test_unparsed_salary_does_not_bridge_clusters():
+    clusters = assign_duplicate_clusters(postings(['700-1000元/天', None, '19-20K']))
+    assert clusters.iloc[0] != clusters.iloc[2]
+
+
+def test_different_companies_not_merged():
+    clusters = assign_duplicate_clusters(postings(['19-20K', '19-20K'], ['甲公司', '乙公司']))
+    assert clusters.nunique() == 2
+
+
+def test_dedupe_keeps_first_of_each_cluster():
+    df = postings(['19-20K', '18-22K', '700-1000元/天'])
+    df['重复簇'] = assign_duplicate_clusters(df)
+    assert dedupe_postings(df).index.tolist() == [0, 2]
@@ -0,0 +1,82 @@
+# test_industry.py
+"""行业分类：批量分类与逐行分类一致，且与改为规则文件之前写死在代码里的关键词规则结果相同"""
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from industry import TEXT_COLUMNS, IndustryClassifier, categorize_industry, classify_industries
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'dataCollection')
+
+# 规则文件之前的行业关键词（按优先级），作为回归基准：修改 industry_rules.json 时应同步更新这里
+LEGACY_RULES = [
+    ('人工智能', ['ai', '机器学习', '深度学习', 'nlp', '计算机视觉', 'llm', 'aigc']),
+    ('软件开发', ['python', 'java', 'c++', '前端', '后端', '全栈', '开发', '软件']),
+    ('数据分析', ['数据', '大数据', '数据分析', '数据挖掘']),
+    ('硬件/嵌入式', ['嵌入式', '硬件', '单片机', '物联网', '芯片', 'ic']),
+    ('销售/市场', ['销售', '市场', '商务', 'bd']),
+    ('教育培训', ['教育', '培训', '教师']),
+    ('客服', ['客服']),
+    ('运营', ['运营']),
+]
+
+
+def legacy_categorize(row):
+    text = ''.join(str(row[col]).lower() for col in TEXT_COLUMNS)
+    for industry, keywords in LEGACY_RULES:
+        if any(keyword in text for keyword in keywords):
+            return industry
+    return '其他'
+
+
+def load_real_rows():
+    frames = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, '*.csv'))):
+        try:
+            frames.append(pd.read_csv(path, usecols=TEXT_COLUMNS))
+        except (ValueError, pd.errors.EmptyDataError):
+            continue
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=TEXT_COLUMNS)
+
+
+SYNTHETIC_ROWS = pd.DataFrame({
+    '职位': ['AI算法工程师', 'Java开发', '数据运营', 'IC验证', '销售代表', '英语教师', '客服专员', '新媒体运营', '前台',
+           None, 'BD经理'],
+    '技能要求': ["['PyTorch']", "['Spring']", "['Excel']", "['Verilog']", "[]", "['教学']", "[]", "['抖音']", "[]",
+             "['Python']", None],
+    '工作标签': ["['大模型']", "[]", "[]", "['芯片']", "['商务']", "[]", "[]", "[]", "['行政']", "[]", "[]"],
+})
+
+
+@pytest.fixture(scope='module')
+def rows():
+    real = load_real_rows()
+    return pd.concat([real, SYNTHETIC_ROWS], ignore_index=True)
+
+
+def test_rule_file_matches_legacy_keywords():
+    classifier = IndustryClassifier.from_file()
+    assert [(industry, keywords) for industry, keywords in classifier.rules] == LEGACY_RULES
+
+
+def test_batch_matches_legacy_row_wise(rows):
+    expected = rows.apply(legacy_categorize, axis=1)
+    pd.testing.assert_series_equal(classify_industries(rows), expected.rename('行业'))
+
+
+def test_batch_matches_row_wise(rows):
+    classifier = IndustryClassifier.from_file()
+    row_wise = rows.apply(categorize_industry, axis=1, classifier=classifier)
+    np.testing.assert_array_equal(classify_industries(rows, classifier).to_numpy(), row_wise.to_numpy())
+
+
+def test_priority_order():
+    rows = pd.DataFrame({'职位': ['AI 销售'], '技能要求': ['[]'], '工作标签': ['[]']})
+    assert classify_industries(rows).iloc[0] == '人工智能'
+
+
+def test_empty_frame():
+    assert classify_industries(pd.DataFrame(columns=TEXT_COLUMNS)).empty
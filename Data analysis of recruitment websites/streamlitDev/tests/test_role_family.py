@@ -0,0 +1,36 @@
+# test_role_family.py
+"""职位族归一：匹配规则时忽略大小写，结果保留原职位名的大小写"""
+import pandas as pd
+import pytest
+
+from role_family import RoleNormalizer
+
+
+@pytest.fixture(scope='module')
+def normalizer():
+    return RoleNormalizer.from_file()
+
+
+@pytest.mark.parametrize('title, family', [
+    ('AI算法工程师', 'AI算法工程师'),
+    ('C++ QT 软件工程师', 'C++ QT软件工程师'),
+    ('java开发工程师', 'Java工程师'),
+    ('Java 工程师', 'Java工程师'),
+    ('JAVA工程师', 'Java工程师'),
+    ('安卓开发', 'Android工程师'),
+    ('兼职-全栈开发', '全栈工程师'),
+    ('【急招】AI Agent工程师', 'AI Agent工程师'),
+    ('Senior Python Developer', 'Python Developer'),
+])
+def test_canonicalize(normalizer, title, family):
+    assert normalizer.canonicalize(title) == family
+
+
+def test_families_merge_case_variants(normalizer):
+    families = normalizer.families(pd.Series(['嘉兴银行JAVA', '嘉兴银行java', '嘉兴银行java', 'Java开发']))
+    assert families.tolist() == ['嘉兴银行java', '嘉兴银行java', '嘉兴银行java', 'Java工程师']
+
+
+def test_families_match_canonicalize(normalizer):
+    titles = pd.Series(['Python开发', 'python 开发工程师', 'AI大模型开发工程师', 'C++ Developer'])
+    assert normalizer.families(titles).tolist() == [normalizer.canonicalize(title) for title in titles]
@@ -0,0 +1,106 @@
+# test_salary_parser.py
+"""薪资解析的性质测试：在随机薪资字符串上核对整列解析与逐行 process_salary 一致，以及结构化解析的字段合法"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench_salary import row_wise_parse, synthetic_salaries
+from salary_parser import (MONTHLY_FACTORS, SALARY_CACHE, SalaryParseCache, parse_salary_series,
+                           parse_salary_structured)
+
+# 随机语料的大小和种子
+CASES = 5_000
+SEEDS = [0, 1, 2]
+
+
+@pytest.fixture(params=SEEDS)
+def corpus(request):
+    return synthetic_salaries(CASES, request.param)
+
+
+def assert_same(left, right):
+    np.testing.assert_allclose(np.asarray(left, dtype=float), np.asarray(right, dtype=float), equal_nan=True)
+
+
+def test_matches_row_wise_process_salary(corpus):
+    assert_same(parse_salary_series(corpus, cache=SalaryParseCache()), row_wise_parse(corpus))
+
+
+def test_cache_does_not_change_results(corpus):
+    cache = SalaryParseCache()
+    cold = parse_salary_series(corpus, cache=cache)
+    warm = parse_salary_series(corpus, cache=cache)
+    uncached = parse_salary_series(corpus, cache=None)
+    assert cache.stats()['命中'] > 0
+    assert_same(warm, cold)
+    assert_same(uncached, cold)
+
+
+def test_small_cache_evicts_without_changing_results(corpus):
+    cache = SalaryParseCache(maxsize=50)
+    first = parse_salary_series(corpus, cache=cache)
+    second = parse_salary_series(corpus, cache=cache)
+    assert cache.stats()['条目数'] <= 50
+    assert_same(second, first)
+
+
+def test_shared_cache_matches_uncached(corpus):
+    assert_same(parse_salary_series(corpus), parse_salary_series(corpus, cache=None))
+    assert SALARY_CACHE.stats()['条目数'] <= SALARY_CACHE.maxsize
+
+
+def test_row_order_does_not_matter(corpus):
+    order = np.random.default_rng(0).permutation(len(corpus))
+    shuffled = parse_salary_series(corpus.iloc[order].reset_index(drop=True), cache=None)
+    assert_same(shuffled, parse_salary_series(corpus, cache=None).to_numpy()[order])
+
+
+def test_pay_months_suffix_does_not_change_monthly_salary(corpus):
+    text = corpus.fillna('').str.strip()
+    parsed = parse_salary_series(text, cache=None)
+    with_months = (text + '·13薪').where(text.str.endswith('K'), text)
+    assert_same(parse_salary_series(with_months, cache=None), parsed)
+
+
+def test_categorical_input_matches_object_input(corpus):
+    assert_same(parse_salary_series(corpus.astype('category'), cache=None), parse_salary_series(corpus, cache=None))
+
+
+def test_structured_fields_are_valid(corpus):
+    structured = parse_salary_structured(corpus)
+    unit = structured['薪资单位']
+    parsed = unit.notna()
+
+    assert unit[parsed].isin(list(MONTHLY_FACTORS)).all()
+    assert (structured.loc[parsed, '薪资下限'] <= structured.loc[parsed, '薪资上限']).all()
+    assert (structured.loc[parsed, '月薪下限'] <= structured.loc[parsed, '月薪上限']).all()
+    assert structured.loc[parsed, '年薪月数'].notna().all()
+    assert (structured.loc[parsed, '年薪月数'] >= 12).all()
+    # 只有按月计的薪资才有「·N薪」
+    assert (structured.loc[parsed & (unit != '月'), '年薪月数'] == 12).all()
+    # 无法解析的行各列都为空
+    assert structured.loc[~parsed].drop(columns='薪资单位').isna().all().all()
+    # 年化总薪酬 = 月薪均值 × 年薪月数
+    assert_same(structured['年化总薪酬'],
+                (structured['月薪下限'] + structured['月薪上限']) / 2 * structured['年薪月数'])
+
+
+def test_structured_monthly_midpoint_matches_average_salary(corpus):
+    # 月、天、时三种单位的区间薪资，折算月薪均值与 process_salary 一致；
+    # 不比较的：万/年（旧分支解析不到）、元/月、元/周，以及单值 K 薪资（旧正则把「67K」拆成 6 和 7）
+    text = corpus.fillna('').str.strip()
+    structured = parse_salary_structured(corpus)
+    comparable = (structured['薪资单位'].isin(['月', '天', '时']) & text.str.contains('-', regex=False)
+                  & ~text.str.contains('元/月', regex=False))
+    midpoint = (structured['月薪下限'] + structured['月薪上限']) / 2
+    assert comparable.any()
+    assert_same(midpoint[comparable], parse_salary_series(corpus, cache=None)[comparable])
+
+
+def test_known_values():
+    salaries = pd.Series(['15-25K·13薪', '200-300元/天', '50元/时', '面议', None])
+    assert_same(parse_salary_series(salaries, cache=None), [20000, 7500, 50 * 8 * 22, np.nan, np.nan])
+    structured = parse_salary_structured(salaries)
+    assert structured.loc[0, '年薪月数'] == 13
+    assert structured.loc[0, '年化总薪酬'] == 20000 * 13
+    assert structured.loc[1, '薪资单位'] == '天'
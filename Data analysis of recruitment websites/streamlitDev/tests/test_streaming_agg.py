@@ -0,0 +1,33 @@
+# test_streaming_agg.py
+"""流式聚合：分块聚合合并后与一次性聚合一致，合并不修改传入的部分聚合"""
+import pandas as pd
+
+from streaming_agg import PartialAggregate, merge_aggregates
+
+ROWS = pd.DataFrame({
+    '城市': ['杭州', '杭州', '上海', '北京', '上海', '杭州'],
+    '学历': ['本科', '硕士', '本科', '大专', '本科', '本科'],
+    '工作经验': ['1-3年', '3-5年', '1-3年', '经验不限', '在校/应届', '1-3年'],
+    '公司规模': ['20-99人', '100-499人', '20-99人', '未公布', '1000-9999人', '20-99人'],
+    '职位族': ['Java工程师', 'Python工程师', 'Java工程师', '测试工程师', 'Java工程师', 'Python工程师'],
+    '公司': ['甲公司', '乙公司', '甲公司', '丙公司', '丁公司', '乙公司'],
+    '平均薪资': [15000.0, 25000.0, 18000.0, None, 6000.0, 20000.0],
+})
+
+
+def test_merged_chunks_match_single_pass():
+    whole = PartialAggregate().update(ROWS)
+    merged = merge_aggregates([PartialAggregate().update(ROWS.iloc[:3]), PartialAggregate().update(ROWS.iloc[3:])])
+    assert merged.overview() == whole.overview()
+    pd.testing.assert_frame_equal(merged.group_summary('城市').sort_index(), whole.group_summary('城市').sort_index())
+    assert merged.value_counts('职位族').to_dict() == whole.value_counts('职位族').to_dict()
+
+
+def test_merge_does_not_mutate_inputs():
+    parts = [PartialAggregate().update(ROWS.iloc[:3]), PartialAggregate().update(ROWS.iloc[3:])]
+    before = [part.overview() for part in parts]
+    first = merge_aggregates(parts)
+    second = merge_aggregates(parts)
+    assert [part.overview() for part in parts] == before
+    assert first.overview() == second.overview()
+    assert second.overview()['总职位数'] == len(ROWS)
@@ -0,0 +1,48 @@
+# test_trend_store.py
+"""时间趋势库：按日期顺序增量写入，新增岗位只在首次出现那天计入"""
+import pandas as pd
+import pytest
+
+from trend_store import TrendStore, prepare_snapshot
+
+ROWS = pd.DataFrame({
+    '职位': ['Python开发工程师', 'Java开发工程师', '数据分析师'],
+    '公司': ['甲公司', '乙公司', '丙公司'],
+    '城市': ['杭州', '杭州', '上海'],
+    '期待薪资': ['15-20K', '18-25K', '10-15K'],
+    '学历': ['本科', '本科', '硕士'],
+    '工作经验': ['1-3年', '3-5年', '1-3年'],
+    '技能要求': ["['Python']", "['Java', 'MySQL']", "['SQL']"],
+    '工作标签': ['[]', '[]', '[]'],
+    '福利列表': ['[]', '[]', '[]'],
+    '公司规模': ['100-499人', '20-99人', '1000-9999人'],
+})
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TrendStore(str(tmp_path))
+
+
+def new_postings(store):
+    return store.trend()['新增岗位数'].astype(int).tolist()
+
+
+def test_new_postings_counted_on_first_day(store):
+    store.ingest_snapshot(prepare_snapshot(ROWS.iloc[:2]), '2025-09-01')
+    store.ingest_snapshot(prepare_snapshot(ROWS), '2025-09-02')
+    assert new_postings(store) == [2, 1]
+
+
+def test_reingesting_latest_day_does_not_double_count(store):
+    store.ingest_snapshot(prepare_snapshot(ROWS.iloc[:2]), '2025-09-01')
+    store.ingest_snapshot(prepare_snapshot(ROWS), '2025-09-02')
+    store.ingest_snapshot(prepare_snapshot(ROWS), '2025-09-02')
+    assert new_postings(store) == [2, 1]
+
+
+def test_out_of_order_snapshot_rejected(store):
+    store.ingest_snapshot(prepare_snapshot(ROWS), '2025-09-02')
+    with pytest.raises(ValueError):
+        store.ingest_snapshot(prepare_snapshot(ROWS.iloc[:2]), '2025-09-01')
+    assert new_postings(store) == [3]
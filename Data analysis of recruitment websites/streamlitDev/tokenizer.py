@@ -0,0 +1,75 @@
+# tokenizer.py
+"""分词服务：每个进程只加载一次 jieba 词典（可在后台线程预热，词典缓存到文件），批量分词时相同文本只分一次"""
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# jieba 前缀词典的序列化缓存，第二次启动起直接从缓存加载
+TOKENIZER_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'recruitment_jieba.cache')
+# 少于该长度的词（单字）不计入
+MIN_WORD_LENGTH = 2
+
+
+class JiebaTokenizer:
+    """延迟加载的 jieba 分词器：首次分词或调用 warm_up 时才导入 jieba 并构建词典，之后进程内复用"""
+
+    def __init__(self, cache_path=TOKENIZER_CACHE_PATH):
+        self.cache_path = cache_path
+        self.load_seconds = None
+        self._tokenizer = None
+        self._warm_thread = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """加载词典（线程安全，只加载一次）"""
+        with self._lock:
+            if self._tokenizer is None:
+                import jieba  # 延迟导入，不需要分词的页面不付出导入和建词典的开销
+                start = time.perf_counter()
+                tokenizer = jieba.Tokenizer()
+                tokenizer.cache_file = self.cache_path
+                tokenizer.initialize()
+                self.load_seconds = time.perf_counter() - start
+                self._tokenizer = tokenizer
+        return self._tokenizer
+
+    def warm_up(self):
+        """在后台线程加载词典，不阻塞当前请求（重复调用不会重复加载）"""
+        with self._lock:
+            if self._tokenizer is not None or self._warm_thread is not None:
+                return
+            self._warm_thread = threading.Thread(target=self._load, name='jieba-warm-up', daemon=True)
+            self._warm_thread.start()
+
+    @property
+    def ready(self):
+        """词典是否已经加载完成"""
+        return self._tokenizer is not None
+
+    def cut_words(self, text, min_length=MIN_WORD_LENGTH):
+        """对一段文本分词，去掉空白和过短的词"""
+        if not isinstance(text, str) or not text:
+            return []
+        words = (word.strip() for word in self._load().cut(text))
+        return [word for word in words if len(word) >= min_length]
+
+    def tokenize(self, texts, min_length=MIN_WORD_LENGTH):
+        """批量分词，返回与输入索引对齐的词列表 Series（相同的文本只分一次）"""
+        texts = pd.Series(texts)
+        codes, uniques = pd.factorize(texts.astype(object))
+        words = [self.cut_words(text, min_length) for text in uniques]
+        words = np.array(words + [[]], dtype=object)
+        return pd.Series(words[codes], index=texts.index, name=texts.name)
+
+    def word_counts(self, texts, min_length=MIN_WORD_LENGTH):
+        """批量分词并统计词频，按频次从高到低排序"""
+        words = self.tokenize(texts, min_length).explode().dropna()
+        return words.value_counts()
+
+
+# 进程级共享分词器
+JIEBA_TOKENIZER = JiebaTokenizer()
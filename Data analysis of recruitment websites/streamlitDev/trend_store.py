@@ -0,0 +1,256 @@
+# trend_store.py
+"""时间趋势库：每次爬取快照增量写入按天的聚合和薪资分桶草图（城市×行业×学历×工作经验），并记录岗位首次/最后出现日期"""
+import argparse
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_paths import data_path
+from industry import classify_industries
+from job_items import IncidenceMatrix, explode_list_column
+from salary_parser import parse_salary_series
+from salary_sketch import GroupedSalarySketch
+from skill_cooccurrence import CooccurrenceMatrix
+from skill_dict import SKILL_DICTIONARY
+from streaming_agg import FILL_VALUES
+from validation import validate_jobs
+
+# 默认存储目录（运行时数据目录下，看板和命令行写入同一个位置）
+TREND_STORE_DIR = data_path('trend_store')
+# 聚合维度
+DIMENSIONS = ['城市', '行业', '学历', '工作经验']
+# 趋势图展示的薪资分位数（由按天的分桶草图合并后计算）
+QUANTILES = {'P25': 0.25, '中位数': 0.5, 'P75': 0.75}
+# 按天聚合表中可以直接相加的列
+DAILY_MEASURES = ['岗位数', '新增岗位数', '薪资样本数', '薪资总和']
+# 用于识别同一岗位的列
+POSTING_KEY_COLUMNS = ['职位', '公司', '城市', '期待薪资']
+
+
+def prepare_snapshot(df):
+    """对一份原始快照做校验、空值处理、薪资解析和行业分类"""
+    df, _, _ = validate_jobs(df)
+    df = df.fillna({col: value for col, value in FILL_VALUES.items() if col in df.columns})
+    df['平均薪资'] = parse_salary_series(df['期待薪资'])
+    df['行业'] = classify_industries(df)
+    return df
+
+
+def posting_keys(df):
+    """岗位指纹（64 位哈希），用来跨快照识别同一岗位"""
+    return pd.util.hash_pandas_object(df[POSTING_KEY_COLUMNS].fillna(''), index=False).to_numpy()
+
+
+def daily_aggregates(df, snapshot_date, new_mask=None):
+    """计算单个快照的按天聚合：岗位数、新增岗位数、薪资样本数、薪资总和"""
+    frame = df[DIMENSIONS + ['平均薪资']].copy()
+    frame['新增岗位数'] = new_mask if new_mask is not None else True
+    grouped = frame.groupby(DIMENSIONS, dropna=False)
+
+    result = grouped.agg(
+        岗位数=('平均薪资', 'size'),
+        新增岗位数=('新增岗位数', 'sum'),
+        薪资样本数=('平均薪资', 'count'),
+        薪资总和=('平均薪资', 'sum'),
+    ).reset_index()
+    result.insert(0, '日期', pd.Timestamp(snapshot_date).normalize())
+    return result
+
+
+def daily_sketch(df, snapshot_date):
+    """单个快照的薪资分桶草图长表（日期 + 维度 + 分桶 + 计数），各天、各单元格的计数可以直接相加"""
+    frame = GroupedSalarySketch.from_frame(df, '平均薪资', DIMENSIONS).to_frame()
+    frame.insert(0, '日期', pd.Timestamp(snapshot_date).normalize())
+    return frame
+
+
+class TrendStore:
+    """按天聚合的趋势库，数据保存在目录下的几个 CSV 文件中"""
+
+    def __init__(self, directory=TREND_STORE_DIR):
+        self.directory = directory
+        self.daily_path = os.path.join(directory, 'daily_aggregates.csv')
+        self.sketch_path = os.path.join(directory, 'daily_salary_sketch.csv')
+        self.postings_path = os.path.join(directory, 'postings.csv')
+        self.cooccurrence_path = os.path.join(directory, 'skill_cooccurrence.csv')
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, path, load):
+        """读取文件并按修改时间缓存在内存中：其他进程（trend_store.py 命令行）写入新快照后，下一次读取即可看到"""
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        with self._lock:
+            entry = self._cache.get(path)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+        value = load()
+        with self._lock:
+            self._cache[path] = (mtime, value)
+        return value
+
+    def exists(self):
+        """是否已经写入过快照"""
+        return os.path.exists(self.daily_path)
+
+    def load_daily(self):
+        """读取按天聚合表"""
+        def load():
+            if os.path.exists(self.daily_path):
+                return pd.read_csv(self.daily_path, parse_dates=['日期'])
+            return pd.DataFrame(columns=['日期'] + DIMENSIONS + DAILY_MEASURES)
+        return self._cached(self.daily_path, load)
+
+    def load_sketch_frame(self):
+        """读取按天的薪资分桶草图长表"""
+        def load():
+            if os.path.exists(self.sketch_path):
+                return pd.read_csv(self.sketch_path, parse_dates=['日期'])
+            return pd.DataFrame(columns=['日期'] + DIMENSIONS + ['分桶', '计数'])
+        return self._cached(self.sketch_path, load)
+
+    def load_sketch(self):
+        """按 日期×城市×行业×学历×工作经验 的薪资草图"""
+        return self._cached(self.sketch_path + '#sketch', lambda: GroupedSalarySketch.from_counts(
+            self.load_sketch_frame(), ['日期'] + DIMENSIONS))
+
+    def load_postings(self):
+        """读取岗位首次/最后出现日期表"""
+        def load():
+            if os.path.exists(self.postings_path):
+                postings = pd.read_csv(self.postings_path, parse_dates=['首次出现', '最后出现'],
+                                       dtype={'岗位指纹': np.uint64})
+                return postings.set_index('岗位指纹')
+            return pd.DataFrame({'首次出现': pd.Series(dtype='datetime64[ns]'),
+                                 '最后出现': pd.Series(dtype='datetime64[ns]')},
+                                index=pd.Index([], dtype=np.uint64, name='岗位指纹'))
+        return self._cached(self.postings_path, load)
+
+    def load_cooccurrence(self):
+        """读取累计的技能共现矩阵（每个岗位只在首次出现时计入一次）"""
+        def load():
+            if not os.path.exists(self.cooccurrence_path):
+                return CooccurrenceMatrix.empty()
+            frame = pd.read_csv(self.cooccurrence_path, encoding='utf-8-sig')
+            return CooccurrenceMatrix.from_frame(frame, len(self.load_postings()))
+        return self._cached(self.cooccurrence_path, load)
+
+    def ingest_snapshot(self, df, snapshot_date):
+        """
+        增量写入一份已预处理的快照（含 平均薪资、行业 列）。
+        同一天重复写入会覆盖当天的聚合，不会重复计数。
+        快照必须按日期顺序写入：早于最近快照的日期会改变之后各天的新增岗位数，直接报错。
+        """
+        snapshot_date = pd.Timestamp(snapshot_date).normalize()
+        latest = self.latest_date()
+        if latest is not None and snapshot_date < latest:
+            raise ValueError(f"快照日期 {snapshot_date.date()} 早于趋势库最近的快照 {latest.date()}，请按日期顺序写入")
+        keys = posting_keys(df)
+        postings = self.load_postings()
+
+        # 新增岗位：此前从未出现，或首次出现就是当天（重复写入同一天时）
+        first_seen = postings['首次出现'].reindex(keys)
+        new_mask = (first_seen.isna() | (first_seen == snapshot_date)).to_numpy()
+
+        # 技能共现矩阵只累加此前从未出现过的岗位，同一天重复写入时不会重复计入
+        skill_matrix = IncidenceMatrix.from_long_table(
+            explode_list_column(df['技能要求'], '技能', SKILL_DICTIONARY), df.index)
+        unseen = first_seen.isna().to_numpy() & ~pd.Index(keys).duplicated()
+        cooccurrence = self.load_cooccurrence().merge(
+            CooccurrenceMatrix.from_incidence(skill_matrix, df['平均薪资'], unseen))
+
+        unique_keys = pd.Index(pd.unique(keys), name='岗位指纹')
+        seen = pd.DataFrame({'首次出现': snapshot_date, '最后出现': snapshot_date}, index=unique_keys)
+        postings = pd.concat([postings, seen])
+        postings = postings.groupby(level=0).agg({'首次出现': 'min', '最后出现': 'max'})
+
+        daily = self.load_daily()
+        daily = daily[daily['日期'] != snapshot_date]
+        today = daily_aggregates(df, snapshot_date, new_mask)
+        daily = pd.concat([daily, today], ignore_index=True) if not daily.empty else today
+        daily = daily.sort_values('日期', kind='stable').reset_index(drop=True)
+
+        sketch = self.load_sketch_frame()
+        sketch = sketch[sketch['日期'] != snapshot_date]
+        today_sketch = daily_sketch(df, snapshot_date)
+        sketch = pd.concat([sketch, today_sketch], ignore_index=True) if not sketch.empty else today_sketch
+        sketch = sketch.sort_values('日期', kind='stable').reset_index(drop=True)
+
+        os.makedirs(self.directory, exist_ok=True)
+        daily.to_csv(self.daily_path, index=False, encoding='utf-8-sig')
+        sketch.to_csv(self.sketch_path, index=False, encoding='utf-8-sig')
+        postings.to_csv(self.postings_path, index_label='岗位指纹', encoding='utf-8-sig')
+        cooccurrence.to_frame().to_csv(self.cooccurrence_path, index=False, encoding='utf-8-sig')
+        with self._lock:
+            self._cache.clear()
+        return today
+
+    def latest_date(self):
+        """最近一次快照的日期"""
+        daily = self.load_daily()
+        return daily['日期'].max() if not daily.empty else None
+
+    def trend(self, filters=None, freq='D'):
+        """
+        按时间返回趋势：岗位数、新增岗位数、薪资样本数、平均薪资和薪资分位数。
+        filters 形如 {'城市': '杭州', '学历': ['本科', '硕士']}，取值为 None 表示不筛选。
+        freq 为 pandas 的周期频率（'D' 按天，'W' 按周，'M' 按月）。
+        岗位数和薪资样本数是快照当天的在招存量，按周/月时取周期内各快照日的平均值；
+        新增岗位数是流量（每个岗位只在首次出现那天计入），按周期累加；
+        分位数由周期内所有快照日、所有被选单元格的分桶计数合并后求出。
+        """
+        daily = self.load_daily()
+        if daily.empty:
+            return pd.DataFrame()
+
+        mask = pd.Series(True, index=daily.index)
+        for col, value in (filters or {}).items():
+            if value is None:
+                continue
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= daily[col].isin(values)
+        selected = daily[mask]
+        if selected.empty:
+            return pd.DataFrame()
+
+        # 先按快照日合并各单元格，再按周期汇总
+        by_day = selected.groupby('日期')[DAILY_MEASURES].sum()
+        periods = by_day.index.to_period(freq).start_time if freq != 'D' else by_day.index
+        grouped = by_day.groupby(periods)
+        result = pd.DataFrame({
+            '快照天数': grouped.size(),
+            '岗位数': grouped['岗位数'].mean(),
+            '新增岗位数': grouped['新增岗位数'].sum(),
+            '薪资样本数': grouped['薪资样本数'].mean(),
+            '平均薪资': grouped['薪资总和'].sum() / grouped['薪资样本数'].sum().replace(0, np.nan),
+        })
+
+        sketch = self.load_sketch()
+        dates = pd.DatetimeIndex(sketch.cells['日期'])
+        cells = sketch.cells.assign(周期=dates.to_period(freq).start_time if freq != 'D' else dates)
+        quantiles = GroupedSalarySketch(cells, sketch.cell_ids, sketch.bucket_ids, sketch.bucket_counts) \
+            .group_quantiles('周期', filters, QUANTILES)
+        result = result.join(quantiles.reindex(result.index))
+        result.index.name = '日期'
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="把爬取快照写入时间趋势库")
+    parser.add_argument('csv', help="快照 CSV 文件")
+    parser.add_argument('--date', help="快照日期（默认取文件修改日期），例如 2025-09-03")
+    parser.add_argument('--store', default=TREND_STORE_DIR, help="趋势库目录")
+    args = parser.parse_args()
+
+    snapshot_date = args.date or pd.Timestamp(os.path.getmtime(args.csv), unit='s').date()
+    df = prepare_snapshot(pd.read_csv(args.csv))
+    try:
+        today = TrendStore(args.store).ingest_snapshot(df, snapshot_date)
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"{snapshot_date}：写入 {len(df)} 条岗位，{len(today)} 个聚合单元，新增岗位 {int(today['新增岗位数'].sum())} 条")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,31 +3,40 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-import re
-from collections import Counter
+import os
 import warnings
+from salary_parser import SALARY_CACHE
+from role_family import ROLE_FAMILY_COLUMN
+from company_dim import count_companies, company_posting_counts
+from validation import QUARANTINE_PATH, validate_jobs, write_quarantine
+from trend_store import TrendStore
+from salary_sketch import SKETCH_QUANTILES
+from job_cube import frame_group_stats
+from skill_cooccurrence import related_items
+from filter_cache import FILTER_CACHE
+from dashboard_state import DashboardState
 warnings.filterwarnings('ignore')
 
+# 数据文件
+DATA_PATH = r'E:\计算机技术学习\2025年8月大二实训\招聘网站数据分析\数据集\data3.5.csv'
+# 查找相似岗位时，按关键词最多列出的候选岗位数
+SIMILAR_CANDIDATES = 20
+
 # 设置中文字体和图表清晰度
 plt.rcParams['figure.dpi'] = 200
 plt.rcParams['savefig.dpi'] = 200
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'Songti SC', 'Arial Unicode MS', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
-# 预编译正则表达式
-SALARY_REGEX_K = re.compile(r'(\d+\.?\d*)-?(\d+\.?\d*)K')
-SALARY_REGEX_DAY = re.compile(r'(\d+)-(\d+)元/天')
-SALARY_REGEX_HOUR = re.compile(r'(\d+)-(\d+)元/时')
-SALARY_REGEX_SINGLE_DAY = re.compile(r'(\d+)元/天')
-SALARY_REGEX_SINGLE_HOUR = re.compile(r'(\d+)元/时')
-SALARY_REGEX_PLAIN = re.compile(r'(\d+\.?\d*)-?(\d+\.?\d*)')
-
 
-@st.cache_data
-def load_data():
-    """加载并预处理数据"""
+def load_data(path=DATA_PATH):
+    """加载并预处理数据，返回 (df, 数据质量报告)"""
     try:
-        df = pd.read_csv(r'E:\计算机技术学习\2025年8月大二实训\招聘网站数据分析\数据集\data3.5.csv')
+        df = pd.read_csv(path)
+
+        # 数据质量校验：隔离重复表头、无法解析的薪资和格式错误的列表列
+        df, rejected, quality_report = validate_jobs(df)
+        write_quarantine(rejected)
 
         # 处理空值
         df['工作经验'] = df['工作经验'].fillna('经验不限')
@@ -35,128 +44,73 @@ def load_data():
         df['公司规模'] = df['公司规模'].fillna('未公布')
         df['福利列表'] = df['福利列表'].fillna('[]')
 
-        return df
+        return df, quality_report
     except FileNotFoundError:
         st.error("错误：未找到 data3.5.csv 文件，请确认文件是否存在")
-        return None
+        return None, None
     except Exception as e:
         st.error(f"读取数据时发生错误：{str(e)}")
+        return None, None
+
+
+@st.cache_resource
+def get_trend_store():
+    """时间趋势库（按天聚合，由 trend_store.py 在每次爬取后增量写入；文件修改后下一次读取即生效）"""
+    return TrendStore()
+
+
+def data_version(path=DATA_PATH):
+    """数据文件的修改时间（文件更新后派生数据随之重建）"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
         return None
 
 
-def process_salary(salary):
-    """处理薪资数据"""
-    if not isinstance(salary, str):
+@st.cache_resource(max_entries=2)
+def get_dashboard_state(path, version):
+    """
+    读取数据并一次性构建所有派生数据（按数据文件及其修改时间缓存，所有重跑和会话共享）。
+    页面重跑只读取其中的结构，耗时与筛选结果和单元格数有关，与数据总行数无关。
+    """
+    df, quality_report = load_data(path)
+    if df is None:
         return None
+    return DashboardState(df, quality_report)
 
-    salary = salary.strip()
 
-    if '元/天' in salary:
-        match = SALARY_REGEX_DAY.search(salary)
-        if match:
-            low, high = int(match.group(1)), int(match.group(2))
-            return (low + high) / 2 * 30
-        else:
-            match = SALARY_REGEX_SINGLE_DAY.search(salary)
-            if match:
-                return int(match.group(1)) * 30
-
-    elif '元/时' in salary:
-        match = SALARY_REGEX_HOUR.search(salary)
-        if match:
-            low, high = int(match.group(1)), int(match.group(2))
-            return (low + high) / 2 * 8 * 22
-        else:
-            match = SALARY_REGEX_SINGLE_HOUR.search(salary)
-            if match:
-                return int(match.group(1)) * 8 * 22
-
-    elif '万/年' in salary:
-        match = SALARY_REGEX_HOUR.search(salary)
-        if match:
-            low, high = int(match.group(1)), int(match.group(2))
-            return (low + high) / 2 * 8 * 22 * 12
-        else:
-            match = SALARY_REGEX_SINGLE_HOUR.search(salary)
-            if match:
-                return int(match.group(1)) * 8 * 22 * 12
+def dimension_stats(df_filtered, job_cube, cube_filters, dimension):
+    """某个维度的岗位数、薪资样本数、平均薪资和中位数：cube_filters 为 None 时按筛选结果逐行计算"""
+    if cube_filters is None:
+        return frame_group_stats(df_filtered, dimension)
+    return job_cube.group_stats(dimension, cube_filters)
 
-    else:
-        base_salary = salary.split('·')[0]
-        match = SALARY_REGEX_K.search(base_salary)
-        if match:
-            low = float(match.group(1))
-            high = float(match.group(2)) if match.group(2) else low
-            return (low + high) / 2 * 1000
-
-        match = SALARY_REGEX_PLAIN.search(base_salary)
-        if match:
-            low = float(match.group(1))
-            high = float(match.group(2)) if match.group(2) else low
-            return (low + high) / 2
-
-    return None
-
-
-def extract_skills_and_tags(df):
-    """提取技能和标签数据（参数改为筛选后的df）"""
-    all_skills = []
-    all_tags = []
-
-    for _, row in df.iterrows():
-        # 处理技能要求
-        skills_str = str(row['技能要求'])
-        if skills_str != '[]' and skills_str != 'nan':
-            skills = skills_str.replace('[', '').replace(']', '').replace("'", "").split(', ')
-            all_skills.extend([skill.strip() for skill in skills if skill.strip()])
-
-        # 处理工作标签
-        tags_str = str(row['工作标签'])
-        if tags_str != '[]' and tags_str != 'nan':
-            tags = tags_str.replace('[', '').replace(']', '').replace("'", "").split(', ')
-            all_tags.extend([tag.strip() for tag in tags if tag.strip()])
-
-    return all_skills, all_tags
-
-
-def categorize_industry(row):
-    """分类行业"""
-    position = str(row['职位']).lower()
-    skills = str(row['技能要求']).lower()
-    tags = str(row['工作标签']).lower()
-
-    if any(keyword in position + skills + tags for keyword in
-           ['ai', '机器学习', '深度学习', 'nlp', '计算机视觉', 'llm', 'aigc']):
-        return '人工智能'
-    elif any(keyword in position + skills + tags for keyword in
-             ['python', 'java', 'c++', '前端', '后端', '全栈', '开发', '软件']):
-        return '软件开发'
-    elif any(keyword in position + skills + tags for keyword in ['数据', '大数据', '数据分析', '数据挖掘']):
-        return '数据分析'
-    elif any(keyword in position + skills + tags for keyword in ['嵌入式', '硬件', '单片机', '物联网', '芯片', 'ic']):
-        return '硬件/嵌入式'
-    elif any(keyword in position + skills + tags for keyword in ['销售', '市场', '商务', 'bd']):
-        return '销售/市场'
-    elif any(keyword in position + skills + tags for keyword in ['教育', '培训', '教师']):
-        return '教育培训'
-    elif any(keyword in position + skills + tags for keyword in ['客服']):
-        return '客服'
-    elif any(keyword in position + skills + tags for keyword in ['运营']):
-        return '运营'
-    else:
-        return '其他'
 
+def filter_jobs(state, dimension_filters, skills, salary_bounds, search_query, search_fields, merge_duplicates):
+    """
+    按筛选条件过滤，返回命中行在 state.df 中的位置（有搜索关键词时按相关度排序）。
+    下拉筛选和技能筛选直接在位图上按位与/或：同一维度多选取并集，不同维度及多个技能取交集。
+    """
+    df, bitmap_index = state.df, state.bitmap_index
+    filters = dict(dimension_filters)
+    if merge_duplicates:
+        filters['保留岗位'] = True
+    positions = bitmap_index.positions(bitmap_index.select(filters, {'技能': skills}))
 
-def escape_special_chars(text):
-    """转义正则表达式特殊字符"""
-    special_chars = r'\.^$*+?{}[]|()'
-    escaped_text = ''
-    for char in text:
-        if char in special_chars:
-            escaped_text += '\\' + char
-        else:
-            escaped_text += char
-    return escaped_text
+    if salary_bounds is not None:
+        low, high = salary_bounds
+        upper = df['月薪上限'].to_numpy()[positions]
+        lower = df['月薪下限'].to_numpy()[positions]
+        positions = positions[(upper >= low) & (lower <= high)]
+
+    # 如果用户输入了搜索关键词，则进行搜索
+    if search_query:
+        # 用倒排索引搜索职位名称（多个关键词用空格分隔，须全部命中），结果按相关度排序
+        matched = state.search_index().search_index(search_query, search_fields)
+        matched_positions = df.index.get_indexer(matched)
+        positions = matched_positions[np.isin(matched_positions, positions)]
+
+    return positions
 
 
 def main():
@@ -173,89 +127,117 @@ def main():
     - 城市就业机会
     """)
 
-    # 加载数据
-    df = load_data()
-    if df is None:
+    # 加载数据及派生数据（只在数据文件变化时重建）
+    state = get_dashboard_state(DATA_PATH, data_version(DATA_PATH))
+    if state is None:
         return
-
-    # 处理薪资数据（仅初始化行业，技能提取移到筛选后）
-    with st.spinner('正在处理数据...'):
-        df['平均薪资'] = df['期待薪资'].apply(process_salary)
-        df['行业'] = df.apply(categorize_industry, axis=1)
-        # 【变更1】注释原始全量技能提取，改为筛选后提取
-        # all_skills, all_tags = extract_skills_and_tags(df)
+    df, quality_report = state.df, state.quality_report
+    company_dim, job_cubes, job_matrices = state.company_dim, state.job_cubes, state.job_matrices
+
+    # 数据质量报告
+    with st.sidebar.expander("🧪 数据质量报告", expanded=False):
+        rejected_count = int(quality_report.loc[quality_report['检查项'] == '隔离行数', '问题行数'].iloc[0])
+        if rejected_count:
+            st.warning(f"已隔离 {rejected_count} 行异常数据（见 {QUARANTINE_PATH}）")
+        st.dataframe(quality_report, use_container_width=True, hide_index=True)
+        st.caption(f"校验耗时 {quality_report.attrs.get('校验耗时(ms)', 0):.1f} 毫秒")
+        cache_stats = SALARY_CACHE.stats()
+        st.caption(f"薪资解析缓存：{cache_stats['条目数']} 条，命中率 {cache_stats['命中率']:.0%}")
+        filter_stats = FILTER_CACHE.stats()
+        st.caption(f"筛选结果缓存：{filter_stats['条目数']} 个组合，命中 {filter_stats['命中']} 次，"
+                   f"命中率 {filter_stats['命中率']:.0%}")
 
     # 侧边栏筛选器
     st.sidebar.header("🔍 筛选条件")
 
-    # 城市筛选
-    cities = ["全国"] + sorted(df['城市'].dropna().unique().tolist())
-    selected_city = st.sidebar.selectbox("选择城市", cities, index=0)
+    # 城市筛选（可多选，不选表示全国）
+    selected_cities = st.sidebar.multiselect("选择城市", state.filter_options['城市'], placeholder="全国")
 
     # 行业筛选
-    industries = ["全部"] + sorted(df['行业'].dropna().unique().tolist())
-    selected_industry = st.sidebar.selectbox("选择行业", industries, index=0)
+    selected_industries = st.sidebar.multiselect("选择行业", state.filter_options['行业'], placeholder="全部")
 
     # 学历筛选
-    educations = ["全部"] + sorted(df['学历'].dropna().unique().tolist())
-    selected_education = st.sidebar.selectbox("选择学历要求", educations, index=0)
+    selected_educations = st.sidebar.multiselect("选择学历要求", state.filter_options['学历'], placeholder="全部")
 
     # 工作经验筛选
-    experiences = ["全部"] + sorted(df['工作经验'].dropna().unique().tolist())
-    selected_experience = st.sidebar.selectbox("选择工作经验", experiences, index=0)
+    selected_experiences = st.sidebar.multiselect("选择工作经验", state.filter_options['工作经验'],
+                                                  placeholder="全部")
+
+    # 技能筛选（热门技能，选多个时须同时要求）
+    required_skills = st.sidebar.multiselect("包含技能", state.bitmap_index.values('技能'), placeholder="不限")
+
+    # 每个维度的已选取值（元组，不选为 None），同时用作缓存键、立方体和趋势的筛选条件
+    dimension_filters = {
+        '城市': tuple(selected_cities) or None,
+        '行业': tuple(selected_industries) or None,
+        '学历': tuple(selected_educations) or None,
+        '工作经验': tuple(selected_experiences) or None,
+    }
     # 用户自定义岗位搜索
     st.sidebar.markdown("---")
     st.sidebar.header("🔎 岗位搜索")
 
     # 搜索输入框
     search_query = st.sidebar.text_input("输入职位关键词", placeholder="例如：Python、Java、数据分析师...")
+    search_all_fields = st.sidebar.checkbox("同时搜索公司和技能", value=False)
 
-    # 根据筛选条件过滤数据
-    df_filtered = df.copy()
-
-    if selected_city != "全国":
-        df_filtered = df_filtered[df_filtered['城市'] == selected_city]
-
-    if selected_industry != "全部":
-        df_filtered = df_filtered[df_filtered['行业'] == selected_industry]
-
-    if selected_education != "全部":
-        df_filtered = df_filtered[df_filtered['学历'] == selected_education]
-
-    if selected_experience != "全部":
-        df_filtered = df_filtered[df_filtered['工作经验'] == selected_experience]
-
-    # 如果用户输入了搜索关键词，则进行搜索
-    if search_query:
-        # 使用关键词搜索职位名称
-        search_mask = df_filtered['职位'].str.contains(search_query, case=False, na=False)
-        df_filtered = df_filtered[search_mask]
-
-    # 【变更2】基于筛选后的df提取技能和标签（关键：确保技能与筛选结果联动）
-    all_skills, all_tags = extract_skills_and_tags(df_filtered)
+    # 月薪范围筛选（按折算月薪的区间重叠判断）
+    salary_cap = state.salary_cap
+    if salary_cap > 0:
+        salary_range = st.sidebar.slider("月薪范围（K）", 0, salary_cap, (0, salary_cap))
+    else:
+        salary_range = (0, 0)
+
+    # 同一公司重复发布的岗位只统计一次
+    merge_duplicates = st.sidebar.checkbox("合并近似重复岗位", value=True)
+
+    # 根据筛选条件过滤数据（结果按筛选组合缓存，所有会话共享）
+    salary_bounds = None if salary_range == (0, salary_cap) else (salary_range[0] * 1000, salary_range[1] * 1000)
+    search_fields = None if search_all_fields else ['职位']
+    filter_key = (state.fingerprint, tuple(dimension_filters.items()), tuple(required_skills),
+                  salary_bounds, search_query, search_all_fields, merge_duplicates)
+    filtered_positions = FILTER_CACHE.get_or_compute(filter_key, lambda: filter_jobs(
+        state, dimension_filters, required_skills, salary_bounds, search_query, search_fields, merge_duplicates))
+    df_filtered = df.take(filtered_positions)
+
+    # 只用下拉筛选时，概览、学历、行业、城市统计直接查聚合立方体；使用技能、搜索或月薪范围时按行计算
+    job_cube = job_cubes[merge_duplicates]
+    cube_filters = (dimension_filters if not required_skills and not search_query and salary_bounds is None
+                    else None)
+
+    # 基于筛选结果统计技能频次（确保技能与筛选结果联动）
+    filtered_rows = np.zeros(len(df), dtype=bool)
+    filtered_rows[filtered_positions] = True
+    skill_counts = job_matrices['技能'].item_counts(filtered_rows)
 
     # 数据概览
     st.header("📊 数据概览")
 
     col1, col2, col3, col4 = st.columns(4)
+    if cube_filters is not None:
+        overview = job_cube.totals(cube_filters)
+    else:
+        overview = {'岗位数': len(df_filtered), '薪资样本数': int(df_filtered['平均薪资'].count()),
+                    '平均薪资': df_filtered['平均薪资'].mean()}
     with col1:
-        st.metric("总职位数", len(df_filtered))
+        st.metric("总职位数", overview['岗位数'])
     with col2:
-        valid_salary_count = df_filtered['平均薪资'].notna().sum()
-        st.metric("有效薪资数据", valid_salary_count)
+        st.metric("有效薪资数据", overview['薪资样本数'])
     with col3:
-        avg_salary = df_filtered['平均薪资'].mean()
+        avg_salary = overview['平均薪资']
         st.metric("平均薪资", f"{avg_salary:.0f}元" if not np.isnan(avg_salary) else "N/A")
     with col4:
-        company_count = df_filtered['公司'].nunique()
+        company_count = count_companies(df_filtered['公司ID'], len(company_dim))
         st.metric("涉及公司", company_count)
 
     # 创建标签页
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 薪资分析", "💻 技能洞察", "🏢 行业趋势", "🏙️ 城市机会", "📋 数据浏览"])
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📈 薪资分析", "💻 技能洞察", "🏢 行业趋势", "🏙️ 城市机会", "📋 数据浏览",
+                                                  "📅 时间趋势"])
 
     # 在薪资分析部分（tab1）中添加新的分析内容
     with tab1:
         st.subheader("薪资分析")
+        education_group_stats = dimension_stats(df_filtered, job_cube, cube_filters, '学历')
 
         col1, col2 = st.columns(2)
 
@@ -275,7 +257,7 @@ def main():
         with col2:
             # 按学历的平均薪资
             if not df_filtered.empty:
-                salary_by_education = df_filtered.groupby('学历')['平均薪资'].mean().dropna()
+                salary_by_education = education_group_stats['平均薪资'].dropna()
                 if not salary_by_education.empty:
                     fig, ax = plt.subplots(figsize=(10, 6))
                     bars = ax.bar(salary_by_education.index, salary_by_education.values, color='lightcoral')
@@ -299,6 +281,21 @@ def main():
             else:
                 st.info("暂无数据")
 
+        # 薪资分位数：只用下拉筛选时由分组草图合并得到，使用搜索或月薪范围时精确计算
+        st.markdown("#### 薪资分位数")
+        if cube_filters is not None:
+            salary_percentiles = job_cube.quantiles(cube_filters)
+            percentile_source = "由城市×行业×学历×工作经验分位数草图合并得到（相对误差不超过1%）"
+        else:
+            salary_percentiles = df_filtered['平均薪资'].quantile(list(SKETCH_QUANTILES.values()))
+            salary_percentiles.index = list(SKETCH_QUANTILES)
+            percentile_source = "按当前筛选结果精确计算"
+        percentile_cols = st.columns(len(salary_percentiles))
+        for col, (name, value) in zip(percentile_cols, salary_percentiles.items()):
+            with col:
+                st.metric(f"薪资{name}", f"{value:.0f}元" if not np.isnan(value) else "N/A")
+        st.caption(percentile_source)
+
         # 新增：薪资与学历关系深入分析
         st.markdown("---")
         st.subheader("薪资与学历关系深入分析")
@@ -308,7 +305,7 @@ def main():
 
         with col3:
             # 学历分布饼图
-            education_counts = df_filtered['学历'].value_counts()
+            education_counts = education_group_stats['岗位数'].sort_values(ascending=False, kind='stable')
             if not education_counts.empty:
                 fig, ax = plt.subplots(figsize=(8, 8))
                 wedges, texts, autotexts = ax.pie(education_counts.values,
@@ -323,7 +320,7 @@ def main():
         with col4:
             # 学历与薪资的详细统计
             if not df_filtered.empty:
-                education_stats = df_filtered.groupby('学历')['平均薪资'].agg(['count', 'mean', 'median']).round(0)
+                education_stats = education_group_stats[['薪资样本数', '平均薪资', '薪资中位数']].round(0)
                 education_stats.columns = ['职位数量', '平均薪资', '薪资中位数']
                 education_stats = education_stats.dropna()
                 education_stats = education_stats.sort_values('平均薪资', ascending=False)  # 按平均薪资从高到低排序
@@ -348,9 +345,7 @@ def main():
 
         if not df_filtered.empty:
             # 准备数据
-            education_salary_data = df_filtered.groupby('学历').agg({
-                '平均薪资': ['count', 'mean', 'median']
-            }).round(0)
+            education_salary_data = education_group_stats[['薪资样本数', '平均薪资', '薪资中位数']].round(0)
 
             # 展平列名
             education_salary_data.columns = ['职位数量', '平均薪资', '薪资中位数']
@@ -417,14 +412,41 @@ def main():
         else:
             st.info("暂无数据进行学历薪资分析")
 
+        # 薪资结构：计薪单位、年薪月数和年化总薪酬
+        st.markdown("---")
+        st.subheader("💰 薪资结构与年化总薪酬")
+        df_structured = df_filtered.dropna(subset=['年化总薪酬'])
+        if not df_structured.empty:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("平均年化总薪酬", f"{df_structured['年化总薪酬'].mean() / 10000:.1f}万元")
+            with col2:
+                st.metric("年化总薪酬中位数", f"{df_structured['年化总薪酬'].median() / 10000:.1f}万元")
+            with col3:
+                extra_pay_ratio = (df_structured['年薪月数'] > 12).mean()
+                st.metric("多薪（13薪及以上）占比", f"{extra_pay_ratio:.1%}")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                unit_counts = df_structured['薪资单位'].value_counts()
+                unit_counts = unit_counts[unit_counts > 0]
+                st.markdown("**计薪单位分布**")
+                st.dataframe(unit_counts.rename('职位数量').to_frame(), use_container_width=True)
+            with col2:
+                months_counts = df_structured['年薪月数'].value_counts().sort_index()
+                months_counts.index = [f"{int(months)}薪" for months in months_counts.index]
+                st.markdown("**年薪月数分布**")
+                st.bar_chart(months_counts.rename('职位数量'))
+        else:
+            st.info("暂无可解析的结构化薪资数据")
+
     with tab2:
         st.subheader("技能需求洞察")
 
-        # 【变更3】基于筛选后的all_skills统计（与筛选结果联动）
-        if all_skills:
+        # 基于筛选后的技能频次统计（与筛选结果联动）
+        if not skill_counts.empty:
             # 热门技能统计（仅筛选后的数据）
-            skill_counts = Counter(all_skills)
-            top_skills = dict(skill_counts.most_common(15))
+            top_skills = skill_counts.head(15).to_dict()
 
             col1, col2 = st.columns(2)
 
@@ -453,29 +475,53 @@ def main():
                 }).reset_index(drop=True))
 
                 # 高价值技能分析（基于筛选后的df_filtered）
+                # 所有技能的需求量和平均薪资由稀疏矩阵一次算出，按技能精确匹配（C 不会匹配到 C++）
                 st.write("### 高价值技能分析")
-                high_value_skills = {}
-                for skill in list(top_skills.keys())[:10]:
-                    # 转义特殊字符以避免正则表达式错误
-                    escaped_skill = escape_special_chars(skill)
-                    try:
-                        # 【变更4】筛选条件改为df_filtered（确保与搜索结果一致）
-                        mask = df_filtered['技能要求'].str.contains(escaped_skill, na=False, regex=False)
-                        if mask.sum() > 0:
-                            avg_salary = df_filtered[mask]['平均薪资'].mean()
-                            if not np.isnan(avg_salary):
-                                high_value_skills[skill] = {
-                                    '需求量': mask.sum(),
-                                    '平均薪资': int(avg_salary)
-                                }
-                    except Exception as e:
-                        # 如果仍然出错，跳过该技能
-                        continue
-
-                if high_value_skills:
-                    st.dataframe(pd.DataFrame(high_value_skills).T)
+                skill_stats = job_matrices['技能'].item_salary_stats(df['平均薪资'], filtered_rows)
+                skill_stats = skill_stats.dropna(subset=['平均薪资'])
+                if not skill_stats.empty:
+                    top_n = st.number_input("显示需求量最高的前 N 个技能", min_value=1,
+                                            max_value=len(skill_stats), value=min(10, len(skill_stats)))
+                    high_value_skills = skill_stats.head(int(top_n))[['需求量', '平均薪资']].copy()
+                    high_value_skills['平均薪资'] = high_value_skills['平均薪资'].astype(int)
+                    st.dataframe(high_value_skills)
                 else:
                     st.info("暂无高价值技能数据")
+
+            # 职位名称中出现的技能（与技能要求使用同一套技能标准名）
+            title_skill_counts = job_matrices['职位技能'].item_counts(filtered_rows)
+            if not title_skill_counts.empty:
+                st.write("### 职位名称中的热门技能")
+                st.dataframe(title_skill_counts.head(15).rename('职位数').reset_index(), hide_index=True)
+
+            # 相关技能：当前筛选下与所选技能同时出现的技能（共现矩阵 Xᵀ·X 中该技能的一列）
+            st.write("### 🔗 相关技能")
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                target_skill = st.selectbox("选择技能", skill_counts.index.tolist(), index=0)
+                related_top_n = st.slider("显示相关技能数量", 5, 30, 10)
+                # 没有任何筛选时，可以改用趋势库中累计的全部历史快照的共现矩阵（已存盘，直接查一列）
+                no_filter = cube_filters is not None and all(value is None for value in dimension_filters.values())
+                related_scope = "当前数据"
+                if no_filter and get_trend_store().exists():
+                    related_scope = st.radio("统计范围", ["当前数据", "全部历史快照"], horizontal=True)
+            if related_scope == "全部历史快照":
+                history_cooccurrence = get_trend_store().load_cooccurrence()
+                related = history_cooccurrence.related(target_skill)
+                related_note = f"历史快照累计 {history_cooccurrence.total_jobs} 个不同岗位（每个岗位只在首次出现时计入）"
+            else:
+                related = related_items(job_matrices['技能'], target_skill, filtered_rows, df['平均薪资'])
+                related_note = f"共 {int(skill_counts[target_skill])} 个岗位要求 {target_skill}"
+            with col2:
+                if not related.empty:
+                    related_table = related.head(related_top_n)[['共现岗位数', '共现占比', '提升度', 'PMI', '平均薪资']]
+                    st.dataframe(related_table.style.format({
+                        '共现占比': '{:.0%}', '提升度': '{:.2f}', 'PMI': '{:.2f}', '平均薪资': '{:.0f}'
+                    }, na_rep='N/A'))
+                    st.caption(f"{related_note}；"
+                               f"提升度大于 1 表示两个技能同时出现的概率高于随机搭配，平均薪资为同时要求两个技能的岗位")
+                else:
+                    st.info(f"当前筛选下没有与 {target_skill} 同时出现的技能")
         else:
             st.info("暂无技能数据")
 
@@ -483,10 +529,8 @@ def main():
         st.subheader("行业发展趋势")
 
         # 行业职位数量和平均薪资
-        industry_stats = df_filtered.groupby('行业').agg({
-            '平均薪资': 'mean',
-            '职位': 'count'
-        }).rename(columns={'职位': '职位数量'})
+        industry_group_stats = dimension_stats(df_filtered, job_cube, cube_filters, '行业')
+        industry_stats = industry_group_stats[['平均薪资', '岗位数']].rename(columns={'岗位数': '职位数量'})
 
         industry_stats = industry_stats.dropna()
         industry_stats['平均薪资'] = industry_stats['平均薪资'].apply(lambda x: int(x) if not np.isnan(x) else 0)
@@ -534,7 +578,8 @@ def main():
         st.subheader("城市就业机会")
 
         # 各城市职位数量
-        city_counts = df_filtered['城市'].value_counts().head(10)
+        city_group_stats = dimension_stats(df_filtered, job_cube, cube_filters, '城市')
+        city_counts = city_group_stats['岗位数'].sort_values(ascending=False, kind='stable').head(10)
 
         if not city_counts.empty:
             col1, col2 = st.columns(2)
@@ -561,8 +606,7 @@ def main():
 
             with col2:
                 # 城市平均薪资对比
-                city_salary = df_filtered.groupby('城市')['平均薪资'].mean().dropna().sort_values(ascending=False).head(
-                    10)
+                city_salary = city_group_stats['平均薪资'].dropna().sort_values(ascending=False).head(10)
                 if not city_salary.empty:
                     fig, ax = plt.subplots(figsize=(10, 6))
                     bars = ax.bar(city_salary.index, city_salary.values, color='gold')
@@ -583,6 +627,13 @@ def main():
                     st.pyplot(fig)
                 else:
                     st.info("暂无城市薪资数据")
+
+            # 招聘最多的公司（基于公司维度表，按整数公司ID计数）
+            st.write("### 招聘岗位最多的公司TOP10")
+            top_companies = company_posting_counts(df_filtered['公司ID'], company_dim, top_n=10)
+            top_companies['公司平均薪资'] = top_companies['公司平均薪资'].apply(
+                lambda x: f"{x:.0f}元" if pd.notna(x) else "N/A")
+            st.dataframe(top_companies.reset_index(drop=True), use_container_width=True)
         else:
             st.info("暂无城市数据")
 
@@ -590,7 +641,7 @@ def main():
         st.subheader("原始数据浏览")
 
         # 显示筛选后的数据表格
-        display_columns = ['职位', '期待薪资', '工作经验', '学历', '城市', '公司', '技能要求']
+        display_columns = ['职位', ROLE_FAMILY_COLUMN, '期待薪资', '工作经验', '学历', '城市', '公司', '技能要求']
         df_display = df_filtered[display_columns].copy()
 
         # 格式化显示
@@ -601,19 +652,104 @@ def main():
 
         st.dataframe(df_display, use_container_width=True)
 
-        # 数据导出功能
-        csv = df_filtered.to_csv(index=False)
+        # 数据导出功能（点击下载时才生成 CSV）
         st.download_button(
             label="📥 下载筛选后的数据",
-            data=csv,
+            data=lambda: df_filtered.to_csv(index=False),
             file_name="filtered_job_data.csv",
             mime="text/csv"
         )
 
+        # 相似岗位：按某条岗位或一组技能，在全部岗位中找最相似的岗位
+        st.markdown("---")
+        st.write("### 🔍 查找相似岗位")
+        similar_mode = st.radio("查找方式", ["按岗位", "按技能组合"], horizontal=True)
+        similar_top_k = st.number_input("返回岗位数", min_value=1, max_value=50, value=10)
+        similar_index = state.similar_index()
+        similar = None
+        if similar_mode == "按岗位":
+            # 不把全部筛选结果放进下拉框：按行号直接定位，或按关键词搜索后只列出最相关的几条
+            posting_query = st.text_input("输入岗位行号，或职位/公司/技能关键词（在当前筛选结果中查找）",
+                                          placeholder="例如：1024 或 Java 后端")
+            query = posting_query.strip()
+            if query:
+                if query.isdigit():
+                    candidates = [int(query)] if int(query) in df_filtered.index else []
+                else:
+                    rows, _ = state.search_index().search(query)
+                    candidates = df.index[rows[filtered_rows[rows]][:SIMILAR_CANDIDATES]].tolist()
+                if candidates:
+                    posting = st.selectbox(
+                        "选择岗位", candidates,
+                        format_func=lambda i: f"{i} | {df.at[i, '职位']} | {df.at[i, '公司']} | {df.at[i, '期待薪资']}")
+                    similar = similar_index.similar_to_posting(posting, int(similar_top_k))
+                else:
+                    st.info("当前筛选结果中没有匹配的岗位")
+        else:
+            selected_skills = st.multiselect("输入或选择技能", job_matrices['技能'].items.tolist())
+            if selected_skills:
+                similar = similar_index.similar_to_skills(selected_skills, int(similar_top_k))
+
+        if similar is not None:
+            if not similar.empty:
+                similar_jobs = df.loc[similar.index, ['职位', '公司', '城市', '期待薪资', '平均薪资', '技能要求']].copy()
+                similar_jobs['平均薪资'] = similar_jobs['平均薪资'].apply(lambda x: f"{x:.0f}元" if pd.notna(x) else "N/A")
+                similar_jobs['相似度'] = similar.map(lambda x: f"{x:.0%}")
+                st.dataframe(similar_jobs, use_container_width=True)
+                st.caption("相似度为职位名称、技能和工作标签的 Jaccard 相似度估计值（按技能组合查找时只比较技能）")
+            else:
+                st.info("没有找到相似岗位")
+
+    with tab6:
+        st.subheader("时间趋势")
+
+        trend_store = get_trend_store()
+        if not trend_store.exists():
+            st.info("暂无历史快照，请先运行：python trend_store.py <快照CSV文件> --date <快照日期>")
+        else:
+            freq_options = {"按天": "D", "按周": "W", "按月": "M"}
+            freq_label = st.radio("时间粒度", list(freq_options.keys()), horizontal=True)
+            trend = trend_store.trend(dimension_filters, freq=freq_options[freq_label])
+
+            if trend.empty:
+                st.info("当前筛选条件下暂无趋势数据")
+            else:
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    # 岗位数量趋势
+                    fig, ax = plt.subplots(figsize=(10, 6))
+                    # 在招岗位数是存量：按周/月时为周期内各快照日的平均值；新增岗位数是流量，按周期累加
+                    ax.plot(trend.index, trend['岗位数'], marker='o', label='在招岗位数')
+                    ax.plot(trend.index, trend['新增岗位数'], marker='o', label='新增岗位数')
+                    ax.set_xlabel('日期')
+                    ax.set_ylabel('职位数量')
+                    ax.set_title('岗位数量趋势')
+                    ax.legend()
+                    plt.xticks(rotation=45)
+                    st.pyplot(fig)
+
+                with col2:
+                    # 薪资分位数趋势
+                    fig, ax = plt.subplots(figsize=(10, 6))
+                    ax.fill_between(trend.index, trend['P25'], trend['P75'], alpha=0.3, color='skyblue', label='P25-P75')
+                    ax.plot(trend.index, trend['中位数'], marker='o', color='steelblue', label='薪资中位数')
+                    ax.plot(trend.index, trend['平均薪资'], marker='o', color='orange', label='平均薪资')
+                    ax.set_xlabel('日期')
+                    ax.set_ylabel('薪资（元）')
+                    ax.set_title('薪资趋势')
+                    ax.legend()
+                    plt.xticks(rotation=45)
+                    st.pyplot(fig)
+
+                st.dataframe(trend.round(0), use_container_width=True)
+
     # 页面底部信息
+    latest_date = get_trend_store().latest_date()
+    update_date = f"{latest_date.year}.{latest_date.month}.{latest_date.day}" if latest_date is not None else "2025.9.3"
     st.markdown("---")
-    st.markdown("""
-    *数据更新时间：2025.9.3*
+    st.markdown(f"""
+    *数据更新时间：{update_date}*
     """)
 
 
@@ -0,0 +1,179 @@
+# validation.py
+"""加载时的数据质量校验：向量化检查列、取值、薪资格式和列表列格式，输出质量报告和隔离行"""
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from company_dim import COMPANY_SIZE_ORDER
+from data_paths import data_path
+from salary_parser import parse_salary_series
+
+# 爬虫写出的列（见 BOSScrawler）
+EXPECTED_COLUMNS = ['职位', '期待薪资', '工作标签', '技能要求', '工作经验', '学历', '城市', '公司', '公司规模', '福利列表']
+# 不能为空的列
+REQUIRED_COLUMNS = ['职位', '城市', '公司']
+# 列表列（形如 "['Java', 'MySQL']"）
+LIST_COLUMNS = ['工作标签', '技能要求', '福利列表']
+
+# 允许的分类取值（其余取值只告警，不隔离）
+ALLOWED_VALUES = {
+    '学历': ['初中及以下', '中专/中技', '高中', '大专', '本科', '硕士', '博士', '学历不限'],
+    '工作经验': ['在校/应届', '1年以内', '1-3年', '3-5年', '5-10年', '10年以上', '经验不限'],
+    '公司规模': COMPANY_SIZE_ORDER,
+}
+
+# 被当作缺失值的字符串
+NULL_STRINGS = ['', 'nan', 'NaN', 'None', 'null', 'NULL']
+
+# 爬虫写出的薪资格式（格式正确不代表能折算成月薪，解析率以 parse_salary_series 的结果为准）
+SALARY_FORMAT_REGEX = re.compile(r'\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?(?:K(?:·\d+薪)?|元/(?:天|时|周|月)|万/年)')
+# process_salary 没有周薪分支，「元/周」会被当作月薪
+WEEKLY_SALARY_REGEX = re.compile(r'.*元/周')
+LIST_FORMAT_REGEX = re.compile(r"\[(?:'[^']*'(?:, '[^']*')*)?\]")
+# 折算月薪（元/月）的合理范围，超出的只告警
+SALARY_RANGE = (500, 500_000)
+
+# 隔离文件默认路径（运行时数据目录下）
+QUARANTINE_PATH = data_path('quarantine_rows.csv')
+
+
+class _FactorizedColumn:
+    """列的去重编码：检查只在去重后的取值上做一次，再按编码映射回所有行（这些列的基数都很低）"""
+
+    def __init__(self, series):
+        self.index = series.index
+        self.codes, uniques = pd.factorize(series)
+        self.uniques = pd.Series(np.asarray(uniques, dtype=object))
+
+    def mask(self, flags, missing):
+        """把去重取值上的布尔结果映射回每一行，缺失值（编码 -1）取 missing"""
+        flags = np.append(np.asarray(flags, dtype=bool), missing)
+        return pd.Series(flags[self.codes], index=self.index)
+
+    def null_mask(self):
+        """真正的缺失值或 'nan' 之类的字符串"""
+        return self.mask(self.uniques.isin(NULL_STRINGS), True)
+
+    def fullmatch_mask(self, regex):
+        """取值完整匹配正则"""
+        return self.mask(self.uniques.str.strip().str.fullmatch(regex).fillna(False), False)
+
+    def isin_mask(self, values):
+        """取值在给定集合中"""
+        return self.mask(self.uniques.isin(values), False)
+
+    def non_text_mask(self):
+        """不是字符串的取值（例如整列被读成数字），缺失值除外"""
+        return self.mask(~self.uniques.map(lambda value: isinstance(value, str)).astype(bool), False)
+
+
+def validate_jobs(df, salary_col='期待薪资'):
+    """
+    校验招聘数据。
+    返回 (clean_df, rejected_df, report)：
+    - clean_df：通过校验的行
+    - rejected_df：被隔离的行，附加「问题」列说明原因
+    - report：质量报告（DataFrame，每项检查一行；校验耗时记在 report.attrs['校验耗时(ms)']）
+    """
+    start = time.perf_counter()
+    n_rows = len(df)
+    checks = []
+    reject_reasons = {}
+
+    def add_check(name, mask, severity):
+        count = int(mask.sum())
+        checks.append({'检查项': name, '问题行数': count, '占比': count / n_rows if n_rows else 0.0, '处理': severity})
+        if severity == '隔离' and count:
+            reject_reasons[name] = mask
+
+    missing_columns = [col for col in EXPECTED_COLUMNS if col not in df.columns]
+    checks.append({'检查项': '缺少的列', '问题行数': len(missing_columns), '占比': np.nan,
+                   '处理': '、'.join(missing_columns) if missing_columns else '无'})
+
+    present = [col for col in EXPECTED_COLUMNS if col in df.columns]
+    columns = {col: _FactorizedColumn(df[col]) for col in present}
+
+    # 数据中间重复出现的表头行（例如多次追加写入 CSV）
+    if present:
+        header_mask = np.logical_and.reduce([columns[col].isin_mask([col]).to_numpy() for col in present])
+        add_check('重复表头行', pd.Series(header_mask, index=df.index), '隔离')
+    else:
+        header_mask = np.zeros(n_rows, dtype=bool)
+
+    not_header = pd.Series(~header_mask, index=df.index)
+
+    # 爬虫写出的列都应该是文本
+    non_text = pd.Series(False, index=df.index)
+    for column in columns.values():
+        non_text |= column.non_text_mask()
+    add_check('非文本取值', non_text & not_header, '告警')
+
+    for col in REQUIRED_COLUMNS:
+        if col in columns:
+            add_check(f'{col}为空', columns[col].null_mask() & not_header, '隔离')
+
+    if salary_col in columns:
+        salary_null = columns[salary_col].null_mask()
+        salary_ok = columns[salary_col].fullmatch_mask(SALARY_FORMAT_REGEX)
+        add_check('薪资格式无法解析', ~salary_ok & ~salary_null & not_header, '隔离')
+        add_check('薪资为空', salary_null & not_header, '告警')
+
+        # 实际折算出的月薪（每个不同的薪资字符串只解析一次）
+        monthly = parse_salary_series(columns[salary_col].uniques).to_numpy(dtype=float)
+        parsed = columns[salary_col].mask(~np.isnan(monthly), False)
+        add_check('薪资格式正确但无法折算（如万/年）', salary_ok & ~parsed & not_header, '告警')
+        add_check('周薪按月薪计算', columns[salary_col].fullmatch_mask(WEEKLY_SALARY_REGEX) & not_header, '告警')
+        low, high = SALARY_RANGE
+        out_of_range = parsed & ~columns[salary_col].mask((monthly >= low) & (monthly <= high), False)
+        add_check('折算月薪超出合理范围', out_of_range & not_header, '告警')
+        # 解析率：能折算出月薪的行占非表头行的比例
+        parse_rate = float((parsed & not_header).sum() / not_header.sum()) if not_header.any() else 0.0
+    else:
+        parse_rate = 0.0
+
+    for col in LIST_COLUMNS:
+        if col in columns:
+            well_formed = columns[col].fullmatch_mask(LIST_FORMAT_REGEX) | columns[col].null_mask()
+            add_check(f'{col}格式错误', ~well_formed & not_header, '隔离')
+
+    for col, allowed in ALLOWED_VALUES.items():
+        if col in columns:
+            unknown = ~columns[col].isin_mask(allowed) & ~columns[col].null_mask() & not_header
+            add_check(f'{col}取值未知', unknown, '告警')
+
+    reject_mask = pd.Series(False, index=df.index)
+    reasons = pd.Series('', index=df.index, dtype=object)
+    for name, mask in reject_reasons.items():
+        reject_mask |= mask
+        reasons = reasons.where(~mask, reasons + name + ';')
+
+    rejected = df[reject_mask].copy()
+    rejected['问题'] = reasons[reject_mask].str.rstrip(';')
+    clean = df[~reject_mask].copy()
+
+    # 把 'nan' 之类的字符串统一成真正的缺失值，后续 fillna 才能生效
+    for col, column in columns.items():
+        null_strings = column.uniques.isin(NULL_STRINGS)
+        if null_strings.any():
+            clean[col] = clean[col].mask(column.mask(null_strings, False)[~reject_mask])
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    checks.append({'检查项': '薪资解析率', '问题行数': np.nan, '占比': parse_rate, '处理': '统计'})
+    checks.append({'检查项': '隔离行数', '问题行数': len(rejected), '占比': len(rejected) / n_rows if n_rows else 0.0,
+                   '处理': '统计'})
+    report = pd.DataFrame(checks)
+    report.attrs['校验耗时(ms)'] = elapsed_ms
+
+    return clean, rejected, report
+
+
+def write_quarantine(rejected, path=QUARANTINE_PATH):
+    """把被隔离的行写入 CSV，便于人工检查"""
+    if rejected.empty:
+        return None
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    rejected.to_csv(path, index=True, index_label='原始行号', encoding='utf-8-sig')
+    return path
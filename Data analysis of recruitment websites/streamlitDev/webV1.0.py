@@ -3,11 +3,27 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
 import numpy as np
-import re
 import seaborn as sns
-import jieba
 from wordcloud import WordCloud
 import os
+import io
+import threading
+from dedup import assign_duplicate_clusters, dedupe_postings
+from validation import validate_jobs, write_quarantine
+from salary_parser import parse_salary_series
+from job_items import build_incidence_matrices
+from role_family import ROLE_FAMILY_COLUMN, ROLE_NORMALIZER
+from streaming_agg import PartialAggregate
+from tokenizer import JIEBA_TOKENIZER
+from wordcloud_cache import WORDCLOUD_CACHE, cache_key, find_font_path
+
+# 数据文件
+DATA_PATH = 'data3.2.csv'
+# 福利列表中表示“未填写”的占位值（load_data 把空列表替换成了「未公布」）
+WELFARE_PLACEHOLDERS = ['未公布']
+# 词云图尺寸（像素）和缓存图片的分辨率（与 st.pyplot 默认一致）
+WORDCLOUD_SIZE = (800, 400)
+FIGURE_DPI = 200
 
 # 设置图片清晰度和中文字体（解决中文乱码问题）
 plt.rcParams['figure.dpi'] = 300
@@ -29,20 +45,17 @@ plt.rcParams['svg.fonttype'] = 'none'
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'Songti SC', 'Arial Unicode MS', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False  # 解决负号 '-' 显示为方块的问题
 
-# 预编译正则表达式以提升性能
-SALARY_REGEX_K = re.compile(r'(\d+\.?\d*)-?(\d+\.?\d*)K')
-SALARY_REGEX_DAY = re.compile(r'(\d+)-(\d+)元/天')
-SALARY_REGEX_HOUR = re.compile(r'(\d+)-(\d+)元/时')
-SALARY_REGEX_SINGLE_DAY = re.compile(r'(\d+)元/天')
-SALARY_REGEX_SINGLE_HOUR = re.compile(r'(\d+)元/时')
-SALARY_REGEX_PLAIN = re.compile(r'(\d+\.?\d*)-?(\d+\.?\d*)')
 
-
-@st.cache_data
-def load_data():
+def load_data(path=DATA_PATH):
     """加载并预处理数据"""
     try:
-        df = pd.read_csv('data3.2.csv')
+        df = pd.read_csv(path)
+
+        # 数据质量校验：隔离重复表头、无法解析的薪资和格式错误的列表列
+        df, rejected, _ = validate_jobs(df)
+        quarantine_path = write_quarantine(rejected)
+        if quarantine_path:
+            st.warning(f"已隔离 {len(rejected)} 行异常数据（见 {quarantine_path}）")
 
         # 处理空值和空列表
         df['工作经验'] = df['工作经验'].fillna('经验不限')
@@ -61,88 +74,81 @@ def load_data():
         st.error(f"读取数据时发生错误：{str(e)}")
         return None
 
-def process_salary(salary):
-    """
-    处理薪资数据，将不同格式的薪资转换为数值类型（单位：元/月）
-    """
-    if not isinstance(salary, str):
+
+def data_version(path=DATA_PATH):
+    """数据文件的修改时间（文件更新后派生数据随之重建）"""
+    try:
+        return os.path.getmtime(path)
+    except OSError:
         return None
 
-    # 移除空格并统一处理
-    salary = salary.strip()
 
-    # 处理日薪格式 (如: 100-5000元/天)
-    if '元/天' in salary:
-        match = SALARY_REGEX_DAY.search(salary)
-        if match:
-            low, high = int(match.group(1)), int(match.group(2))
-            return (low + high) / 2 * 30  # 转换为月薪（按30天计算）
-        else:
-            match = SALARY_REGEX_SINGLE_DAY.search(salary)
-            if match:
-                return int(match.group(1)) * 30
-
-    # 处理时薪格式 (如: 20-25元/时)
-    elif '元/时' in salary:
-        match = SALARY_REGEX_HOUR.search(salary)
-        if match:
-            low, high = int(match.group(1)), int(match.group(2))
-            return (low + high) / 2 * 8 * 22  # 转换为月薪（按每天8小时，每月22个工作日）
-        else:
-            match = SALARY_REGEX_SINGLE_HOUR.search(salary)
-            if match:
-                return int(match.group(1)) * 8 * 22
-
-    # 处理月薪格式 (如: 15-25K, 7-10K·13薪)
-    else:
-        # 提取基本薪资部分（去除·13薪等附加信息）
-        base_salary = salary.split('·')[0]
-
-        # 匹配K格式的薪资 (如: 15-25K)
-        match = SALARY_REGEX_K.search(base_salary)
-        if match:
-            low = float(match.group(1))
-            high = float(match.group(2)) if match.group(2) else low
-            return (low + high) / 2 * 1000  # K转换为具体数值
-
-        # 匹配纯数字格式
-        match = SALARY_REGEX_PLAIN.search(base_salary)
-        if match:
-            low = float(match.group(1))
-            high = float(match.group(2)) if match.group(2) else low
-            return (low + high) / 2
-
-    return None
-
-
-def get_salary_by_education_data(df, city_name="全国"):
-    """获取不同学历的平均薪资数据用于表格展示"""
+class CityAggregates:
+    """按城市分块的流式部分聚合：某个城市第一次被选中时才聚合该城市的行，之后所有重跑和会话共享"""
+
+    def __init__(self, df):
+        self.df = df
+        self.city_rows = df.groupby('城市', sort=False).indices
+        self.aggregates = {}
+        self._lock = threading.Lock()
+
+    def get(self, city):
+        """城市的部分聚合（「全国」为全部行，没有数据的城市为空聚合）"""
+        with self._lock:
+            if city not in self.aggregates:
+                if city == "全国":
+                    rows = self.df
+                else:
+                    rows = self.df.take(self.city_rows.get(city, []))
+                # 热门职位直接对内存中的数据精确计数，这里不需要高频取值统计
+                self.aggregates[city] = PartialAggregate(top_columns=()).update(rows)
+            return self.aggregates[city]
+
+
+@st.cache_resource(max_entries=2)
+def get_prepared_data(path, version):
+    """
+    读取数据并计算派生列（平均薪资、重复簇、职位族）、合并重复后的数据、稀疏矩阵和各城市的部分聚合，
+    按数据文件及其修改时间缓存，所有重跑和会话共享（调用方只读，不修改）。
+    返回 (df, 合并重复后的 df, job_matrices, {是否合并重复: CityAggregates})，读取失败时返回 None。
+    """
+    df = load_data(path)
+    if df is None:
+        return None
+    df['平均薪资'] = parse_salary_series(df['期待薪资'])
+    df['重复簇'] = assign_duplicate_clusters(df)
+    # 职位名称归一成职位族（每个不同的职位名只计算一次）
+    df[ROLE_FAMILY_COLUMN] = ROLE_NORMALIZER.families(df['职位'])
+    # 技能、标签、福利的岗位×条目稀疏矩阵，切换城市后不再重新拆分文本
+    job_matrices = build_incidence_matrices(df)
+    df_deduped = dedupe_postings(df)
+    # 学历薪资表读取按城市缓存的部分聚合
+    aggregates = {False: CityAggregates(df), True: CityAggregates(df_deduped)}
+    return df, df_deduped, job_matrices, aggregates
+
+
+def get_salary_by_education_data(aggregate, city_name="全国"):
+    """由城市的部分聚合获取不同学历的平均薪资数据用于表格展示"""
     try:
-        # 检查必要列是否存在
-        required_columns = ['平均薪资', '学历']
-        if not all(col in df.columns for col in required_columns):
-            st.warning("警告：数据缺少必要的列（'平均薪资' 或 '学历'）")
+        # 检查必要的分组统计是否存在
+        if '学历' not in aggregate.group_stats:
+            st.warning("警告：数据缺少必要的列（'学历'）")
             return None
 
-        # 如果指定了城市且不是"全国"，则进行筛选
-        if city_name != "全国":
-            if '城市' not in df.columns:
-                st.warning("警告：数据缺少城市列，无法按城市筛选")
-                return None
-            df = df[df['城市'] == city_name]
+        # 只保留有有效薪资数据的学历
+        summary = aggregate.group_summary('学历')
+        summary = summary[summary['薪资样本数'] > 0]
 
-        # 过滤掉无效薪资数据
-        df_valid = df.dropna(subset=['平均薪资'])
-
-        if df_valid.empty:
+        if summary.empty:
             st.warning("警告：没有有效的薪资数据用于展示")
             return None
 
-        # 按学历分组计算平均薪资，并获取对应的公司和职位示例
-        salary_by_education = df_valid.groupby('学历')['平均薪资'].agg(['mean', 'count']).reset_index()
-
-        # 正确重命名列
-        salary_by_education.columns = ['学历', '平均薪资(元)', '岗位数量']
+        # 各学历的平均薪资和有效薪资的岗位数量
+        salary_by_education = pd.DataFrame({
+            '学历': summary.index,
+            '平均薪资(元)': summary['平均薪资'].to_numpy(),
+            '岗位数量': summary['薪资样本数'].to_numpy(),
+        })
 
         # 按平均薪资降序排序
         salary_by_education = salary_by_education.sort_values('平均薪资(元)', ascending=False)
@@ -259,8 +265,10 @@ def plot_salary_by_city(df, selected_city):
 
 
 def plot_top_jobs(df, top_n=10, city_name="全国"):
-    """绘制热门职位分布图"""
-    top_jobs = df['职位'].value_counts().head(top_n)
+    """绘制热门职位分布图（按职位族计数，Java开发工程师、java工程师 计为同一职位）"""
+    # 数据已在内存中，直接精确计数（流式聚合的高频取值在取值很多时只是下界）
+    job_column = ROLE_FAMILY_COLUMN if ROLE_FAMILY_COLUMN in df.columns else '职位'
+    top_jobs = df[job_column].value_counts().head(top_n)
 
     fig, ax = plt.subplots(figsize=(10, 6))
     colors = cm.get_cmap('tab20')(np.linspace(0, 1, len(top_jobs)))
@@ -332,21 +340,10 @@ def plot_salary_distribution(df, city_name="全国"):
     return fig
 
 
-def plot_skill_distribution(df, city_name="全国"):
-    """绘制技能要求分布图"""
-    # 合并所有技能要求
-    all_skills = ' '.join(df['技能要求'].astype(str))
-
-    # 简单处理技能数据
-    skills_list = []
-    for skill_str in df['技能要求'].dropna():
-        if skill_str != '[]':
-            # 移除方括号并分割
-            skills = skill_str.replace('[', '').replace(']', '').replace("'", "").split(', ')
-            skills_list.extend([skill.strip() for skill in skills if skill.strip()])
-
+def plot_skill_distribution(df, skill_matrix, city_name="全国"):
+    """绘制技能要求分布图（skill_matrix 为预先构建的岗位×技能稀疏矩阵）"""
     # 统计技能频次
-    skill_counts = pd.Series(skills_list).value_counts().head(15)
+    skill_counts = skill_matrix.item_counts(skill_matrix.mask_for(df.index)).head(15)
 
     fig, ax = plt.subplots(figsize=(12, 8))
     bars = ax.barh(skill_counts.index, skill_counts.values, color='skyblue')
@@ -366,21 +363,10 @@ def plot_skill_distribution(df, city_name="全国"):
     return fig
 
 
-def plot_work_tags_distribution(df, city_name="全国"):
-    """绘制工作标签分布图"""
-    # 合并所有工作标签
-    all_tags = ' '.join(df['工作标签'].astype(str))
-
-    # 简单处理标签数据
-    tags_list = []
-    for tag_str in df['工作标签'].dropna():
-        if tag_str != '[]':
-            # 移除方括号并分割
-            tags = tag_str.replace('[', '').replace(']', '').replace("'", "").split(', ')
-            tags_list.extend([tag.strip() for tag in tags if tag.strip()])
-
+def plot_work_tags_distribution(df, tag_matrix, city_name="全国"):
+    """绘制工作标签分布图（tag_matrix 为预先构建的岗位×标签稀疏矩阵）"""
     # 统计标签频次
-    tag_counts = pd.Series(tags_list).value_counts().head(15)
+    tag_counts = tag_matrix.item_counts(tag_matrix.mask_for(df.index)).head(15)
 
     fig, ax = plt.subplots(figsize=(12, 8))
     bars = ax.barh(tag_counts.index, tag_counts.values, color='lightcoral')
@@ -400,41 +386,61 @@ def plot_work_tags_distribution(df, city_name="全国"):
     return fig
 
 
-def generate_wordcloud_and_frequency(df, city_name="全国"):
-    """生成福利待遇词云图和词频统计图"""
+def welfare_term_counts(df, welfare_matrix):
+    """
+    福利词频：列表形式的福利（"['五险一金', '带薪年假']"）直接按条目计数，
+    只有非列表形式的自由文本才用 jieba 分词；「未公布」等占位值不计入。
+    """
+    welfare = df['福利列表'].astype(str)
+    structured = welfare.str.startswith('[')
+    term_counts = welfare_matrix.item_counts(welfare_matrix.mask_for(df.index[structured.to_numpy()]))
+
+    free_text = welfare[~structured & ~welfare.isin(WELFARE_PLACEHOLDERS)]
+    if not free_text.empty:
+        # 过滤掉单字符和空字符串；页面请求内不启动子进程
+        words = JIEBA_TOKENIZER.word_counts(free_text)
+        if not words.empty:
+            term_counts = term_counts.add(words, fill_value=0)
+            term_counts = term_counts.astype(int).sort_values(ascending=False, kind='stable')
+    return term_counts
+
+
+def figure_to_png(fig):
+    """把 matplotlib 图渲染成 PNG 字节并释放图"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=FIGURE_DPI, bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def generate_wordcloud_and_frequency(df, welfare_matrix, city_name="全国"):
+    """
+    生成福利待遇词云图和词频统计图，返回两张 PNG（welfare_matrix 为预先构建的岗位×福利稀疏矩阵）。
+    渲染结果按 (城市, 词频哈希, 尺寸) 缓存在磁盘上，筛选条件不变时直接读取。
+    """
     df_valid = df.dropna(subset=['福利列表'])
 
     if df_valid.empty:
         st.warning("警告：没有有效的福利数据用于展示")
         return None, None
 
-    # 合并所有福利信息
-    all_benefits = ' '.join(df_valid['福利列表'].astype(str))
-
-    # 简单的中文分词
-    words = jieba.cut(all_benefits)
-    # 过滤掉单字符和空字符串
-    words = [word.strip() for word in words if len(word.strip()) > 1]
-    text = ' '.join(words)
-
     # 统计词频
-    word_freq = {}
-    for word in words:
-        if word in word_freq:
-            word_freq[word] += 1
-        else:
-            word_freq[word] = 1
+    word_freq = welfare_term_counts(df_valid, welfare_matrix)
+    if word_freq.empty:
+        st.warning("警告：没有有效的福利数据用于展示")
+        return None, None
+
+    key = cache_key(city_name, word_freq, WORDCLOUD_SIZE)
+    cached = WORDCLOUD_CACHE.get(key)
+    if cached is not None:
+        _, images = cached
+        return images.get('词云'), images.get('词频')
 
     # 获取前20个高频词
-    top_words = dict(sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:20])
+    top_words = word_freq.head(20).to_dict()
 
-    # 动态检测字体路径
-    font_paths = ['simhei.ttf', '/System/Library/Fonts/PingFang.ttc', 'C:/Windows/Fonts/simhei.ttf']
-    font_path = None
-    for path in font_paths:
-        if os.path.exists(path):
-            font_path = path
-            break
+    # 动态检测字体路径（每个进程只探测一次）
+    font_path = find_font_path()
 
     if not font_path:
         st.warning("警告：未找到可用的中文字体文件")
@@ -442,13 +448,14 @@ def generate_wordcloud_and_frequency(df, city_name="全国"):
 
     # 生成词云
     try:
+        width, height = WORDCLOUD_SIZE
         wordcloud = WordCloud(
             font_path=font_path,
-            width=800,
-            height=400,
+            width=width,
+            height=height,
             background_color='white',
             colormap='viridis'
-        ).generate(text)
+        ).generate_from_frequencies(word_freq.to_dict())
 
         # 创建词云图
         fig1, ax1 = plt.subplots(figsize=(10, 5))
@@ -479,7 +486,11 @@ def generate_wordcloud_and_frequency(df, city_name="全国"):
         else:
             fig2 = None
 
-        return fig1, fig2
+        images = {'词云': figure_to_png(fig1)}
+        if fig2 is not None:
+            images['词频'] = figure_to_png(fig2)
+        WORDCLOUD_CACHE.put(key, word_freq, images)
+        return images.get('词云'), images.get('词频')
     except Exception as e:
         st.warning(f"警告：生成词云图时发生错误: {e}")
         return None, None
@@ -487,6 +498,8 @@ def generate_wordcloud_and_frequency(df, city_name="全国"):
 
 def main():
     st.set_page_config(page_title="招聘数据可视化", layout="wide")
+    # 后台预热分词词典（每个进程只加载一次），用到福利自由文本分词时通常已经加载完成
+    JIEBA_TOKENIZER.warm_up()
     # 设置整个页面背景为渐变蓝色
     st.markdown(
         """
@@ -557,14 +570,12 @@ def main():
         st.title('📊 招聘数据可视化分析')
         st.markdown("---")
 
-        # 加载数据
-        df = load_data()
-        if df is None:
-            return
-
-        # 处理薪资数据
+        # 加载并处理数据（只在数据文件变化时重新计算）
         with st.spinner('正在处理薪资数据...'):
-            df['平均薪资'] = df['期待薪资'].apply(process_salary)
+            prepared = get_prepared_data(DATA_PATH, data_version(DATA_PATH))
+        if prepared is None:
+            return
+        df, df_deduped, job_matrices, aggregates = prepared
 
         # 城市选择功能
         st.subheader('🏙️ 请选择要分析的城市')
@@ -580,6 +591,11 @@ def main():
         # 更新session_state
         st.session_state.selected_city = selected_city
 
+        # 同一公司重复发布的岗位只统计一次（影响热门职位和公司数量）
+        merge_duplicates = st.checkbox('合并近似重复岗位', value=True)
+        if merge_duplicates:
+            df = df_deduped
+
         # 根据选择的城市过滤数据
         if selected_city == "全国":
             df_filtered = df
@@ -587,6 +603,7 @@ def main():
         else:
             df_filtered = df[df['城市'] == selected_city]
             city_name = selected_city
+        city_aggregate = aggregates[merge_duplicates].get(selected_city)
 
         # 检查是否有数据
         if df_filtered.empty:
@@ -638,7 +655,7 @@ def main():
 
         with col1:
             with st.expander("🎓 不同学历的平均薪资", expanded=True):
-                salary_data = get_salary_by_education_data(df_filtered, city_name)
+                salary_data = get_salary_by_education_data(city_aggregate, city_name)
                 if salary_data is not None:
                     st.dataframe(salary_data, use_container_width=True, hide_index=True)
                 else:
@@ -710,14 +727,14 @@ def main():
         with st.expander("福利待遇词云图和词频统计", expanded=True):
             col1, col2 = st.columns(2)
             with col1:
-                fig8_wordcloud, fig8_frequency = generate_wordcloud_and_frequency(df_filtered, city_name)
+                fig8_wordcloud, fig8_frequency = generate_wordcloud_and_frequency(df_filtered, job_matrices['福利'], city_name)
                 if fig8_wordcloud:
-                    st.pyplot(fig8_wordcloud)
+                    st.image(fig8_wordcloud, use_container_width=True)
                 else:
                     st.info("暂无词云图数据")
             with col2:
                 if fig8_frequency:
-                    st.pyplot(fig8_frequency)
+                    st.image(fig8_frequency, use_container_width=True)
                 else:
                     st.info("暂无词频统计数据")
 
@@ -732,7 +749,7 @@ def main():
 
         with col1:
             with st.expander("热门技能要求", expanded=True):
-                fig_skills = plot_skill_distribution(df_filtered, city_name)
+                fig_skills = plot_skill_distribution(df_filtered, job_matrices['技能'], city_name)
                 if fig_skills:
                     st.pyplot(fig_skills)
                 else:
@@ -740,7 +757,7 @@ def main():
 
         with col2:
             with st.expander("热门工作标签", expanded=True):
-                fig_tags = plot_work_tags_distribution(df_filtered, city_name)
+                fig_tags = plot_work_tags_distribution(df_filtered, job_matrices['标签'], city_name)
                 if fig_tags:
                     st.pyplot(fig_tags)
                 else:
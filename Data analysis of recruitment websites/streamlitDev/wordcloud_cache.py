@@ -0,0 +1,120 @@
+# wordcloud_cache.py
+"""词云磁盘缓存：渲染好的词云/词频图 PNG 和词频数据按 (筛选条件, 词频哈希, 尺寸) 存盘，超过容量时淘汰最久未用的条目"""
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+
+import pandas as pd
+
+from data_paths import data_path
+
+# 默认缓存目录（运行时数据目录下）
+WORDCLOUD_CACHE_DIR = data_path('wordcloud_cache')
+# 最多保留的条目数（每个条目包含若干 PNG 和一个词频 JSON）
+WORDCLOUD_CACHE_MAX_ENTRIES = 64
+# 依次尝试的中文字体
+FONT_CANDIDATES = ['simhei.ttf', '/System/Library/Fonts/PingFang.ttc', 'C:/Windows/Fonts/simhei.ttf']
+
+
+@lru_cache(maxsize=None)
+def find_font_path(candidates=tuple(FONT_CANDIDATES)):
+    """第一个存在的字体文件（每个进程只探测一次），都不存在时返回 None"""
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def frequency_hash(word_freq):
+    """词频的内容哈希：词和频次完全相同时哈希相同"""
+    payload = json.dumps([[str(word), int(freq)] for word, freq in word_freq.items()], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def cache_key(filter_key, word_freq, size):
+    """缓存键：筛选条件、词频哈希和图片尺寸"""
+    payload = json.dumps([str(filter_key), frequency_hash(word_freq), list(size)], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class WordCloudCache:
+    """
+    磁盘上的 LRU 缓存。每个条目为 <key>.json（词频数据和图片名）加若干 <key>.<name>.png，
+    命中时更新 JSON 的修改时间，淘汰时按修改时间删除最旧的条目。
+    """
+
+    def __init__(self, directory=WORDCLOUD_CACHE_DIR, max_entries=WORDCLOUD_CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key, name=None):
+        return os.path.join(self.directory, f"{key}.json" if name is None else f"{key}.{name}.png")
+
+    def get(self, key):
+        """返回 (词频 Series, {图片名: PNG 字节})；未命中或文件不完整时返回 None"""
+        meta_path = self._path(key)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            images = {}
+            for name in meta['图片']:
+                with open(self._path(key, name), 'rb') as f:
+                    images[name] = f.read()
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        word_freq = pd.Series(dict(meta['词频']), dtype='int64', name=meta.get('名称'))
+        return word_freq, images
+
+    def put(self, key, word_freq, images):
+        """写入一个条目（先写图片，最后写 JSON，保证读到 JSON 时图片已完整），然后按容量淘汰"""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            for name, png in images.items():
+                _atomic_write(self._path(key, name), png)
+            meta = {
+                '名称': word_freq.name,
+                '词频': [[str(word), int(freq)] for word, freq in word_freq.items()],
+                '图片': list(images),
+            }
+            _atomic_write(self._path(key), json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+            self._evict()
+
+    def _evict(self):
+        """删除最久未使用的条目，直到不超过 max_entries"""
+        entries = []
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.json'):
+                path = os.path.join(self.directory, filename)
+                try:
+                    entries.append((os.path.getmtime(path), filename[:-len('.json')]))
+                except OSError:
+                    continue
+        entries.sort()
+        for _, key in entries[:max(len(entries) - self.max_entries, 0)]:
+            prefix = f"{key}."
+            for filename in os.listdir(self.directory):
+                if filename.startswith(prefix):
+                    try:
+                        os.remove(os.path.join(self.directory, filename))
+                    except OSError:
+                        pass
+
+
+def _atomic_write(path, data):
+    """先写临时文件再替换，避免其他会话读到写了一半的文件"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# 进程级共享缓存
+WORDCLOUD_CACHE = WordCloudCache()